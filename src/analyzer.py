@@ -0,0 +1,233 @@
+"""
+    The replay analyzer: goes through archives of game records (see game_record) and answers balance questions: how
+    often each side wins, how long the games take, how often pieces get captured and where, how often each rosette
+    gets landed on. The archives are memory-mapped and the turns are played out on plain lists of locations, so
+    millions of games go through without a single game object being made. Every archive (shard) is analyzed in its
+    own process.
+    Usage: python -m src.analyzer games-*.urgr --workers 4
+"""
+
+import argparse
+import mmap
+import os
+from concurrent.futures import ProcessPoolExecutor
+
+from src.domain.game_state import NO_OF_PIECES, END, DOUBLE_THROW_LOCATIONS, WARZONE_MASK, DOUBLE_THROW_MASK, PLAYERS, \
+    SIDE_SHIFT, GameState
+from src.services.game_record import skip_header, END_OF_RECORD, UNDO_TURN
+
+# location -> is it in the warzone / on a rosette (the masks of game_state, as lookup tables)
+IN_WARZONE = tuple(bool(WARZONE_MASK >> location & 1) for location in range(END + 1))
+ON_ROSETTE = tuple(bool(DOUBLE_THROW_MASK >> location & 1) for location in range(END + 1))
+
+
+class ArchiveStats:
+    """
+        The statistics of some games; the statistics of different archives get merged into one.
+        -games: every record that was read; unfinished: the ones that ended before anybody won (abandoned games, or
+        games of another variant, which are skipped)
+        -wins[side]: the games won by player1 (0) and player2 (1); first_mover_wins: the ones won by who moved first
+        -lengths[turns]: how many games took that many turns
+        -turns, skips: all the turns that were played, and how many of them were skipped
+        -captures[location]: how many pieces got captured on each location
+        -landings[side][location]: how many times the pieces of each side landed on each location
+    """
+    def __init__(self):
+        self.games = 0
+        self.unfinished = 0
+        self.wins = [0, 0]
+        self.first_mover_wins = 0
+        self.lengths = dict()
+        self.turns = 0
+        self.skips = 0
+        self.captures = [0] * (END + 1)
+        self.landings = [[0] * (END + 1) for _ in range(2)]
+
+    def merge(self, other) -> None:
+        """
+        :param other: the ArchiveStats of other games, added to these ones
+        """
+        self.games += other.games
+        self.unfinished += other.unfinished
+        self.first_mover_wins += other.first_mover_wins
+        self.turns += other.turns
+        self.skips += other.skips
+        for side in range(2):
+            self.wins[side] += other.wins[side]
+            for location in range(END + 1):
+                self.landings[side][location] += other.landings[side][location]
+        for location in range(END + 1):
+            self.captures[location] += other.captures[location]
+        for length, count in other.lengths.items():
+            self.lengths[length] = self.lengths.get(length, 0) + count
+
+    def add_game(self, turns, start=0) -> None:
+        """
+        Plays out the turns of a game and counts everything that happened. Only the locations of the pieces are kept
+        (and which warzone squares are taken), so a move is a few list lookups.
+        :param turns: the bytes of the turns of the game (without the END_OF_RECORD)
+        :param start: the packed game state (code) the turns are played from: 0 -> the initial one, player1 to move
+        (a resumed game is only counted from where it was resumed)
+        """
+        self.games += 1
+        if UNDO_TURN in turns:
+            played = bytearray()
+            for turn in turns:
+                if turn == UNDO_TURN:
+                    if played:  # an undo with nothing to take back (a broken record) changes nothing
+                        played.pop()
+                else:
+                    played.append(turn)
+            turns = played
+
+        captures = self.captures
+        landings = self.landings
+        locations = ([0] * (NO_OF_PIECES + 1), [0] * (NO_OF_PIECES + 1))  # [side][piece number]
+        finished = [0, 0]
+        taken = [False] * (END + 1)  # the warzone squares that have a piece on them
+        first_side = side = start >> SIDE_SHIFT
+        if start & ~(1 << SIDE_SHIFT):
+            start_state = GameState(start)
+            for player_side in range(2):
+                for index, location in enumerate(start_state.locations(player_side)):
+                    locations[player_side][index + 1] = location
+                    taken[location] = taken[location] or IN_WARZONE[location]
+                    finished[player_side] += location == END
+        skips = 0
+        for turn in turns:
+            piece = turn & 15
+            if not piece:
+                side ^= 1
+                skips += 1
+                continue
+            own = locations[side]
+            origin = own[piece]
+            destination = origin + (turn >> 4)
+            own[piece] = destination
+            landings[side][destination] += 1
+            if IN_WARZONE[origin]:
+                taken[origin] = False
+            if IN_WARZONE[destination]:
+                if taken[destination]:
+                    other = locations[1 - side]
+                    other[other.index(destination)] = 0
+                    captures[destination] += 1
+                taken[destination] = True
+            elif destination == END:
+                finished[side] += 1
+            if not ON_ROSETTE[destination]:
+                side ^= 1
+
+        self.turns += len(turns)
+        self.skips += skips
+        if finished[0] == NO_OF_PIECES:
+            winner = 0
+        elif finished[1] == NO_OF_PIECES:
+            winner = 1
+        else:
+            self.unfinished += 1
+            return
+        self.wins[winner] += 1
+        self.first_mover_wins += winner == first_side
+        self.lengths[len(turns)] = self.lengths.get(len(turns), 0) + 1
+
+    def add_archive(self, data) -> None:
+        """
+        :param data: the contents of a records file (e.g. a mmap)
+        """
+        position = 0
+        while position < len(data):
+            pieces, _, start, position = skip_header(data, position)
+            end = data.find(bytes((END_OF_RECORD,)), position)
+            if end < 0:
+                end = len(data)
+            if pieces == NO_OF_PIECES:
+                self.add_game(data[position:end], start)
+            else:
+                self.games += 1
+                self.unfinished += 1
+            position = end + 1
+
+    def length_percentile(self, percentile) -> int:
+        """
+        :param percentile: 0 -> 100
+        :return: the length (in turns) of the finished games at that percentile
+        """
+        finished = sum(self.lengths.values())
+        if finished == 0:
+            return 0
+        seen = 0
+        for length in sorted(self.lengths):
+            seen += self.lengths[length]
+            if seen * 100 >= percentile * finished:
+                return length
+        return max(self.lengths)
+
+    def describe(self) -> str:
+        """
+        :return: the statistics, as a short report
+        """
+        finished = self.games - self.unfinished
+        if finished == 0:
+            return str(self.games) + " games, none of them finished"
+
+        def percent(count, total):
+            return "{:.1%}".format(count / total) if total else "-"
+
+        moves = self.turns - self.skips
+        lines = [str(self.games) + " games, " + str(finished) + " finished",
+                 "wins: " + ", ".join(PLAYERS[side] + " " + percent(self.wins[side], finished) for side in range(2)) +
+                 ", who moved first " + percent(self.first_mover_wins, finished),
+                 "length (turns): mean {:.1f}, 10% {}, median {}, 90% {}, longest {}".format(
+                     sum(length * count for length, count in self.lengths.items()) / finished,
+                     self.length_percentile(10), self.length_percentile(50), self.length_percentile(90),
+                     max(self.lengths)),
+                 "skipped turns: " + percent(self.skips, self.turns),
+                 "captures: {:.2f} per game, {} of the moves; by square: ".format(
+                     sum(self.captures) / self.games, percent(sum(self.captures), moves)) +
+                 ", ".join(str(location) + ": " + str(self.captures[location]) for location in range(END + 1)
+                           if WARZONE_MASK >> location & 1),
+                 "rosette landings (player1/player2): " +
+                 ", ".join("{}: {}/{}".format(location, self.landings[0][location], self.landings[1][location])
+                           for location in DOUBLE_THROW_LOCATIONS)]
+        return "\n".join(lines)
+
+
+def analyze_archive(path) -> ArchiveStats:
+    """
+    Runs in a worker process: memory-maps one archive and goes through all of its games.
+    :param path: a file written by GameRecordWriter
+    :return: the statistics of its games
+    """
+    stats = ArchiveStats()
+    if os.path.getsize(path) == 0:
+        return stats
+    with open(path, "rb") as archive, mmap.mmap(archive.fileno(), 0, access=mmap.ACCESS_READ) as data:
+        stats.add_archive(data)
+    return stats
+
+
+def analyze(paths, workers=None) -> ArchiveStats:
+    """
+    :param paths: the archives (shards) to analyze
+    :param workers: how many processes analyze the archives (None -> one per cpu core)
+    :return: the merged statistics of all the games
+    """
+    stats = ArchiveStats()
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        for archive_stats in executor.map(analyze_archive, paths):
+            stats.merge(archive_stats)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Analyzes archives of game records.")
+    parser.add_argument("archives", nargs="+", help="the game record files (each one is analyzed by its own process)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per cpu core)")
+    arguments = parser.parse_args()
+
+    print(analyze(arguments.archives, arguments.workers).describe())
+
+
+if __name__ == "__main__":
+    main()
@@ -36,8 +36,8 @@ class Player(BaseEntity):
     @property
     def wins(self) -> int:
         """
-        This method has no use yet, but if the developer chooses to implement a leaderboard system, this could be useful
-        later on.
+        The wins of this session only: the player gets deleted after every match. The wins that last are kept by the
+        leaderboard (see Standing).
         :return: how many wins does this player has?
         """
         return self.__wins
@@ -155,6 +155,13 @@ class Piece(BaseEntity):
         self.__owner = owner.lower()
         self.__index = id_
         self.__update_state()
+        self.__location_listeners = []
+
+    def add_location_listener(self, listener) -> None:
+        """
+        :param listener: gets called as listener(piece, old_location) every time the location of the piece changes
+        """
+        self.__location_listeners.append(listener)
 
     def __update_state(self) -> None:
         """
@@ -173,8 +180,12 @@ class Piece(BaseEntity):
 
     @location.setter
     def location(self, location):
+        old_location = self.__location
         self.__location = location
         self.__update_state()
+        if old_location != location:
+            for listener in self.__location_listeners:
+                listener(self, old_location)
 
     @property
     def index(self):
@@ -187,3 +198,29 @@ class Piece(BaseEntity):
     @property
     def state(self):
         return self.__state
+
+
+class Standing(BaseEntity):
+    """
+        The place of a player on the leaderboard. Unlike the player, it outlives the match; its id is the name of the
+        player, so the same name always gets the same standing.
+    """
+    def __init__(self, name: str, wins=0, losses=0, rating=1000.0):
+        """
+        :param name: str = the name of the player
+        :param wins: int = matches won
+        :param losses: int = matches lost
+        :param rating: float = the Elo rating of the player (everybody starts at 1000)
+        """
+        super().__init__(name)
+        self.wins = wins
+        self.losses = losses
+        self.rating = rating
+
+    @property
+    def name(self) -> str:
+        return self.id
+
+    @property
+    def games(self) -> int:
+        return self.wins + self.losses
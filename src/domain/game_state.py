@@ -0,0 +1,243 @@
+"""
+    The packed game state. A whole position of The Royal Game of Ur fits in a single integer, so the rules can be
+    played out without walking the repositories or building piece ids.
+"""
+
+from collections import namedtuple
+
+from src.domain.validators import MetaException
+
+
+class GameStateException(MetaException):
+    pass
+
+
+NO_OF_PIECES = 7
+PLAYERS = ("player1", "player2")
+
+SPAWN = 0
+END = 15
+SAFE_SPOT = 8
+DOUBLE_THROW_LOCATIONS = (4, 8, 14)
+
+# four binary dice: the chance of rolling 0, 1, 2, 3 or 4
+DICE_PROBABILITIES = (1 / 16, 4 / 16, 6 / 16, 4 / 16, 1 / 16)
+
+BITS_PER_PIECE = 4
+BITS_PER_PLAYER = BITS_PER_PIECE * NO_OF_PIECES
+SIDE_SHIFT = 2 * BITS_PER_PLAYER
+PLAYER_MASK = (1 << BITS_PER_PLAYER) - 1
+ALL_FINISHED = int("f" * NO_OF_PIECES, 16)
+
+WARZONE_MASK = sum(1 << location for location in range(5, 13))
+DOUBLE_THROW_MASK = sum(1 << location for location in DOUBLE_THROW_LOCATIONS)
+
+# A move, as seen by the rules:
+# -piece: int = 1 -> 7 (the index of the moved piece)
+# -origin: int = 0 -> 14
+# -destination: int = 1 -> 15
+# -captures: bool (an enemy piece gets sent back to spawn)
+# -extra_turn: bool (the piece landed on a double throw square)
+Move = namedtuple("Move", ["piece", "origin", "destination", "captures", "extra_turn"])
+
+
+class GameState:
+    """
+        An immutable, hashable game state. Every piece location takes 4 bits (player1's pieces first, then
+        player2's pieces) and the bit right after them tells whose turn it is (0 -> "player1", 1 -> "player2").
+    """
+    __slots__ = ("__code",)
+
+    def __init__(self, code: int):
+        self.__code = code
+
+    @staticmethod
+    def from_locations(player1_locations, player2_locations, side=0):
+        """
+        :param player1_locations: the locations (0 -> 15) of player1's pieces, ordered by piece index
+        :param player2_locations: the locations (0 -> 15) of player2's pieces, ordered by piece index
+        :param side: 0 if it is player1's turn, 1 if it is player2's turn
+        :return: the packed game state
+        """
+        code = side << SIDE_SHIFT
+        for player_side, locations in enumerate((player1_locations, player2_locations)):
+            if len(locations) != NO_OF_PIECES:
+                raise GameStateException("Each player must have exactly " + str(NO_OF_PIECES) + " pieces!")
+            for index, location in enumerate(locations):
+                if not SPAWN <= location <= END:
+                    raise GameStateException("Invalid piece location given!")
+                code |= location << (player_side * BITS_PER_PLAYER + index * BITS_PER_PIECE)
+        return GameState(code)
+
+    @staticmethod
+    def from_pieces(pieces, current_player):
+        """
+        The adapter from the pieces repository to the packed state.
+        :param pieces: the pieces repository (the one that is also assigned to game_controller)
+        :param current_player: whose turn is it? "player1"/"player2"
+        :return: the packed game state
+        """
+        code = PLAYERS.index(current_player) << SIDE_SHIFT
+        for piece in pieces.get_all():
+            if not 1 <= piece.index <= NO_OF_PIECES:
+                raise GameStateException("The packed game state only supports " + str(NO_OF_PIECES) +
+                                         " pieces per player!")
+            code |= piece.location << (PLAYERS.index(piece.owner) * BITS_PER_PLAYER +
+                                       (piece.index - 1) * BITS_PER_PIECE)
+        return GameState(code)
+
+    def write_to(self, pieces) -> None:
+        """
+        The adapter from the packed state back to the pieces repository. Only the piece locations are written.
+        :param pieces: the pieces repository (the one that is also assigned to game_controller)
+        """
+        for piece in pieces.get_all():
+            location = self.location(PLAYERS.index(piece.owner), piece.index)
+            if piece.location != location:
+                piece.location = location
+
+    @property
+    def code(self) -> int:
+        return self.__code
+
+    @property
+    def side(self) -> int:
+        """
+        :return: 0 if it is player1's turn, 1 if it is player2's turn
+        """
+        return self.__code >> SIDE_SHIFT
+
+    @property
+    def current_player(self) -> str:
+        return PLAYERS[self.__code >> SIDE_SHIFT]
+
+    def location(self, side, index) -> int:
+        """
+        :param side: 0 for player1, 1 for player2
+        :param index: the index of the piece (ranging from 1 to 7)
+        :return: the location of the piece
+        """
+        return (self.__code >> (side * BITS_PER_PLAYER + (index - 1) * BITS_PER_PIECE)) & 15
+
+    def locations(self, side) -> tuple:
+        """
+        :param side: 0 for player1, 1 for player2
+        :return: the locations of all of the player's pieces, ordered by piece index
+        """
+        player_code = self.__code >> (side * BITS_PER_PLAYER)
+        return tuple((player_code >> (index * BITS_PER_PIECE)) & 15 for index in range(NO_OF_PIECES))
+
+    def __eq__(self, other):
+        return isinstance(other, GameState) and self.__code == other.code
+
+    def __hash__(self):
+        return hash(self.__code)
+
+    def __repr__(self):
+        return "GameState(" + str(self.locations(0)) + ", " + str(self.locations(1)) + ", " + \
+               self.current_player + ")"
+
+
+INITIAL_STATE = GameState(0)
+
+
+def occupancy(player_code) -> int:
+    """
+    :param player_code: the 28 bits that hold one player's piece locations
+    :return: a bit mask with a bit set for every location where the player has at least one piece
+    """
+    mask = 0
+    for index in range(NO_OF_PIECES):
+        mask |= 1 << ((player_code >> (index * BITS_PER_PIECE)) & 15)
+    return mask
+
+
+def legal_moves(state, rolled_dice_value) -> list:
+    """
+    Every move the side to move can make with the rolled dice value, in piece index order.
+    :param state: the packed game state
+    :param rolled_dice_value: how many steps will the piece move
+    :return: a list of moves (an empty list means that the player has to skip)
+    """
+    if rolled_dice_value == 0:
+        return []
+    code = state.code
+    side = code >> SIDE_SHIFT
+    own_code = (code >> (side * BITS_PER_PLAYER)) & PLAYER_MASK
+    other_code = (code >> ((1 - side) * BITS_PER_PLAYER)) & PLAYER_MASK
+    own_mask = occupancy(own_code)
+    other_mask = occupancy(other_code)
+
+    moves = []
+    for index in range(NO_OF_PIECES):
+        origin = (own_code >> (index * BITS_PER_PIECE)) & 15
+        destination = origin + rolled_dice_value
+        if origin == END or destination > END:
+            continue
+        destination_bit = 1 << destination
+        if destination != END and own_mask & destination_bit:
+            continue
+        if destination == SAFE_SPOT and other_mask & destination_bit:
+            continue
+        captures = bool(other_mask & destination_bit & WARZONE_MASK)
+        moves.append(Move(index + 1, origin, destination, captures, bool(DOUBLE_THROW_MASK & destination_bit)))
+    return moves
+
+
+def distinct_moves(moves) -> list:
+    """
+    Moving any of the pieces that wait on spawn leads to the same position (up to the piece indexes), so search
+    algorithms only need to look at one of them.
+    :param moves: a list of legal moves
+    :return: the moves, with only the first one of each origin kept
+    """
+    distinct = []
+    seen_origins = 0
+    for move in moves:
+        if not seen_origins & (1 << move.origin):
+            seen_origins |= 1 << move.origin
+            distinct.append(move)
+    return distinct
+
+
+def apply_move(state, move) -> GameState:
+    """
+    :param state: the packed game state
+    :param move: a legal move for the side to move (see legal_moves)
+    :return: the game state after the move; the turn passes unless the piece landed on a double throw square
+    """
+    code = state.code
+    side = code >> SIDE_SHIFT
+    shift = side * BITS_PER_PLAYER + (move.piece - 1) * BITS_PER_PIECE
+    code = (code & ~(15 << shift)) | (move.destination << shift)
+    if move.captures:
+        other_shift = (1 - side) * BITS_PER_PLAYER
+        for index in range(NO_OF_PIECES):
+            shift = other_shift + index * BITS_PER_PIECE
+            if (code >> shift) & 15 == move.destination:
+                code &= ~(15 << shift)
+                break
+    if not move.extra_turn:
+        code ^= 1 << SIDE_SHIFT
+    return GameState(code)
+
+
+def pass_turn(state) -> GameState:
+    """
+    :param state: the packed game state
+    :return: the same position, but it's the other player's turn
+    """
+    return GameState(state.code ^ (1 << SIDE_SHIFT))
+
+
+def winner(state):
+    """
+    :param state: the packed game state
+    :return: 0 if player1 has won, 1 if player2 has won, None if nobody won yet
+    """
+    code = state.code
+    if code & PLAYER_MASK == ALL_FINISHED:
+        return 0
+    if (code >> BITS_PER_PLAYER) & PLAYER_MASK == ALL_FINISHED:
+        return 1
+    return None
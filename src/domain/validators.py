@@ -14,14 +14,27 @@ class GameControllerException(MetaException):
 
 class GameControllerDataValidator:
     @staticmethod
-    def check_if_piece_can_be_moved(piece_number, pieces, current_player, rolled_dice_value) -> None:
+    def check_if_piece_can_be_moved(piece_number, legal_moves, pieces, current_player, rolled_dice_value):
         """
         If the player decided to move a piece that can't be moved, an exception will be raised!
         :param piece_number: the piece number you want to check if it can be moved
+        :param legal_moves: all the legal moves of the current player (see GameController.legal_moves)
         :param pieces: all the pieces in the game (repository which is also in game controller)
         :param current_player: who is the current player? "player1"/"player2"
         :param rolled_dice_value: the dice value that the player has to work with (i.e. how many steps will the piece
         move)
+        :return: the legal move of the piece
+        """
+        for move in legal_moves:
+            if move.piece == piece_number:
+                return move
+        GameControllerDataValidator.__raise_why_piece_cant_be_moved(piece_number, pieces, current_player,
+                                                                     rolled_dice_value)
+
+    @staticmethod
+    def __raise_why_piece_cant_be_moved(piece_number, pieces, current_player, rolled_dice_value) -> None:
+        """
+        The piece has no legal move, so we only have to find out why, in order to let the player know.
         """
         piece_id = current_player + "_" + str(piece_number)
         if not pieces.id_exists(piece_id):
@@ -34,13 +47,11 @@ class GameControllerDataValidator:
         new_location = piece.location + rolled_dice_value
         if new_location > 15:
             raise GameControllerException("The rolled value is too high for you to move this piece!")
-        for existing_piece in pieces.get_all():
-            if new_location == existing_piece.location == 8 and not existing_piece.owner == current_player:
-                raise GameControllerException("You can't take over the pieces of another player while they are on "
-                                              "the safe spot!")
-            if existing_piece.location == new_location and new_location != 15 and existing_piece.owner == \
-                    current_player:
-                raise GameControllerException("You can't have more than one piece on a square at a time!")
+        opponent = "player2" if current_player == "player1" else "player1"
+        if new_location == 8 and pieces.is_occupied(opponent, 8):
+            raise GameControllerException("You can't take over the pieces of another player while they are on "
+                                          "the safe spot!")
+        raise GameControllerException("You can't have more than one piece on a square at a time!")
 
     @staticmethod
     def validate_number(piece_number) -> None:
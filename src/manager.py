@@ -2,17 +2,27 @@
     The manager of the game. It does everything!
 """
 
+import importlib
 import traceback
 
 from src.domain.entities import AI
 from src.domain.validators import MetaException, GameControllerDataValidator
+from src.repository.leaderboard import Leaderboard
 from src.repository.repo import Pieces, Squares, BaseRepository
 from src.services.ai_strategy import AIStrategy
 from src.services.board import Board
 from src.services.game_controller import GameController
+from src.services.game_record import GameRecorder, GameRecordWriter
+from src.services.snapshot import Autosaver
 from src.services.tools import Color
-from src.ui.console import Console
-from src.ui.gui import GUI
+
+LEADERBOARD_FILE = "leaderboard.db"
+SAVE_FILE = "saved_game.ursv"
+
+# the ui modules, by the name of their ui: a ui (and pygame, for the gui) only gets imported once it's selected, so the
+# game engine runs without pygame
+UI_CLASSES = {"console": ("src.ui.console", "Console"),
+              "gui": ("src.ui.gui", "GUI")}
 
 
 class Manager:
@@ -21,23 +31,32 @@ class Manager:
         Important services:
             __game_controller, __board
         Important ui:
-            __gui, __console
+            __uis (created when they're first selected)
     """
-    def __init__(self):
+    def __init__(self, records=None, leaderboard=None, save=None):
+        """
+        :param records: the file every game gets recorded to (see game_record; None -> the games aren't recorded)
+        :param leaderboard: the database of the leaderboard (see leaderboard; None -> the results aren't kept)
+        :param save: the file the match gets saved to after every move (see snapshot; None -> it isn't saved)
+        """
         # repos:
         self.__pieces = Pieces()
         self.__squares = Squares()
         self.__players = BaseRepository()
+        self.__leaderboard = Leaderboard(leaderboard) if leaderboard is not None else None
 
         # services:
         self.__board = Board(self.__pieces)
         self.__game_controller = GameController(self.__pieces, self.__squares, self.__players,
-                                                GameControllerDataValidator)
+                                                GameControllerDataValidator, leaderboard=self.__leaderboard)
         ai_strategy = AIStrategy(self.__pieces, self.__squares)
+        self.__recorder = None
+        if records is not None:
+            self.__recorder = GameRecorder(self.__game_controller, GameRecordWriter(records))
+        self.__autosaver = Autosaver(self.__game_controller, save) if save is not None else None
 
         # ui:
-        self.__console = Console(self.__board, self.__game_controller)
-        self.__gui = GUI(self.__board, self.__game_controller)
+        self.__uis = dict()
 
         # add AI to players:
         self.__players.add(AI(ai_strategy))
@@ -48,19 +67,35 @@ class Manager:
         """
         done = False
         ui = "gui"
-        while not done:
-            if ui == "console":
-                done, ui = self.__console.run()
-            elif ui == "gui":
-                done, ui = self.__gui.run()
-            else:
-                raise MetaException("Error: Invalid UI given.")
-        Console.print_goodbye()
+        try:
+            while not done:
+                done, ui = self.__get_ui(ui).run()
+        finally:
+            if self.__recorder is not None:
+                self.__recorder.close()
+            if self.__leaderboard is not None:
+                self.__leaderboard.close()
+            if self.__autosaver is not None:
+                self.__autosaver.close()
+        self.__get_ui("console").print_goodbye()
+
+    def __get_ui(self, ui):
+        """
+        :param ui: the name of the ui ("console" or "gui")
+        :return: the ui, imported and created the first time it's asked for
+        """
+        if ui not in UI_CLASSES:
+            raise MetaException("Error: Invalid UI given.")
+        if ui not in self.__uis:
+            module_name, class_name = UI_CLASSES[ui]
+            ui_class = getattr(importlib.import_module(module_name), class_name)
+            self.__uis[ui] = ui_class(self.__board, self.__game_controller, autosaver=self.__autosaver)
+        return self.__uis[ui]
 
 
 if __name__ == "__main__":
     try:
-        manager = Manager()
+        manager = Manager(leaderboard=LEADERBOARD_FILE, save=SAVE_FILE)
         manager.run()
     except MetaException as ex:
         traceback.print_exc()
@@ -0,0 +1,210 @@
+"""
+    The leaderboard: the standings (wins, losses, Elo rating) of everybody who ever played, kept in an SQLite database
+    so they survive from one session to the next.
+    The database is written by a thread of its own: adding a standing or the result of a match only puts it in a
+    queue, so the game never waits for the disk. The thread writes whatever has been queued in one transaction (a
+    write that fails is rolled back on its own, the others are kept).
+"""
+
+import queue
+import sqlite3
+import threading
+
+from src.domain.entities import Standing
+from src.repository.repo import BaseRepository, RepoException
+
+SCHEMA_VERSION = 1
+INITIAL_RATING = 1000.0
+K_FACTOR = 32  # the most rating points a match can be worth
+
+# the statements: their text never changes and only the parameters do, so sqlite compiles each of them once per
+# connection and keeps it prepared
+CREATE_TABLE = "CREATE TABLE IF NOT EXISTS standings (name TEXT PRIMARY KEY, wins INTEGER NOT NULL, " \
+               "losses INTEGER NOT NULL, rating REAL NOT NULL) WITHOUT ROWID"
+CREATE_INDEXES = ("CREATE INDEX IF NOT EXISTS standings_by_rating ON standings (rating DESC, wins DESC)",
+                  "CREATE INDEX IF NOT EXISTS standings_by_wins ON standings (wins DESC, rating DESC)")
+SELECT_COLUMNS = "SELECT name, wins, losses, rating FROM standings"
+SELECT_ONE = SELECT_COLUMNS + " WHERE name = ?"
+SELECT_ALL = SELECT_COLUMNS + " ORDER BY rating DESC, wins DESC"
+SELECT_TOP = {"rating": SELECT_ALL + " LIMIT ?",
+              "wins": SELECT_COLUMNS + " ORDER BY wins DESC, rating DESC LIMIT ?"}
+EXISTS = "SELECT 1 FROM standings WHERE name = ?"
+SAVE = "INSERT OR REPLACE INTO standings (name, wins, losses, rating) VALUES (?, ?, ?, ?)"
+DELETE = "DELETE FROM standings WHERE name = ?"
+ENSURE = "INSERT OR IGNORE INTO standings (name, wins, losses, rating) VALUES (?, 0, 0, ?)"
+SELECT_RATING = "SELECT rating FROM standings WHERE name = ?"
+ADD_WIN = "UPDATE standings SET wins = wins + 1, rating = rating + ? WHERE name = ?"
+ADD_LOSS = "UPDATE standings SET losses = losses + 1, rating = rating - ? WHERE name = ?"
+RESULT = "result"  # queued instead of a statement: the result of a match, which takes a few of them
+
+
+def rating_change(winner_rating, loser_rating) -> float:
+    """
+    :return: how many rating points the winner takes from the loser (more if the winner was the underdog)
+    """
+    expected_score = 1 / (1 + 10 ** ((loser_rating - winner_rating) / 400))
+    return K_FACTOR * (1 - expected_score)
+
+
+class Leaderboard(BaseRepository):
+    """
+        A repository of standings (see Standing), by the name of the player, backed by an SQLite database in WAL mode
+        (the game reads it while the writing thread writes it).
+        The writes are queued: whatever reads the leaderboard waits for the queue to be written first, so it always
+        sees everything that was added before.
+    """
+    def __init__(self, path, batch_size=256):
+        """
+        :param path: the database file (it gets created if it doesn't exist)
+        :param batch_size: the most writes that go in one transaction
+        """
+        super().__init__()
+        self.__path = path
+        self.__batch_size = batch_size
+        self.__error = None  # what went wrong in the writing thread, raised by the next read (or flush)
+
+        self.__connection = sqlite3.connect(path)
+        with self.__connection:
+            self.__connection.execute("PRAGMA journal_mode=WAL")
+            if self.__connection.execute("PRAGMA user_version").fetchone()[0] > SCHEMA_VERSION:
+                raise RepoException("The leaderboard was saved by a newer version of the game!")
+            self.__connection.execute(CREATE_TABLE)
+            for create_index in CREATE_INDEXES:
+                self.__connection.execute(create_index)
+            self.__connection.execute("PRAGMA user_version = " + str(SCHEMA_VERSION))
+
+        self.__queue = queue.Queue()
+        self.__writer = threading.Thread(target=self.__write, name="leaderboard-writer", daemon=True)
+        self.__writer.start()
+
+    def add(self, standing):
+        self.__queue.put((SAVE, (standing.name, standing.wins, standing.losses, standing.rating)))
+
+    def replace(self, name, new_standing):
+        if name != new_standing.name:
+            self.__queue.put((DELETE, (name,)))
+        self.add(new_standing)
+
+    def delete_by_id(self, name):
+        if not self.id_exists(name):
+            raise RepoException("No entity found with the given id: " + str(name))
+        self.__queue.put((DELETE, (name,)))
+
+    def find_by_id(self, name):
+        row = self.__read(SELECT_ONE, (name,)).fetchone()
+        if row is None:
+            raise RepoException("No entity found with the given id: " + str(name))
+        return Standing(*row)
+
+    def id_exists(self, name):
+        return self.__read(EXISTS, (name,)).fetchone() is not None
+
+    def get_all(self):
+        """
+        :return: all the standings, the best rated first
+        """
+        return [Standing(*row) for row in self.__read(SELECT_ALL, ())]
+
+    def top(self, count, by="rating") -> list:
+        """
+        :param count: how many standings
+        :param by: "rating"/"wins" (both are indexed, so only the top rows get read)
+        :return: the best count standings, the best first
+        """
+        if by not in SELECT_TOP:
+            raise RepoException("The leaderboard can only be ordered by rating or by wins!")
+        return [Standing(*row) for row in self.__read(SELECT_TOP[by], (count,))]
+
+    def add_result(self, winner_name, loser_name) -> None:
+        """
+        Queues the result of a match: the winner gets a win, the loser a loss, and the rating points go from the loser
+        to the winner. Players that aren't on the leaderboard yet get added.
+        """
+        self.__queue.put((RESULT, (winner_name, loser_name)))
+
+    def flush(self) -> None:
+        """
+        Waits until everything queued so far is in the database.
+        """
+        self.__queue.join()
+        if self.__error is not None:
+            error, self.__error = self.__error, None
+            raise RepoException("The leaderboard couldn't be saved: " + str(error))
+
+    def close(self) -> None:
+        """
+        Writes what's left in the queue, stops the writing thread and closes the database.
+        """
+        if not self.__writer.is_alive():
+            return
+        self.__queue.put(None)
+        self.__writer.join()
+        self.__connection.close()
+        if self.__error is not None:
+            raise RepoException("The leaderboard couldn't be saved: " + str(self.__error))
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    def __read(self, statement, parameters) -> sqlite3.Cursor:
+        self.flush()
+        return self.__connection.execute(statement, parameters)
+
+    def __write(self) -> None:
+        """
+        The writing thread: takes whatever is in the queue (up to batch_size writes) and writes it in one transaction,
+        until it finds None in the queue.
+        """
+        connection = sqlite3.connect(self.__path)
+        connection.execute("PRAGMA synchronous=NORMAL")  # safe in WAL mode, and a commit doesn't wait for the disk
+        running = True
+        while running:
+            batch = [self.__queue.get()]
+            while len(batch) < self.__batch_size:
+                try:
+                    batch.append(self.__queue.get_nowait())
+                except queue.Empty:
+                    break
+            # the end of the queue is looked for before writing anything, so a failed write can't keep the thread up
+            running = all(write is not None for write in batch)
+            try:
+                with connection:
+                    connection.execute("BEGIN")  # else the first savepoint would start (and commit) the transaction
+                    for write in batch:
+                        if write is not None:
+                            self.__write_one(connection, write)
+            except sqlite3.Error as ex:
+                self.__error = ex
+            finally:
+                for _ in batch:
+                    self.__queue.task_done()
+        connection.close()
+
+    def __write_one(self, connection, write) -> None:
+        """
+        Writes one of the batch in a savepoint of its own: if it fails, only it gets rolled back (and its error gets
+        raised by the next read), the rest of the batch still gets written.
+        """
+        connection.execute("SAVEPOINT write")
+        try:
+            if write[0] is RESULT:
+                Leaderboard.__write_result(connection, *write[1])
+            else:
+                connection.execute(*write)
+        except sqlite3.Error as ex:
+            connection.execute("ROLLBACK TO write")
+            self.__error = ex
+        connection.execute("RELEASE write")
+
+    @staticmethod
+    def __write_result(connection, winner_name, loser_name) -> None:
+        connection.execute(ENSURE, (winner_name, INITIAL_RATING))
+        connection.execute(ENSURE, (loser_name, INITIAL_RATING))
+        winner_rating = connection.execute(SELECT_RATING, (winner_name,)).fetchone()[0]
+        loser_rating = connection.execute(SELECT_RATING, (loser_name,)).fetchone()[0]
+        change = rating_change(winner_rating, loser_rating)
+        connection.execute(ADD_WIN, (change, winner_name))
+        connection.execute(ADD_LOSS, (change, loser_name))
@@ -44,12 +44,109 @@ class Pieces(BaseRepository):
     """
     This Pieces repository was created specifically to initialize the repo on its creation with the needed pieces for
     each player.
+    It also keeps an index of who is where: for each player, location -> the pieces on it. The pieces tell the
+    repository whenever they move, so the index is always up to date and "who is on square N?" is a lookup, not a
+    scan of all the pieces.
     """
     def __init__(self):
+        self.__locations = {"player1": dict(), "player2": dict()}  # player -> location -> {index: piece}
         super().__init__()
         self.initialize_pieces_for_player(1)
         self.initialize_pieces_for_player(2)
 
+    def add(self, piece):
+        if self.id_exists(piece.id):
+            old_piece = self.find_by_id(piece.id)
+            self.__unindex(old_piece, old_piece.location)
+        super().add(piece)
+        self.__index(piece)
+        piece.add_location_listener(self.__piece_moved)
+
+    def replace(self, piece_id, new_piece):
+        self.delete_by_id(piece_id)
+        self.add(new_piece)
+
+    def delete_by_id(self, piece_id):
+        piece = self.find_by_id(piece_id)
+        super().delete_by_id(piece_id)
+        self.__unindex(piece, piece.location)
+
+    def __piece_moved(self, piece, old_location):
+        if self.id_exists(piece.id) and self.find_by_id(piece.id) is piece:
+            self.__unindex(piece, old_location)
+            self.__index(piece)
+
+    def __index(self, piece):
+        self.__locations[piece.owner].setdefault(piece.location, dict())[piece.index] = piece
+
+    def __unindex(self, piece, location):
+        pieces_here = self.__locations[piece.owner].get(location, dict())
+        if pieces_here.get(piece.index) is piece:
+            del pieces_here[piece.index]
+
+    def pieces_at(self, player, location) -> list:
+        """
+        :param player: "player1"/"player2"
+        :param location: int = 0 -> 15
+        :return: the pieces of the player on that location, ordered by their index (more than one only on the spawn
+        and the end)
+        """
+        pieces_here = self.__locations[player].get(location, dict())
+        return [pieces_here[index] for index in sorted(pieces_here)]
+
+    def piece_at(self, player, location):
+        """
+        :param player: "player1"/"player2"
+        :param location: int = 0 -> 15
+        :return: a piece of the player on that location (the one with the lowest index), or None if there isn't any
+        """
+        pieces_here = self.__locations[player].get(location)
+        if not pieces_here:
+            return None
+        return pieces_here[min(pieces_here)]
+
+    def is_occupied(self, player, location) -> bool:
+        """
+        :return: does the player have any piece on that location?
+        """
+        return bool(self.__locations[player].get(location))
+
+    def count_at(self, player, location) -> int:
+        """
+        :return: how many pieces the player has on that location
+        """
+        return len(self.__locations[player].get(location, ()))
+
+    def spawn_count(self, player) -> int:
+        """
+        :return: how many pieces of the player are still waiting on the spawn
+        """
+        return self.count_at(player, 0)
+
+    def finish_count(self, player) -> int:
+        """
+        :return: how many pieces of the player already reached the end
+        """
+        return self.count_at(player, 15)
+
+    def pieces_by_state(self, player, state) -> list:
+        """
+        :param player: "player1"/"player2"
+        :param state: "spawn"/"in_game"/"finish"
+        :return: the pieces of the player in that state, ordered by location, then by index
+        """
+        if state == "spawn":
+            return self.pieces_at(player, 0)
+        if state == "finish":
+            return self.pieces_at(player, 15)
+        return [piece for location in range(1, 15) for piece in self.pieces_at(player, location)]
+
+    def pieces_of(self, player) -> list:
+        """
+        :return: all the pieces of the player, ordered by location, then by index
+        """
+        return [piece for location in sorted(self.__locations[player]) for piece in self.pieces_at(player, location)]
+
     def initialize_pieces_for_player(self, player):
         no_of_pieces = 7
         if not 1 <= player <= 2:
@@ -62,8 +159,11 @@ class Squares(BaseRepository):
     """
     This Squares repository was created specifically to initialize the repo on its creation with the needed squares for
     each sector.
+    Each square is also put in a table, indexed by player and location, so finding the square a piece is on (or is
+    going to) is an array lookup.
     """
     def __init__(self):
+        self.__table = {"player1": [None] * 16, "player2": [None] * 16}  # player -> location -> square
         super().__init__()
         self.initialize_squares_for_sector("_player1_safezone")
         self.initialize_squares_for_sector("_player2_safezone")
@@ -81,6 +181,33 @@ class Squares(BaseRepository):
         else:
             raise RepoException("Invalid sector given.")
 
+    def add(self, square):
+        super().add(square)
+        if square.id.endswith("_warzone"):
+            for player in self.__table:
+                self.__table[player][square.index] = square
+        else:
+            self.__table[square.id.split("_")[1]][square.index] = square
+
+    def replace(self, square_id, new_square):
+        self.delete_by_id(square_id)
+        self.add(new_square)
+
+    def delete_by_id(self, square_id):
+        square = self.find_by_id(square_id)
+        super().delete_by_id(square_id)
+        for squares_of_player in self.__table.values():
+            if squares_of_player[square.index] is square:
+                squares_of_player[square.index] = None
+
+    def square_at(self, player, location):
+        """
+        :param player: "player1"/"player2" (squares 0 -> 4 and 13 -> 15 are different for each player)
+        :param location: int = 0 -> 15
+        :return: the square the player's piece is on when it is at that location
+        """
+        return self.__table[player][location]
+
     def find_by_location(self, location):
         """
         This is used only to determine whether a square is in a warzone or not (remember, each square is dependant on
@@ -88,6 +215,4 @@ class Squares(BaseRepository):
         :param location: integer with the square location
         :return: the required square (if it is in a safezone, it is gonna be in the _player1_safezone)
         """
-        for square in self.get_all():
-            if square.index == location:
-                return square
+        return self.square_at("player1", location)
@@ -1,5 +1,6 @@
 
 from src.domain.validators import MetaException
+from src.services.geometry import OFFSETS
 from src.services.tools import Color
 
 
@@ -52,30 +53,13 @@ class Board:
         :param player: can either be "player1" or "player2"
         :return: A tuple (imaginary number, one might say) of two integers: (column, row).
         """
-        if piece_location == 0:
-            row = 0
-            if player == "player2":
-                row = 4
-            offset = (index - 1, row)
-        elif piece_location == 15:
-            row = 1
-            if player == "player2":
-                row = 3
-            offset = (7 + index, row)
-        elif 1 <= piece_location <= 4 or 13 <= piece_location <= 14:
-            if 1 <= piece_location <= 4:
-                column = 4 - piece_location
-            else:
-                column = 20 - piece_location
-            row = 1
-            if player == "player2":
-                row = 3
-            offset = (column, row)
-        elif 5 <= piece_location <= 12:
-            offset = (piece_location - 5, 2)
-        else:
+        if not 0 <= piece_location <= 15:
             raise BoardException("Invalid piece location given!")
-        return offset
+        if player not in OFFSETS:
+            raise BoardException("Invalid player given!")
+        if not 1 <= index <= len(OFFSETS[player]):
+            raise BoardException("Invalid piece index given!")
+        return OFFSETS[player][index - 1][piece_location]
 
     def __build_the_board(self) -> None:
         """
@@ -168,24 +152,24 @@ class Board:
         :param index: index of the square. Ranges between 0 and 15
         :return: True if player1 has pieces here, False otherwise
         """
-        for piece in self.__pieces.get_all():
-            if piece.location == index and piece.owner == "player1":
-                self.__player_who_has_a_piece_here = "player1"
-                self.__piece_index = piece.id.split("_")[1]
-                return True
-        return False
+        piece = self.__pieces.piece_at("player1", index)
+        if piece is None:
+            return False
+        self.__player_who_has_a_piece_here = "player1"
+        self.__piece_index = str(piece.index)
+        return True
 
     def __check_if_player2_has_pieces_here(self, index) -> bool:
         """
         :param index: index of the square. Ranges between 0 and 15
         :return: True if player1 has pieces here, False otherwise
         """
-        for piece in self.__pieces.get_all():
-            if piece.location == index and piece.owner == "player2":
-                self.__player_who_has_a_piece_here = "player2"
-                self.__piece_index = piece.id.split("_")[1]
-                return True
-        return False
+        piece = self.__pieces.piece_at("player2", index)
+        if piece is None:
+            return False
+        self.__player_who_has_a_piece_here = "player2"
+        self.__piece_index = str(piece.index)
+        return True
 
     def __put_a_piece_here(self) -> str:
         """
@@ -207,10 +191,9 @@ class Board:
         piece_color = Color.BLUE
         if player_number == 2:
             piece_color = Color.RED
-        for piece in self.__pieces.get_all():
-            if piece.state == "spawn" and piece.id.split("_")[0] == "player" + str(player_number):
-                spawn_pieces += Color.END + Color.BOLD + piece_color + " " + str(piece.index) + " " + Color.END + \
-                                Color.BOLD
+        for piece in self.__pieces.pieces_by_state("player" + str(player_number), "spawn"):
+            spawn_pieces += Color.END + Color.BOLD + piece_color + " " + str(piece.index) + " " + Color.END + \
+                            Color.BOLD
         return spawn_pieces
 
     def __get_end_pieces_for_player(self, player_number) -> str:
@@ -222,10 +205,9 @@ class Board:
         piece_color = Color.BLUE
         if player_number == 2:
             piece_color = Color.RED
-        for piece in self.__pieces.get_all():
-            if piece.state == "finish" and piece.id.split("_")[0] == "player" + str(player_number):
-                end_pieces += Color.END + Color.BOLD + piece_color + " " + str(piece.index) + " " + Color.END + \
-                              Color.BOLD
+        for piece in self.__pieces.pieces_by_state("player" + str(player_number), "finish"):
+            end_pieces += Color.END + Color.BOLD + piece_color + " " + str(piece.index) + " " + Color.END + \
+                          Color.BOLD
         return end_pieces
 
     def __str__(self):
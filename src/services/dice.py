@@ -0,0 +1,133 @@
+"""
+    The dice. Every game rolls its own seeded stream of dice, so any game can be played again roll for roll, given its
+    seed (and two strategies can be given the very same dice, for a fair comparison).
+"""
+
+import random
+
+from src.domain.validators import MetaException
+
+NO_OF_DICE = 4
+
+
+class DiceException(MetaException):
+    pass
+
+
+class Dice:
+    """
+        A stream of dice rolls. Each roll is sampled straight from its (binomial) distribution: the dice are binary, so
+        the number of ones among a few random bits is exactly the number of dice that came up marked.
+        -seed: the seed of the stream; a random one gets picked (and kept) if none is given, so the stream can always
+        be played again
+        -spawn_key: tells apart the streams spawned from the same seed (see spawn)
+    """
+    def __init__(self, seed=None, spawn_key=(), no_of_dice=NO_OF_DICE):
+        """
+        :param seed: a non negative integer (None -> a random one)
+        :param spawn_key: a tuple of integers; () for the root stream of the seed
+        :param no_of_dice: how many binary dice get rolled at once
+        """
+        if seed is None:
+            seed = random.SystemRandom().getrandbits(64)
+        if seed < 0:
+            raise DiceException("The seed of the dice can't be negative!")
+        self.seed = seed
+        self.spawn_key = tuple(spawn_key)
+        self.no_of_dice = no_of_dice
+        self.__spawned = 0
+        # the spawn key goes into the seed as well, so every stream of the seed is a different one
+        self.__random = random.Random(repr((self.seed,) + self.spawn_key))
+
+    def roll(self) -> int:
+        """
+        :return: how many of the dice came up marked (0 -> no_of_dice)
+        """
+        return bin(self.__random.getrandbits(self.no_of_dice)).count("1")
+
+    def getstate(self):
+        """
+        :return: where the stream is at (setstate goes back there, e.g. when a saved game is resumed)
+        """
+        return self.__random.getstate()
+
+    def setstate(self, state) -> None:
+        self.__random.setstate(state)
+
+    def spawn(self, count=1) -> list:
+        """
+        Makes new streams that don't depend on this one, nor on each other (e.g. one for each game, or for each
+        worker). Spawning the same seed again gives the same streams, in the same order.
+        :param count: how many streams
+        :return: the new streams, of the same kind as this one
+        """
+        children = [self._child(self.spawn_key + (self.__spawned + number,)) for number in range(count)]
+        self.__spawned += count
+        return children
+
+    def _child(self, spawn_key):
+        return Dice(self.seed, spawn_key, self.no_of_dice)
+
+    def __repr__(self):
+        return type(self).__name__ + "(seed=" + str(self.seed) + ", spawn_key=" + str(self.spawn_key) + ")"
+
+
+class BufferedDice(Dice):
+    """
+        The dice of the simulations: the rolls are generated by numpy, a whole buffer at a time, so rolling costs
+        almost nothing and whole arrays of rolls can be taken at once.
+        It is not the same stream as the Dice of the same seed, but it is just as reproducible.
+    """
+    def __init__(self, seed=None, spawn_key=(), no_of_dice=NO_OF_DICE, buffer_size=1 << 16):
+        """
+        :param buffer_size: how many rolls get generated at once
+        """
+        # numpy only gets imported when the buffered dice are needed, so the game itself runs without it
+        import numpy as np
+
+        super().__init__(seed, spawn_key, no_of_dice)
+        self.buffer_size = buffer_size
+        self.__np = np
+        self.__generator = np.random.default_rng(np.random.SeedSequence(self.seed, spawn_key=self.spawn_key))
+        self.__buffer = np.empty(0, dtype=np.int8)
+        self.__rolls = None  # the buffer as python ints, for roll() (made when roll() needs it)
+        self.__position = 0
+
+    def roll(self) -> int:
+        if self.__position == len(self.__buffer):
+            self.__refill(self.buffer_size)
+        if self.__rolls is None:
+            self.__rolls = self.__buffer.tolist()
+        value = self.__rolls[self.__position]
+        self.__position += 1
+        return value
+
+    def rolls(self, count):
+        """
+        :param count: how many rolls
+        :return: the next count rolls, as a numpy array of int8
+        """
+        if len(self.__buffer) - self.__position < count:
+            self.__refill(max(self.buffer_size, count))
+        rolls = self.__buffer[self.__position:self.__position + count]
+        self.__position += count
+        return rolls
+
+    def getstate(self):
+        raise DiceException("The buffered dice can't be saved!")
+
+    def setstate(self, state) -> None:
+        raise DiceException("The buffered dice can't be saved!")
+
+    def __refill(self, size) -> None:
+        """
+        Generates a new buffer; the rolls that weren't taken yet from the old one come first.
+        """
+        left = self.__buffer[self.__position:]
+        fresh = self.__generator.binomial(self.no_of_dice, 0.5, size=size).astype(self.__np.int8)
+        self.__buffer = self.__np.concatenate((left, fresh))
+        self.__rolls = None
+        self.__position = 0
+
+    def _child(self, spawn_key):
+        return BufferedDice(self.seed, spawn_key, self.no_of_dice, self.buffer_size)
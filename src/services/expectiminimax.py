@@ -0,0 +1,206 @@
+
+import time
+
+from src.domain.game_state import DICE_PROBABILITIES, NO_OF_PIECES, SAFE_SPOT, END, legal_moves, distinct_moves, \
+    apply_move, pass_turn, winner
+from src.services.ai_strategy import AIStrategy
+from src.services.transposition import TranspositionTable, zobrist_hash, zobrist_after_move, DICE_KEYS, SIDE_KEY, \
+    EXACT, LOWER_BOUND, UPPER_BOUND
+
+WIN_VALUE = 1.0
+LOSS_VALUE = -1.0
+# pruned expected values are sums of probabilities, so they are only compared up to this rounding error
+ROUNDING_ERROR = 1e-12
+
+# how much a piece is worth on each location: the further, the better; finished pieces and pieces on the safe spot
+# are worth a bit more, since they can't be sent back to spawn anymore
+LOCATION_VALUES = tuple(location + 2 * (location == SAFE_SPOT) + 5 * (location == END) for location in range(END + 1))
+MAX_PLAYER_VALUE = LOCATION_VALUES[END] * NO_OF_PIECES
+
+# the most likely dice values get searched first, so the chance nodes can be pruned sooner
+DICE_SEARCH_ORDER = (2, 1, 3, 0, 4)
+
+
+class SearchTimeout(Exception):
+    """
+        Raised inside the search when the time budget of the move runs out.
+    """
+    pass
+
+
+class ExpectiminimaxStrategy(AIStrategy):
+    """
+        A search based AI strategy. It looks a few turns ahead, taking every dice roll into account (chance nodes,
+        weighted by how likely each roll is), and picks the move with the best expected outcome.
+        The extra throw on the double throw squares is part of the search: the same player simply moves again.
+        Chance nodes are pruned with the Star1 algorithm (alpha-beta for expectiminimax), which works because every
+        evaluation is bounded between LOSS_VALUE and WIN_VALUE.
+        Decision nodes are looked up in a transposition table before they get searched, so a position (and dice value)
+        reached again, by other moves or on a later turn, is not searched again.
+    """
+    def __init__(self, pieces, squares, depth=3, time_budget=1.0, table_size=1 << 16):
+        """
+        :param pieces: requires the pieces repository that is also assigned to game_controller
+        :param squares: requires the squares repository that is also assigned to game_controller
+        :param depth: how many moves (of either player) the ai looks ahead
+        :param time_budget: how many seconds the ai is allowed to think for a single move. The search deepens one
+        move at a time and, when the time runs out, the best move of the deepest finished search is played.
+        :param table_size: the number of slots of the transposition table (a power of 2; None -> no table)
+        """
+        super().__init__(pieces, squares)
+        self.depth = depth
+        self.time_budget = time_budget
+        self.table = TranspositionTable(table_size) if table_size is not None else None
+
+        self.__root_side = 0
+        self.__deadline = None
+        self.__nodes = 0
+        self.last_search_depth = 0
+
+    def choose_move(self, state, rolled_dice_value):
+        """
+        :param state: the packed game state
+        :param rolled_dice_value: the dice value that the ai has to work with (i.e. how many steps will the piece move)
+        :return: the move with the best expected outcome or None if no move can be made
+        """
+        self.last_search_depth = 0
+        moves = distinct_moves(legal_moves(state, rolled_dice_value))
+        if len(moves) <= 1:
+            return moves[0] if moves else None
+
+        self.__root_side = state.side
+        self.__deadline = time.perf_counter() + self.time_budget
+        self.__nodes = 0
+        if self.table is not None:
+            self.table.new_search()
+
+        best_move = moves[0]
+        for depth in range(1, self.depth + 1):
+            try:
+                best_move = self.__search_root(state, moves, depth)
+            except SearchTimeout:
+                break
+            self.last_search_depth = depth
+            moves.remove(best_move)  # the best move of this depth gets searched first on the next one
+            moves.insert(0, best_move)
+        return best_move
+
+    def __search_root(self, state, moves, depth):
+        """
+        :return: the best move of the root, searched to the given depth
+        """
+        alpha = LOSS_VALUE
+        best_move = moves[0]
+        hash_ = zobrist_hash(state)
+        for move in moves:
+            value = self.__chance(apply_move(state, move), zobrist_after_move(state, hash_, move), depth - 1, alpha,
+                                  WIN_VALUE)
+            if value > alpha or move is moves[0]:
+                alpha = value
+                best_move = move
+        return best_move
+
+    def __chance(self, state, hash_, depth, alpha, beta) -> float:
+        """
+        A chance node: the dice are about to be rolled by the side to move. Star1 pruning: after each dice value is
+        searched, if even the best/worst possible values for the remaining rolls can't bring the expected value back
+        inside (alpha, beta), the rest of the rolls are not searched anymore.
+        :param hash_: the Zobrist hash of the state
+        :return: the expected value of the state (from the root player's point of view)
+        """
+        won = winner(state)
+        if won is not None:
+            return WIN_VALUE if won == self.__root_side else LOSS_VALUE
+        if depth == 0:
+            return self.evaluate(state, self.__root_side)
+
+        self.__nodes += 1
+        if self.__nodes & 1023 == 0 and time.perf_counter() > self.__deadline:
+            raise SearchTimeout()
+
+        expected_value = 0.0
+        remaining_probability = 1.0
+        for rolled_dice_value in DICE_SEARCH_ORDER:
+            probability = DICE_PROBABILITIES[rolled_dice_value]
+            remaining_probability -= probability
+            child_alpha = (alpha - expected_value - WIN_VALUE * remaining_probability) / probability
+            child_beta = (beta - expected_value - LOSS_VALUE * remaining_probability) / probability
+            value = self.__decision(state, hash_, rolled_dice_value, depth, max(child_alpha, LOSS_VALUE),
+                                    min(child_beta, WIN_VALUE))
+            expected_value += probability * value
+            if expected_value + LOSS_VALUE * remaining_probability >= beta - ROUNDING_ERROR:
+                return beta
+            if expected_value + WIN_VALUE * remaining_probability <= alpha + ROUNDING_ERROR:
+                return alpha
+        return expected_value
+
+    def __decision(self, state, hash_, rolled_dice_value, depth, alpha, beta) -> float:
+        """
+        A decision node: the side to move picks the move that is the best for them (max for the root player, min for
+        the opponent). If no move can be made, the turn is skipped.
+        The table holds the values of the decision nodes. A value that got cut off by alpha or beta is only a bound of
+        the real one, so it gets stored (and used) as such. An entry that wasn't searched deep enough still tells which
+        move was the best, so that one gets searched first (the sooner a good move is found, the more gets pruned).
+        :param hash_: the Zobrist hash of the state
+        :return: the value of the state (from the root player's point of view)
+        """
+        if self.table is None:
+            return self.__search_decision(state, hash_, rolled_dice_value, depth, alpha, beta)[0]
+
+        table_hash = hash_ ^ DICE_KEYS[rolled_dice_value]
+        key = (state.code << 4) | (self.__root_side << 3) | rolled_dice_value
+        best_piece = 0
+        entry = self.table.probe(table_hash, key)
+        if entry is not None:
+            value, bound, entry_depth, best_piece = entry
+            if entry_depth >= depth and (bound == EXACT or (bound == LOWER_BOUND and value >= beta) or
+                                         (bound == UPPER_BOUND and value <= alpha)):
+                return value
+
+        value, best_piece = self.__search_decision(state, hash_, rolled_dice_value, depth, alpha, beta, best_piece)
+        bound = UPPER_BOUND if value <= alpha else LOWER_BOUND if value >= beta else EXACT
+        self.table.store(table_hash, key, depth, value, bound, best_piece)
+        return value
+
+    def __search_decision(self, state, hash_, rolled_dice_value, depth, alpha, beta, first_piece=0) -> tuple:
+        """
+        :param first_piece: the piece whose move gets searched first (0 -> the usual order)
+        :return: the value of the state and the piece of the best move (0 if none of them got inside (alpha, beta))
+        """
+        moves = distinct_moves(legal_moves(state, rolled_dice_value))
+        if not moves:
+            return self.__chance(pass_turn(state), hash_ ^ SIDE_KEY, depth - 1, alpha, beta), 0
+        if first_piece:
+            moves.sort(key=lambda move: move.piece != first_piece)
+
+        best_piece = 0
+        maximizing = state.side == self.__root_side
+        for move in moves:
+            value = self.__chance(apply_move(state, move), zobrist_after_move(state, hash_, move), depth - 1, alpha,
+                                  beta)
+            if maximizing and value > alpha:
+                alpha = value
+                best_piece = move.piece
+            elif not maximizing and value < beta:
+                beta = value
+                best_piece = move.piece
+            if alpha >= beta:
+                break
+        return (alpha if maximizing else beta), best_piece
+
+    @staticmethod
+    def evaluate(state, side) -> float:
+        """
+        The static evaluation of a state that is not searched any deeper: how far the player's pieces got compared
+        to the opponent's (see LOCATION_VALUES). It is always strictly between LOSS_VALUE and WIN_VALUE, unless the game
+        is over.
+        :param state: the packed game state
+        :param side: 0 for player1, 1 for player2 (whose point of view?)
+        :return: a value between -1 and 1
+        """
+        progress = 0
+        for location in state.locations(side):
+            progress += LOCATION_VALUES[location]
+        for location in state.locations(1 - side):
+            progress -= LOCATION_VALUES[location]
+        return progress / MAX_PLAYER_VALUE
@@ -1,7 +1,10 @@
 
 import time
+from collections import namedtuple
 from src.domain.entities import Player
-from src.domain.validators import MetaException
+from src.domain.game_state import GameState, legal_moves as generate_legal_moves
+from src.domain.validators import MetaException, GameControllerException
+from src.services.dice import Dice
 from src.services.tools import RandomGenerator
 
 
@@ -9,29 +12,50 @@ class DuplicationException(MetaException):
     pass
 
 
+# everything make_move changes, so unmake_move can change it back
+# -piece: the number of the moved piece (None if the turn was skipped)
+# -origin: where the piece was
+# -captured: the number of the opponent's piece that got sent back to spawn (None if there wasn't any)
+# -side: the player who moved ("player1"/"player2")
+# -dice: the rolled dice value the move was made with
+UndoRecord = namedtuple("UndoRecord", ["piece", "origin", "captured", "side", "dice"])
+
+
 class GameController:
     """
         Game Controller. Takes care that nobody is cheating at The Royal Game of Ur!
     """
-    def __init__(self, pieces, squares, players, game_controller_validator):
+    def __init__(self, pieces, squares, players, game_controller_validator, dice=None, leaderboard=None):
         """
         :param pieces: pieces repository
         :param squares: squares repository
         :param players: players repository
         :param game_controller_validator: game validator class
+        :param dice: the dice every match spawns its own stream from (None -> Dice with a random seed); seed it to
+        get the same dice in every run
+        :param leaderboard: the leaderboard repository every finished match goes on (None -> the results are only kept
+        until the players get deleted)
         """
         self.__pieces = pieces
         self.__squares = squares
         self.__players = players
+        self.__leaderboard = leaderboard
 
         self.__game_controller_validator = game_controller_validator
 
         self.__current_player_name = ""
         self.__current_player = "player1"
 
+        self.__winner = None
         self.__winner_name = None
+        self.__game_over_listeners = []
+        self.__move_listeners = []
+        self.__history = []  # the undo records of the match, in the order the moves were made
+        self.__undone = []  # the undo records of the undone moves, the last one undone at the end
         self.pve = False
 
+        self.__dice_source = dice if dice is not None else Dice()
+        self.__dice = self.__dice_source.spawn()[0]
         self.rolled_dice_value = 0
 
     @property
@@ -48,13 +72,77 @@ class GameController:
     def current_player_name(self) -> str:
         return self.__current_player_name
 
+    @property
+    def dice(self) -> Dice:
+        """
+        :return: the dice of the current match (its seed and spawn key are all it takes to roll the same dice again)
+        """
+        return self.__dice
+
+    @dice.setter
+    def dice(self, dice) -> None:
+        self.__dice = dice
+
     @property
     def winner_name(self) -> str:
+        """
+        :return: the name of the player who won the match, or None while it is still going on
+        """
         return self.__winner_name
 
+    def add_game_over_listener(self, listener) -> None:
+        """
+        :param listener: gets called as listener(winner) once, when a move ends the match; winner is
+        "player1"/"player2". The state is left as it is, so the listener can still show it (and reset it afterwards).
+        """
+        self.__game_over_listeners.append(listener)
+
+    def remove_game_over_listener(self, listener) -> None:
+        self.__game_over_listeners.remove(listener)
+
+    def add_move_listener(self, listener) -> None:
+        """
+        :param listener: gets called as listener(record, undone) after every move of the match (including skips and
+        redone moves) with undone=False, and after every undo with undone=True; record is the UndoRecord of the move.
+        Tentative moves (make_move) are not told about.
+        """
+        self.__move_listeners.append(listener)
+
+    def remove_move_listener(self, listener) -> None:
+        self.__move_listeners.remove(listener)
+
     def get_piece_by_id(self, piece_id):
         return self.__pieces.find_by_id(piece_id)
 
+    @property
+    def game_state(self) -> GameState:
+        """
+        :return: the packed (hashable) game state of the current match: all piece locations and whose turn it is
+        """
+        return GameState.from_pieces(self.__pieces, self.current_player)
+
+    def legal_moves(self, player, rolled_dice_value) -> list:
+        """
+        The one and only legal move generator: one pass over the pieces builds the occupancy of the board, then every
+        piece of the player gets checked against it.
+        :param player: "player1"/"player2"
+        :param rolled_dice_value: how many steps will the piece move
+        :return: a list of moves (piece, origin, destination, captures, extra_turn), in piece index order. If it is
+        empty, the player can't move anything and has to skip.
+        """
+        return generate_legal_moves(GameState.from_pieces(self.__pieces, player), rolled_dice_value)
+
+    def load_game_state(self, game_state) -> None:
+        """
+        Puts every piece where the packed game state says it should be and gives the turn to its side to move.
+        :param game_state: a packed game state
+        """
+        game_state.write_to(self.__pieces)
+        self.current_player = game_state.current_player
+        self.__winner = self.__winner_name = None
+        self.__history.clear()
+        self.__undone.clear()
+
     def add_player(self, player_name, player_number, is_human=True) -> None:
         """
         Adds a player to the game. If the player is not human, it sets the pve True.
@@ -82,85 +170,189 @@ class GameController:
     def roll_dice(self) -> None:
         """
         Rolls the dice. Fixes rolled_dice_value, randomly, to a value between 0 and no_of_dice.
-        no_of_dice is usually 4, but it can be set by the developer to whatever he/she might wish.
+        no_of_dice is usually 4, but it can be set by the developer to whatever he/she might wish (see Dice).
         """
-        self.rolled_dice_value = 0
-        no_of_dice = 4
-        for i in range(no_of_dice):
-            generated_side = RandomGenerator.generate_number(1, 4)
-            if generated_side == 2 or generated_side == 4:
-                self.rolled_dice_value += 1
+        self.rolled_dice_value = self.__dice.roll()
 
     def move_piece(self, piece_number) -> None:
         """
         Move a piece, any piece! The piece's location gets updated += rolled_dice_value
         :param piece_number: piece's index the player desires to move.
         """
+        self.__play(self.make_move(piece_number))
+
+    def skip_turn(self) -> None:
+        """
+        The player can't (or won't) move anything, so the turn goes to the other player.
+        """
+        self.__play(self.make_move(None))
+
+    def make_move(self, piece_number) -> UndoRecord:
+        """
+        Makes a move tentatively: nobody wins anything and it doesn't go in the history of the match. Take it back with
+        unmake_move (the last one made gets unmade first), e.g. when searching for the best move.
+        :param piece_number: piece's index the player desires to move (None skips the turn)
+        :return: the undo record of the move
+        """
+        side = self.current_player
+        dice = self.rolled_dice_value
+        if piece_number is None:
+            self.switch_players()
+            return UndoRecord(None, None, None, side, dice)
+
         self.__game_controller_validator.validate_number(piece_number)
 
         piece_number = int(piece_number)
-        self.__game_controller_validator.check_if_piece_can_be_moved(piece_number, self.__pieces, self.current_player,
-                                                                     self.rolled_dice_value
-                                                                     )
-        piece = self.__pieces.find_by_id(self.current_player + "_" + str(piece_number))
-        new_location = piece.location + self.rolled_dice_value
-
-        if new_location == 15:  # the piece reached the end
-            piece.location = new_location
+        legal_moves = self.legal_moves(side, dice)
+        move = self.__game_controller_validator.check_if_piece_can_be_moved(piece_number, legal_moves, self.__pieces,
+                                                                            side, dice)
+        captured = None
+        if move.captures:
+            captured_piece = self.__pieces.piece_at(GameController.opponent_of(side), move.destination)
+            captured_piece.location = 0
+            captured = captured_piece.index
+        self.__pieces.find_by_id(side + "_" + str(piece_number)).location = move.destination
+
+        if not move.extra_turn:
             self.switch_players()
-            return
+        return UndoRecord(piece_number, move.origin, captured, side, dice)
 
-        for existing_piece in self.__pieces.get_all():
-            if existing_piece.location == new_location and self.__squares.find_by_location(new_location).is_warzone:
-                self.__pieces.find_by_id(existing_piece.id).location = 0
-        piece.location = new_location
-
-        if 4 < new_location < 13:
-            sector = "_warzone"
-        else:
-            sector = "_" + self.current_player + "_safezone"
-        current_square = self.__squares.find_by_id(str(new_location) + sector)
-        if not current_square.is_double_throw:
-            self.switch_players()
+    def unmake_move(self, record) -> None:
+        """
+        Takes back a move made by make_move: the pieces go back where they were, and it's the turn of whoever made the
+        move again, with the same dice.
+        :param record: the undo record make_move returned
+        """
+        if record.piece is not None:
+            piece = self.__pieces.find_by_id(record.side + "_" + str(record.piece))
+            destination = piece.location
+            piece.location = record.origin
+            if record.captured is not None:
+                captured_id = GameController.opponent_of(record.side) + "_" + str(record.captured)
+                self.__pieces.find_by_id(captured_id).location = destination
+        self.current_player = record.side
+        self.rolled_dice_value = record.dice
+
+    @property
+    def can_undo(self) -> bool:
+        """
+        :return: is there a move to take back? Once the match is over there isn't: the win was already given (and
+        queued on the leaderboard), so it can't be taken back
+        """
+        return self.__winner is None and len(self.__history) > 0
+
+    @property
+    def can_redo(self) -> bool:
+        return self.__winner is None and len(self.__undone) > 0
+
+    def undo(self) -> None:
+        """
+        Takes back the last move of the match. It's the turn of whoever made it again, with the dice he/she rolled.
+        """
+        if self.__winner is not None:
+            raise GameControllerException("The match is over, its moves can't be taken back!")
+        if not self.can_undo:
+            raise GameControllerException("There is no move to undo!")
+        record = self.__history.pop()
+        self.unmake_move(record)
+        self.__undone.append(record)
+        self.__tell_move_listeners(record, True)
+
+    def redo(self) -> None:
+        """
+        Makes the last undone move again, with the dice it was made with.
+        """
+        if self.__winner is not None:
+            raise GameControllerException("The match is over, its moves can't be made again!")
+        if not self.can_redo:
+            raise GameControllerException("There is no move to redo!")
+        record = self.__undone.pop()
+        self.rolled_dice_value = record.dice
+        record = self.make_move(record.piece)
+        self.__history.append(record)
+        self.__tell_move_listeners(record, False)
+        self.__check_game_over(record.side)
+
+    def __play(self, record) -> None:
+        """
+        A move was made in the match: it goes in the history (a new move means there is nothing to redo anymore), then
+        the game might be over.
+        :param record: the undo record of the move
+        """
+        self.__history.append(record)
+        self.__undone.clear()
+        self.__tell_move_listeners(record, False)
+        self.__check_game_over(record.side)
+
+    def __tell_move_listeners(self, record, undone) -> None:
+        for listener in list(self.__move_listeners):
+            listener(record, undone)
+
+    @staticmethod
+    def opponent_of(player) -> str:
+        """
+        :param player: "player1"/"player2"
+        :return: the other one
+        """
+        return "player2" if player == "player1" else "player1"
+
+    def __check_game_over(self, player) -> None:
+        """
+        Only the player who just moved can have won, so only his/her finished pieces get counted (the repo keeps that
+        count up to date). The first time they are all there, the match is over: the winner gets the win, the result
+        gets queued on the leaderboard and the game over listeners get told, just once.
+        :param player: "player1"/"player2", the player who just moved
+        """
+        if self.__winner is not None or not self.__has_finished(player):
+            return
+        self.__winner = player
+        winner = self.__find_player(int(player[-1]))
+        if winner is not None:
+            winner.increment_wins()
+            self.__winner_name = winner.name
+            loser = self.__find_player(int(GameController.opponent_of(player)[-1]))
+            if self.__leaderboard is not None and loser is not None:
+                self.__leaderboard.add_result(winner.name, loser.name)
+        for listener in list(self.__game_over_listeners):
+            listener(player)
+
+    def __has_finished(self, player) -> bool:
+        return self.__pieces.finish_count(player) == len(self.__pieces.get_all()) / 2
+
+    def __find_player(self, player_number):
+        for player in self.__players.get_all():
+            if player.number == player_number:
+                return player
 
     def win(self) -> bool:
         """
         Did somebody win yet?
         :return: True or False
         """
-        self.__winner_name = self.get_winner_name()
-        if self.__winner_name is None:
-            return False
-        return True
+        return self.get_winner() is not None
 
     def get_winner_name(self):
         """
-        Hurray! Somebody won! What is his/her name?
+        Hurray! Somebody won! What is his/her name? (Nothing gets changed, so ask as often as you like.)
         :return: winner's name; if there isn't any winner, it returns None
         """
-        if self.get_winner() is None:
+        winner = self.get_winner()
+        if winner is None:
             return None
-
-        winner_number = int(self.get_winner()[-1])
-        for player in self.__players.get_all():
-            if player.number == winner_number:
-                player.increment_wins()
-                self.reset_all()
-                return player.name
+        player = self.__find_player(int(winner[-1]))
+        if player is None:
+            return None
+        return player.name
 
     def get_winner(self):
         """
-        This method actually goes through the repo and sees if anybody has all their pieces on the end squares.
+        This method asks the repo if anybody has all their pieces on the end squares (the repo keeps count of them as
+        they move, so nothing gets iterated).
         :return: "player1"/"player2". In case nobody won yet, it returns None.
         """
-        no_of_pieces = len(self.__pieces.get_all())/2
-        end_pieces = {"player1": 0, "player2": 0}
-        for piece in self.__pieces.get_all():
-            if piece.state == "finish":
-                end_pieces[piece.id.split("_")[0]] += 1
-        if end_pieces["player1"] == no_of_pieces:
+        if self.__has_finished("player1"):
             return "player1"
-        elif end_pieces["player2"] == no_of_pieces:
+        elif self.__has_finished("player2"):
             return "player2"
         return None
 
@@ -181,9 +373,13 @@ class GameController:
         By default, pve is False. AI player is out of the game (computer.number = 0).
         All players that are not AI get deleted. This, of course, can be changed in case one might wish to implement
         a leaderboard system.
-        All pieces get back to spawn.
+        All pieces get back to spawn, and the next match gets a new stream of dice.
         """
         self.pve = False
+        self.__winner = self.__winner_name = None
+        self.__history.clear()
+        self.__undone.clear()
+        self.__dice = self.__dice_source.spawn()[0]
         if self.__players.id_exists("computer"):
             self.__players.find_by_id("computer").number = 0
         for piece in self.__pieces.get_all():
@@ -205,13 +401,13 @@ class GameController:
             new_player = "player2"
         self.current_player = new_player
 
-    def ai_makes_a_move(self) -> None:
+    def ai_makes_a_move(self, presentation_delay=1.0) -> None:
         """
         The AI make a move.
         He rolls his own dice, and moves his own pieces.
+        :param presentation_delay: how many seconds to wait first, so the human can follow what's happening
         """
-        no_of_seconds_to_sleep = 1
-        time.sleep(no_of_seconds_to_sleep)
+        time.sleep(presentation_delay)
 
         self.roll_dice()
         self.ai_moves_piece()
@@ -222,11 +418,28 @@ class GameController:
         If he can't move any, he will skip.
         If he can in fact move, his piece will get relocated to its location + rolled_dice_value
         """
+        self.ai_plays(self.ai_chooses_a_move())
+
+    def ai_chooses_a_move(self):
+        """
+        The AI thinks about his move, for the dice he already rolled. Nothing gets changed, so the (possibly long)
+        thinking can be done off the main thread.
+        :return: the number of the piece the AI wants to move (string format), or None if he has to skip
+        """
         ai = self.__players.find_by_id("computer")
         if not ai.can_make_move(self.rolled_dice_value):
-            self.switch_players()
+            return None
+        return ai.get_piece_number_to_move(self.rolled_dice_value)
+
+    def ai_plays(self, piece_number) -> None:
+        """
+        The AI makes the move he chose (see ai_chooses_a_move).
+        :param piece_number: the number of the piece to move, or None to skip
+        """
+        if piece_number is None:
+            self.skip_turn()
             return
-        self.move_piece(ai.get_piece_number_to_move(self.rolled_dice_value))
+        self.move_piece(piece_number)
 
     def player_wins(self, player_number: int) -> None:
         """
@@ -241,3 +454,4 @@ class GameController:
             self.__pieces.find_by_id(piece_id).location = 15
             index += 1
             piece_id = player + "_" + str(index)
+        self.__check_game_over(player)
@@ -0,0 +1,315 @@
+"""
+    The game records: every game, written down in a few bytes, so it can be replayed or analyzed later.
+    A file holds any number of records, one after the other. A record is:
+    -a header: magic, version, pieces per player, flags (pve, who moved first), the seed of the dice, the position the
+    record starts from (the initial one, unless the game was resumed), the spawn key of the dice, the names of the two
+    players
+    -one byte for every turn: the rolled dice value in the high 4 bits, the moved piece in the low 4 bits (0 -> the
+    turn was skipped); UNDO_TURN if the last turn was taken back
+    -END_OF_RECORD, when the game is over (or got abandoned)
+"""
+
+import struct
+from collections import namedtuple
+
+from src.domain.game_state import NO_OF_PIECES, PLAYERS, SIDE_SHIFT, BITS_PER_PLAYER, BITS_PER_PIECE, GameState
+from src.domain.validators import MetaException
+
+RECORD_MAGIC = b"URGR"
+RECORD_VERSION = 2
+# magic, version, pieces per player, flags, seed, starting position (packed game state), spawn key length
+RECORD_HEADER = struct.Struct("<4sHBBQQB")
+SPAWN_KEY_ITEM = struct.Struct("<I")
+PVE_FLAG = 1
+PLAYER2_STARTS_FLAG = 2
+
+UNDO_TURN = 0xFE
+END_OF_RECORD = 0xFF
+
+# a game, as it was read from a file
+# -seed, spawn_key: the dice of the game (Dice(seed, spawn_key) rolls them again)
+# -names: the names of player1 and player2
+# -pieces: pieces per player
+# -pve: was player2 the computer?
+# -first_player: who moved first ("player1"/"player2")
+# -turns: bytes, one for every turn (see encode_turn), without the END_OF_RECORD
+# -finished: False if the file ended before the record did
+# -start: the packed game state the turns are played from
+GameRecord = namedtuple("GameRecord", ["seed", "spawn_key", "names", "pieces", "pve", "first_player", "turns",
+                                       "finished", "start"])
+
+
+class GameRecordException(MetaException):
+    pass
+
+
+def encode_turn(rolled_dice_value, piece_number) -> int:
+    """
+    :param rolled_dice_value: 0 -> 4
+    :param piece_number: the number of the moved piece (None or 0 if the turn was skipped)
+    :return: the byte of the turn
+    """
+    return (rolled_dice_value << 4) | (piece_number or 0)
+
+
+def decode_turn(turn) -> tuple:
+    """
+    :param turn: the byte of a turn (not UNDO_TURN)
+    :return: the rolled dice value and the number of the moved piece (None if the turn was skipped)
+    """
+    return turn >> 4, (turn & 15) or None
+
+
+def encode_header(seed, spawn_key, names, pve, first_player="player1", pieces=NO_OF_PIECES, start=None) -> bytes:
+    """
+    :param start: the packed game state the record starts from (None -> the initial one, first_player to move); who
+    moves first is the side to move of start
+    :return: the header of a record (see the module's docstring)
+    """
+    if start is None:
+        start = GameState(PLAYERS.index(first_player) << SIDE_SHIFT)
+    flags = (PVE_FLAG if pve else 0) | (PLAYER2_STARTS_FLAG if start.side else 0)
+    header = RECORD_HEADER.pack(RECORD_MAGIC, RECORD_VERSION, pieces, flags, seed, start.code, len(spawn_key))
+    header += b"".join(SPAWN_KEY_ITEM.pack(item) for item in spawn_key)
+    for name in names:
+        encoded_name = name.encode("utf-8")
+        if len(encoded_name) > 255:
+            raise GameRecordException("The name of the player is too long to be recorded!")
+        header += bytes((len(encoded_name),)) + encoded_name
+    return header
+
+
+class GameRecordWriter:
+    """
+        Writes records to a file, through a large buffer, so recording a turn is only appending a byte in memory.
+        Records get appended to what is already in the file.
+    """
+    def __init__(self, path, buffer_size=1 << 16):
+        """
+        :param path: the file of the records
+        :param buffer_size: how many bytes get gathered before they are written
+        """
+        self.__file = open(path, "ab", buffering=buffer_size)
+        self.__in_record = False
+
+    @property
+    def in_record(self) -> bool:
+        """
+        :return: is a record started and not ended yet?
+        """
+        return self.__in_record
+
+    def begin(self, seed, spawn_key, names, pve, first_player="player1", pieces=NO_OF_PIECES, start=None) -> None:
+        """
+        Starts the record of a new game (the one that is not ended yet gets ended first).
+        """
+        if self.__in_record:
+            self.end()
+        self.__file.write(encode_header(seed, spawn_key, names, pve, first_player, pieces, start))
+        self.__in_record = True
+
+    def turn(self, rolled_dice_value, piece_number) -> None:
+        """
+        :param rolled_dice_value: 0 -> 4
+        :param piece_number: the number of the moved piece (None if the turn was skipped)
+        """
+        self.__file.write(bytes((encode_turn(rolled_dice_value, piece_number),)))
+
+    def undo(self) -> None:
+        self.__file.write(bytes((UNDO_TURN,)))
+
+    def write_turns(self, turns) -> None:
+        """
+        :param turns: the bytes of many turns at once
+        """
+        self.__file.write(turns)
+
+    def end(self) -> None:
+        self.__file.write(bytes((END_OF_RECORD,)))
+        self.__in_record = False
+
+    def flush(self) -> None:
+        self.__file.flush()
+
+    def close(self) -> None:
+        """
+        Ends the record that is still going on, if any, and writes everything to the file.
+        """
+        if self.__in_record:
+            self.end()
+        self.__file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+def parse_records(data):
+    """
+    :param data: the contents of a records file (bytes, or anything that can be sliced like bytes, e.g. a mmap)
+    :return: a generator of the GameRecords in it, in order
+    """
+    position = 0
+    while position < len(data):
+        record, position = parse_record(data, position)
+        yield record
+
+
+def parse_record(data, position) -> tuple:
+    """
+    :param data: the contents of a records file
+    :param position: where the record starts
+    :return: the GameRecord and where the next one starts
+    """
+    try:
+        magic, version, pieces, flags, seed, start, spawn_key_length = RECORD_HEADER.unpack_from(data, position)
+        if magic != RECORD_MAGIC or version != RECORD_VERSION:
+            raise GameRecordException("This is not a game record (or it was written by another version)!")
+        position += RECORD_HEADER.size
+        spawn_key = tuple(SPAWN_KEY_ITEM.unpack_from(data, position + index * SPAWN_KEY_ITEM.size)[0]
+                          for index in range(spawn_key_length))
+        position += spawn_key_length * SPAWN_KEY_ITEM.size
+        names = []
+        for _ in range(2):
+            name_length = data[position]
+            names.append(bytes(data[position + 1:position + 1 + name_length]).decode("utf-8"))
+            position += 1 + name_length
+    except (struct.error, IndexError):
+        raise GameRecordException("The game record is cut off in its header!")
+
+    end = data.find(bytes((END_OF_RECORD,)), position)
+    finished = end >= 0
+    if not finished:
+        end = len(data)
+    first_player = "player2" if flags & PLAYER2_STARTS_FLAG else "player1"
+    record = GameRecord(seed, spawn_key, tuple(names), pieces, bool(flags & PVE_FLAG), first_player,
+                        bytes(data[position:end]), finished, GameState(start))
+    return record, end + 1
+
+
+def skip_header(data, position) -> tuple:
+    """
+    Reads only what is needed to go through the turns of a record, without decoding anything else (see the analyzer).
+    :param data: the contents of a records file
+    :param position: where the record starts
+    :return: the pieces per player, the flags, the packed game state the record starts from and where the turns start
+    """
+    try:
+        magic, version, pieces, flags, _, start, spawn_key_length = RECORD_HEADER.unpack_from(data, position)
+        if magic != RECORD_MAGIC or version != RECORD_VERSION:
+            raise GameRecordException("This is not a game record (or it was written by another version)!")
+        position += RECORD_HEADER.size + spawn_key_length * SPAWN_KEY_ITEM.size
+        for _ in range(2):
+            position += 1 + data[position]
+    except (struct.error, IndexError):
+        raise GameRecordException("The game record is cut off in its header!")
+    return pieces, flags, start, position
+
+
+def read_records(path) -> list:
+    """
+    :param path: a file written by GameRecordWriter
+    :return: all the GameRecords in the file
+    """
+    with open(path, "rb") as records_file:
+        return list(parse_records(records_file.read()))
+
+
+def replay(record, game_controller) -> None:
+    """
+    Plays a recorded game again, turn by turn, from where the record starts: the players are added, the pieces are put
+    on the starting position, then the recorded dice are rolled and the recorded pieces get moved (and undone). The
+    game controller gets reset first.
+    :param record: a GameRecord
+    :param game_controller: where to play it (if a GameRecorder records it, the replay gets recorded as well)
+    """
+    if record.pieces != NO_OF_PIECES:
+        raise GameRecordException("The game was played with " + str(record.pieces) + " pieces per player!")
+    game_controller.reset_all()
+    game_controller.add_player(record.names[0], 1)
+    if record.pve:
+        game_controller.add_player(None, None, is_human=False)
+    else:
+        game_controller.add_player(record.names[1], 2)
+    game_controller.load_game_state(record.start)
+
+    for turn in record.turns:
+        if turn == UNDO_TURN:
+            game_controller.undo()
+            continue
+        game_controller.rolled_dice_value, piece_number = decode_turn(turn)
+        if piece_number is None:
+            game_controller.skip_turn()
+        else:
+            game_controller.move_piece(piece_number)
+
+
+class GameRecorder:
+    """
+        Records every game played through a game controller. A record starts with the first move of a match (from the
+        position before it, so a resumed match is recorded from where it was resumed) and ends when the match is over,
+        or when a move of another match comes (the old one got abandoned).
+    """
+    def __init__(self, game_controller, writer):
+        """
+        :param game_controller: the game controller whose games get recorded
+        :param writer: a GameRecordWriter
+        """
+        self.__game_controller = game_controller
+        self.__writer = writer
+        self.__dice = None  # the dice of the match being recorded (every match has its own)
+        self.__turns = 0  # the turns in the record, without the undone ones: no undo goes past the start of the record
+        game_controller.add_move_listener(self.__moved)
+        game_controller.add_game_over_listener(self.__game_over)
+
+    def __moved(self, record, undone) -> None:
+        game_controller = self.__game_controller
+        if game_controller.dice is not self.__dice or not self.__writer.in_record or (undone and not self.__turns):
+            # the record starts right before this move: that's not the initial position if the match was resumed (or
+            # if an undo took back a move from before the record)
+            self.__dice = game_controller.dice
+            self.__turns = 0
+            names = (game_controller.get_name_for_player(1), game_controller.get_name_for_player(2))
+            start = game_controller.game_state
+            if not undone:
+                start = GameRecorder.__position_before(start, record)
+            self.__writer.begin(self.__dice.seed, self.__dice.spawn_key, names, game_controller.pve, start=start)
+            if undone:
+                return  # the record starts after the undo, there is nothing to take back in it
+        if undone:
+            self.__writer.undo()
+            self.__turns -= 1
+        else:
+            self.__writer.turn(record.dice, record.piece)
+            self.__turns += 1
+
+    @staticmethod
+    def __position_before(state, record) -> GameState:
+        """
+        :param state: the packed game state right after a move
+        :param record: the undo record of the move
+        :return: the packed game state right before the move
+        """
+        side = PLAYERS.index(record.side)
+        code = (state.code & ~(1 << SIDE_SHIFT)) | (side << SIDE_SHIFT)
+        if record.piece is not None:
+            shift = side * BITS_PER_PLAYER + (record.piece - 1) * BITS_PER_PIECE
+            destination = (code >> shift) & 15
+            code = (code & ~(15 << shift)) | (record.origin << shift)
+            if record.captured is not None:
+                code |= destination << ((1 - side) * BITS_PER_PLAYER + (record.captured - 1) * BITS_PER_PIECE)
+        return GameState(code)
+
+    def __game_over(self, winner) -> None:
+        if self.__writer.in_record:
+            self.__writer.end()
+
+    def close(self) -> None:
+        """
+        Stops recording and closes the writer.
+        """
+        self.__game_controller.remove_move_listener(self.__moved)
+        self.__game_controller.remove_game_over_listener(self.__game_over)
+        self.__writer.close()
@@ -0,0 +1,99 @@
+"""
+    The geometry of the board: where every piece is drawn, for every player, piece index and location. Everything is
+    computed once, when the module is imported, so drawing a piece is only a table lookup.
+"""
+
+from src.domain.game_state import NO_OF_PIECES, PLAYERS, END
+
+COLUMNS = NO_OF_PIECES + 8  # the spawn row is as long as the pieces of a player, the end row starts after 8 squares
+ROWS = 5
+
+
+def compute_offset(piece_location, index, player) -> (int, int):
+    """
+    :param piece_location: the location of the piece (0 -> 15)
+    :param index: the index of the piece (ranging from 1 to 7)
+    :param player: can either be "player1" or "player2"
+    :return: (column, row) of the square the piece is drawn on
+    """
+    if piece_location == 0:
+        row = 0
+        if player == "player2":
+            row = 4
+        return index - 1, row
+    if piece_location == END:
+        row = 1
+        if player == "player2":
+            row = 3
+        return 7 + index, row
+    if 5 <= piece_location <= 12:
+        return piece_location - 5, 2
+    if 1 <= piece_location <= 4:
+        column = 4 - piece_location
+    else:
+        column = 20 - piece_location
+    row = 1
+    if player == "player2":
+        row = 3
+    return column, row
+
+
+# OFFSETS[player][index - 1][location] -> (column, row)
+OFFSETS = {player: tuple(tuple(compute_offset(location, index, player) for location in range(END + 1))
+                         for index in range(1, NO_OF_PIECES + 1))
+           for player in PLAYERS}
+
+
+class Geometry:
+    """
+        The pixel coordinates of the board: the center and the rect (left, top, width, height) of every piece, for
+        every player, piece index and location, computed once.
+    """
+    def __init__(self, base_position, square_size, piece_size):
+        """
+        :param base_position: (x, y) of the center of the (0, 0) square
+        :param square_size: (width, height) of a square
+        :param piece_size: (width, height) of a piece
+        """
+        self.base_position = base_position
+        self.square_size = square_size
+        self.piece_size = piece_size
+
+        self.__centers = {player: tuple(tuple(self.center_of(offset) for offset in offsets)
+                                        for offsets in OFFSETS[player])
+                          for player in PLAYERS}
+        self.__rects = {player: tuple(tuple((x - piece_size[0] // 2, y - piece_size[1] // 2) + tuple(piece_size)
+                                            for x, y in centers)
+                                      for centers in self.__centers[player])
+                        for player in PLAYERS}
+
+    def center_of(self, offset) -> (int, int):
+        """
+        :param offset: (column, row) of a square
+        :return: (x, y) of the center of the square
+        """
+        return (self.base_position[0] + offset[0] * self.square_size[0],
+                self.base_position[1] + offset[1] * self.square_size[1])
+
+    def center(self, player, index, location) -> (int, int):
+        """
+        :return: (x, y) of the center of the piece
+        """
+        return self.__centers[player][index - 1][location]
+
+    def rect(self, player, index, location) -> (int, int, int, int):
+        """
+        :return: (left, top, width, height) of the piece
+        """
+        return self.__rects[player][index - 1][location]
+
+    def bounds(self, margin=0) -> (int, int, int, int):
+        """
+        :param margin: how many pixels to add around every piece (e.g. for the selection squares)
+        :return: (left, top, width, height) of the region every piece can be drawn in
+        """
+        left = self.base_position[0] - self.piece_size[0] // 2 - margin
+        top = self.base_position[1] - self.piece_size[1] // 2 - margin
+        right = self.base_position[0] + (COLUMNS - 1) * self.square_size[0] + self.piece_size[0] // 2 + margin + 1
+        bottom = self.base_position[1] + (ROWS - 1) * self.square_size[1] + self.piece_size[1] // 2 + margin + 1
+        return left, top, right - left, bottom - top
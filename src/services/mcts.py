@@ -0,0 +1,187 @@
+
+import math
+import random
+import time
+from collections import deque
+
+from src.domain.game_state import legal_moves, distinct_moves, apply_move, pass_turn, winner
+from src.services.ai_strategy import AIStrategy
+from src.services.dice import Dice
+
+
+class ChanceNode:
+    """
+        The state right after a move (or a skip): the side to move is about to roll the dice.
+        -mover: the side that made the move; wins are counted from its point of view
+    """
+    __slots__ = ("state", "mover", "children", "visits", "wins")
+
+    def __init__(self, state, mover):
+        self.state = state
+        self.mover = mover
+        self.children = dict()  # rolled dice value -> DecisionNode
+        self.visits = 0
+        self.wins = 0
+
+
+class DecisionNode:
+    """
+        The side to move rolled the dice and has to pick a move. If it can't move, its only "move" is None (skip).
+    """
+    __slots__ = ("state", "rolled_dice_value", "moves", "children", "visits")
+
+    def __init__(self, state, rolled_dice_value):
+        self.state = state
+        self.rolled_dice_value = rolled_dice_value
+        self.moves = distinct_moves(legal_moves(state, rolled_dice_value)) or [None]
+        self.children = []  # ChanceNode for each of the moves, in order (only the tried ones)
+        self.visits = 0
+
+
+class MCTSStrategy(AIStrategy):
+    """
+        A Monte Carlo Tree Search AI strategy: it plays random games (playouts) from the current position until its
+        time budget runs out, growing a tree of the most promising moves (UCT) and dice rolls (chance nodes) along the
+        way, and then picks the move that was visited the most.
+        The tree is kept between the ai's turns: when the next position was already explored, the search carries on
+        from there.
+    """
+    def __init__(self, pieces, squares, time_budget=1.0, exploration=1.4, max_playouts=None, seed=None, dice=None):
+        """
+        :param pieces: requires the pieces repository that is also assigned to game_controller
+        :param squares: requires the squares repository that is also assigned to game_controller
+        :param time_budget: how many seconds the ai is allowed to think for a single move
+        :param exploration: the UCT exploration constant: the higher, the more the less visited moves get tried
+        :param max_playouts: stop earlier, after this many playouts (None -> only the time budget counts)
+        :param seed: the seed of the random moves of the playouts (None -> random)
+        :param dice: the dice the playouts spawn their own stream from, e.g. the dice of the match (None -> Dice(seed))
+        """
+        super().__init__(pieces, squares)
+        self.time_budget = time_budget
+        self.exploration = exploration
+        self.max_playouts = max_playouts
+        self.__random = random.Random(seed)
+        self.__dice = (dice if dice is not None else Dice(seed)).spawn()[0]
+
+        self.__tree = None
+        self.last_playouts = 0
+        self.playouts_per_second = 0.0
+        self.reused_visits = 0
+
+    def choose_move(self, state, rolled_dice_value):
+        """
+        :param state: the packed game state
+        :param rolled_dice_value: the dice value that the ai has to work with (i.e. how many steps will the piece move)
+        :return: the most visited move or None if no move can be made
+        """
+        self.last_playouts = 0
+        self.playouts_per_second = 0.0
+        root = self.__find_in_tree(state, rolled_dice_value)
+        if root.moves == [None]:
+            return None
+        self.reused_visits = root.visits
+        if len(root.moves) == 1:
+            self.__keep_subtree(root, 0)
+            return root.moves[0]
+
+        start = time.perf_counter()
+        deadline = start + self.time_budget
+        playouts = 0
+        while time.perf_counter() < deadline and (self.max_playouts is None or playouts < self.max_playouts):
+            self.__iterate(root)
+            playouts += 1
+        elapsed = time.perf_counter() - start
+        self.last_playouts = playouts
+        self.playouts_per_second = playouts / elapsed if elapsed > 0 else 0.0
+        if not root.children:  # the budget ran out before the first playout: nothing to go by
+            self.__keep_subtree(root, 0)
+            return root.moves[0]
+
+        most_visited = max(range(len(root.children)), key=lambda child: root.children[child].visits)
+        self.__keep_subtree(root, most_visited)
+        return root.moves[most_visited]
+
+    def __find_in_tree(self, state, rolled_dice_value) -> DecisionNode:
+        """
+        Looks for the position in what is left of the previous search (the chance node after the ai's last move).
+        :return: the matching decision node, or a fresh one if the position wasn't explored
+        """
+        if self.__tree is not None:
+            nodes = deque([(self.__tree, 0)])
+            max_depth = 8
+            while nodes:
+                chance, depth = nodes.popleft()
+                for dice, decision in chance.children.items():
+                    if decision.state == state and dice == rolled_dice_value:
+                        return decision
+                    if depth < max_depth:
+                        nodes.extend((child, depth + 1) for child in decision.children)
+        return DecisionNode(state, rolled_dice_value)
+
+    def __keep_subtree(self, root, child) -> None:
+        """
+        Keeps the chance node of the chosen move, so the next search can reuse it.
+        """
+        if child >= len(root.children):
+            root.children.append(ChanceNode(apply_move(root.state, root.moves[child]), root.state.side))
+        self.__tree = root.children[child]
+
+    def __iterate(self, root) -> None:
+        """
+        One playout: select a path down the tree, add a node to it, play the rest of the game randomly and count the
+        result on every node of the path.
+        """
+        decision = root
+        path = []
+        while True:
+            decision.visits += 1
+            if len(decision.children) < len(decision.moves):
+                move = decision.moves[len(decision.children)]
+                next_state = pass_turn(decision.state) if move is None else apply_move(decision.state, move)
+                chance = ChanceNode(next_state, decision.state.side)
+                decision.children.append(chance)
+                path.append(chance)
+                won = self.__playout(next_state)
+                break
+            chance = self.__select(decision)
+            path.append(chance)
+            won = winner(chance.state)
+            if won is not None:
+                break
+            rolled_dice_value = self.__dice.roll()
+            if rolled_dice_value not in chance.children:
+                chance.children[rolled_dice_value] = DecisionNode(chance.state, rolled_dice_value)
+            decision = chance.children[rolled_dice_value]
+
+        for chance in path:
+            chance.visits += 1
+            if chance.mover == won:
+                chance.wins += 1
+
+    def __select(self, decision) -> ChanceNode:
+        """
+        :return: the child with the best UCT score: wins / visits + exploration * sqrt(ln(parent visits) / visits)
+        """
+        log_visits = math.log(decision.visits)
+        best_child = None
+        best_score = -1.0
+        for child in decision.children:
+            score = child.wins / child.visits + self.exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best_score = score
+                best_child = child
+        return best_child
+
+    def __playout(self, state) -> int:
+        """
+        Plays the game until the end, with random moves.
+        :return: the winner (0 -> player1, 1 -> player2)
+        """
+        rng = self.__random
+        roll = self.__dice.roll
+        won = winner(state)
+        while won is None:
+            moves = legal_moves(state, roll())
+            state = apply_move(state, rng.choice(moves)) if moves else pass_turn(state)
+            won = winner(state)
+        return won
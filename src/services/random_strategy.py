@@ -0,0 +1,28 @@
+
+import random
+
+from src.domain.game_state import legal_moves
+from src.services.ai_strategy import AIStrategy
+
+
+class RandomStrategy(AIStrategy):
+    """
+        The weakest possible AI strategy: it moves a random piece. Useful as a baseline when measuring the others.
+    """
+    def __init__(self, pieces, squares, seed=None):
+        """
+        :param pieces: requires the pieces repository that is also assigned to game_controller
+        :param squares: requires the squares repository that is also assigned to game_controller
+        :param seed: the seed of the random choices (None -> random)
+        """
+        super().__init__(pieces, squares)
+        self.__random = random.Random(seed)
+
+    def choose_move(self, state, rolled_dice_value):
+        """
+        :param state: the packed game state
+        :param rolled_dice_value: the dice value that the ai has to work with (i.e. how many steps will the piece move)
+        :return: a random legal move or None if no move can be made
+        """
+        moves = legal_moves(state, rolled_dice_value)
+        return self.__random.choice(moves) if moves else None
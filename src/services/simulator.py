@@ -0,0 +1,117 @@
+"""
+    The batch simulator. Plays many games at once, with numpy arrays instead of repositories, so strategies can be
+    evaluated over millions of games.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+from src.domain.game_state import NO_OF_PIECES, END, SAFE_SPOT, DOUBLE_THROW_LOCATIONS
+from src.services.dice import BufferedDice
+
+# -winners: array (N,) with 0 (player1 won) / 1 (player2 won) / -1 (the game was stopped after max_turns)
+# -turns: array (N,) with how many turns (dice rolls) each game took
+# -locations: array (N, 2, 7) with the final piece locations of both players
+# -dice: array (max turns, N) with the rolled dice of each turn of each game (only if record_dice was asked for)
+SimulationResults = namedtuple("SimulationResults", ["winners", "turns", "locations", "dice"])
+
+# the AIStrategy scores, for every destination square (see AIStrategy.choose_move); captures get their own score
+DESTINATION_SCORES = np.array([10 if 5 <= location <= 12 else 20 for location in range(END + 1)], dtype=np.int8)
+DESTINATION_SCORES[list(DOUBLE_THROW_LOCATIONS)] = 30
+DESTINATION_SCORES[SAFE_SPOT] = 50
+DESTINATION_SCORES[END] = 100
+CAPTURE_SCORE = 40
+
+IS_WARZONE = np.array([5 <= location <= 12 for location in range(END + 1)])
+IS_DOUBLE_THROW = np.isin(np.arange(END + 1), DOUBLE_THROW_LOCATIONS)
+
+
+class BatchSimulator:
+    """
+        Advances N games at once. Both players play the built-in AIStrategy heuristic, move for move the same way as
+        the scalar engine (GameState + AIStrategy) does, given the same dice.
+    """
+    def __init__(self, seed=None, max_turns=10000):
+        """
+        :param seed: the seed of the dice (None -> random); see BufferedDice
+        :param max_turns: games that take longer than this get stopped (the heuristic never gets stuck, it is only a
+        safety net)
+        """
+        self.__dice = BufferedDice(seed)
+        self.max_turns = max_turns
+
+    def play(self, no_of_games, record_dice=False) -> SimulationResults:
+        """
+        :param no_of_games: how many games to play (all of them start with player1 to move)
+        :param record_dice: keep every rolled dice value, e.g. to replay the games with the scalar engine
+        :return: the results of all the games
+        """
+        locations = np.zeros((no_of_games, 2, NO_OF_PIECES), dtype=np.int8)
+        sides = np.zeros(no_of_games, dtype=np.int8)
+        winners = np.full(no_of_games, -1, dtype=np.int8)
+        turns = np.zeros(no_of_games, dtype=np.int32)
+        rolled_dice = []
+
+        active = np.arange(no_of_games)
+        for _ in range(self.max_turns):
+            if len(active) == 0:
+                break
+            dice = self.__dice.rolls(no_of_games)
+            if record_dice:
+                rolled_dice.append(dice)
+            turns[active] += 1
+            BatchSimulator.advance(locations, sides, active, dice[active])
+
+            finished = (locations[active] == END).all(axis=2).any(axis=1)
+            if finished.any():
+                done = active[finished]
+                winners[done] = np.where((locations[done, 0] == END).all(axis=1), 0, 1)
+                active = active[~finished]
+
+        dice_log = np.array(rolled_dice) if record_dice else None
+        return SimulationResults(winners, turns, locations, dice_log)
+
+    @staticmethod
+    def advance(locations, sides, games, dice) -> None:
+        """
+        Plays one turn in each of the given games, in place: the side to move picks its best move with the heuristic
+        (or skips if it can't move) and the turn passes, unless the piece landed on a double throw square.
+        :param locations: array (N, 2, 7) of piece locations
+        :param sides: array (N,) with the side to move of each game
+        :param games: the indexes of the games to advance
+        :param dice: the rolled dice value of each of those games
+        """
+        rows = np.arange(len(games))
+        own_sides = sides[games]
+        own = locations[games, own_sides].astype(np.int16)
+        other = locations[games, 1 - own_sides].astype(np.int16)
+
+        own_occupied = np.zeros((len(games), END + 2), dtype=bool)
+        other_occupied = np.zeros((len(games), END + 2), dtype=bool)
+        own_occupied[rows[:, None], own] = True
+        other_occupied[rows[:, None], other] = True
+
+        destinations = own + dice[:, None]
+        clipped = np.minimum(destinations, END + 1)  # one extra column, always empty, for the "too far" moves
+        legal = (dice[:, None] > 0) & (own != END) & (destinations <= END)
+        legal &= ~own_occupied[rows[:, None], clipped] | (clipped == END)
+        legal &= ~((clipped == SAFE_SPOT) & other_occupied[:, SAFE_SPOT][:, None])
+        captures = legal & IS_WARZONE[np.minimum(clipped, END)] & other_occupied[rows[:, None], clipped]
+
+        # a capture never happens on the safe spot or on the end square, so it always beats the warzone score
+        scores = np.where(captures, CAPTURE_SCORE, DESTINATION_SCORES[np.minimum(clipped, END)])
+        scores = np.where(legal, scores, -1)
+        chosen = scores.argmax(axis=1)  # the first of the best moves, the same as AIStrategy
+        can_move = legal[rows, chosen]
+
+        destination = destinations[rows, chosen]
+        moving = rows[can_move]
+        own[moving, chosen[can_move]] = destination[can_move]
+        captured = captures[rows, chosen][:, None] & (other == destination[:, None])
+        other[captured] = 0
+
+        locations[games, own_sides] = own
+        locations[games, 1 - own_sides] = other
+        extra_turn = can_move & IS_DOUBLE_THROW[np.minimum(destination, END)]
+        sides[games] = np.where(extra_turn, own_sides, 1 - own_sides)
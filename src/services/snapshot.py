@@ -0,0 +1,206 @@
+"""
+    The snapshots: a match that is still going on, saved in a few bytes, so it can be resumed later, right where it was
+    left (even the dice roll on the same way). A snapshot is:
+    -a header: magic, version, flags (pve, dice rolled), the packed game state (see game_state), the rolled dice value,
+    the seed and the spawn key of the dice
+    -the state of the random generator of the dice (625 words)
+    -the names of the two players (the name of player2 is empty against the computer)
+"""
+
+import os
+import struct
+from collections import namedtuple
+from concurrent.futures import ThreadPoolExecutor
+
+from src.domain.game_state import GameState, SIDE_SHIFT
+from src.domain.validators import MetaException
+from src.services.dice import Dice
+
+SNAPSHOT_MAGIC = b"URSS"  # not the one of the solved tables (URSV), so neither is mistaken for the other
+SNAPSHOT_VERSION = 1
+SNAPSHOT_HEADER = struct.Struct("<4sHBQBQB")  # magic, version, flags, game state, dice value, seed, spawn key length
+SPAWN_KEY_ITEM = struct.Struct("<I")
+RANDOM_STATE = struct.Struct("<625I")  # the mersenne twister: 624 words and the position in them
+RANDOM_STATE_VERSION = 3
+PVE_FLAG = 1
+DICE_ROLLED_FLAG = 2
+
+# a match, as it was read from a snapshot
+# -state: the packed game state (the pieces and whose turn it is)
+# -rolled_dice_value: the last rolled dice value
+# -dice_rolled: has the current player rolled the dice already (and not moved yet)?
+# -seed, spawn_key, random_state: the dice of the match, and where they are at (see Dice.getstate)
+# -names: the names of player1 and player2
+# -pve: is player2 the computer?
+Snapshot = namedtuple("Snapshot", ["state", "rolled_dice_value", "dice_rolled", "seed", "spawn_key", "random_state",
+                                   "names", "pve"])
+
+
+class SnapshotException(MetaException):
+    pass
+
+
+def take_snapshot(game_controller, dice_rolled=False) -> bytes:
+    """
+    :param game_controller: the game controller of the match
+    :param dice_rolled: has the current player rolled the dice already?
+    :return: the snapshot of the match
+    """
+    dice = game_controller.dice
+    random_state = dice.getstate()
+    flags = (PVE_FLAG if game_controller.pve else 0) | (DICE_ROLLED_FLAG if dice_rolled else 0)
+    snapshot = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, game_controller.game_state.code,
+                                    game_controller.rolled_dice_value, dice.seed, len(dice.spawn_key))
+    snapshot += b"".join(SPAWN_KEY_ITEM.pack(item) for item in dice.spawn_key)
+    snapshot += RANDOM_STATE.pack(*random_state[1])
+    names = (game_controller.get_name_for_player(1), "" if game_controller.pve else
+             game_controller.get_name_for_player(2))
+    for name in names:
+        encoded_name = name.encode("utf-8")
+        if len(encoded_name) > 255:
+            raise SnapshotException("The name of the player is too long to be saved!")
+        snapshot += bytes((len(encoded_name),)) + encoded_name
+    return snapshot
+
+
+def read_snapshot(data) -> Snapshot:
+    """
+    :param data: the bytes take_snapshot made
+    :return: the Snapshot in them
+    """
+    try:
+        magic, version, flags, code, rolled_dice_value, seed, spawn_key_length = SNAPSHOT_HEADER.unpack_from(data)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise SnapshotException("This is not a saved game (or it was saved by another version)!")
+        if code >> (SIDE_SHIFT + 1):
+            raise SnapshotException("The saved game is broken!")
+        position = SNAPSHOT_HEADER.size
+        spawn_key = struct.unpack_from("<" + str(spawn_key_length) + "I", data, position)
+        position += spawn_key_length * SPAWN_KEY_ITEM.size
+        random_state = (RANDOM_STATE_VERSION, RANDOM_STATE.unpack_from(data, position), None)
+        position += RANDOM_STATE.size
+        names = []
+        for _ in range(2):
+            name_length = data[position]
+            names.append(bytes(data[position + 1:position + 1 + name_length]).decode("utf-8"))
+            position += 1 + name_length
+    except (struct.error, IndexError):
+        raise SnapshotException("The saved game is cut off!")
+    return Snapshot(GameState(code), rolled_dice_value, bool(flags & DICE_ROLLED_FLAG), seed, spawn_key,
+                    random_state, tuple(names), bool(flags & PVE_FLAG))
+
+
+def restore(snapshot, game_controller) -> None:
+    """
+    Puts a saved match back in the game controller: the players, the pieces, whose turn it is and the dice. Whatever
+    was going on in the game controller is forgotten.
+    :param snapshot: a Snapshot
+    :param game_controller: where to resume the match
+    """
+    game_controller.reset_all()
+    game_controller.add_player(snapshot.names[0], 1)
+    if snapshot.pve:
+        game_controller.add_player(None, None, is_human=False)
+    else:
+        game_controller.add_player(snapshot.names[1], 2)
+    game_controller.load_game_state(snapshot.state)
+    dice = Dice(snapshot.seed, snapshot.spawn_key)
+    dice.setstate(snapshot.random_state)
+    game_controller.dice = dice
+    game_controller.rolled_dice_value = snapshot.rolled_dice_value
+
+
+class Autosaver:
+    """
+        Saves the match after every move (undone ones too), so it can be resumed after the game is closed. The snapshot
+        is taken on the main thread (it takes a few microseconds), but a thread of its own writes it, so the game never
+        waits for the disk. The file gets replaced in one step, so it is never half written; it is deleted once the
+        match is over, since there is nothing left to resume.
+    """
+    def __init__(self, game_controller, path):
+        """
+        :param game_controller: the game controller whose matches get saved
+        :param path: the file of the saved match
+        """
+        self.__game_controller = game_controller
+        self.__path = path
+        self.__writer = ThreadPoolExecutor(max_workers=1)
+        self.__last_write = None
+        # set as soon as a snapshot is queued and cleared as soon as its deletion is, so the menu (which asks every
+        # frame) never waits for the writing thread or looks at the disk
+        self.__has_save = os.path.exists(path)
+        game_controller.add_move_listener(self.__moved)
+        game_controller.add_game_over_listener(self.__game_over)
+
+    @property
+    def can_resume(self) -> bool:
+        """
+        :return: is there a saved match?
+        """
+        return self.__has_save
+
+    def save(self, dice_rolled=False) -> None:
+        """
+        Saves the match now (e.g. when it's quit after the dice were rolled).
+        :param dice_rolled: has the current player rolled the dice already?
+        """
+        self.__submit(Autosaver.__write, self.__path, take_snapshot(self.__game_controller, dice_rolled))
+        self.__has_save = True
+
+    def resume(self) -> Snapshot:
+        """
+        Puts the saved match back in the game controller.
+        :return: the Snapshot of the match (e.g. to know if the dice were rolled already)
+        """
+        if not self.can_resume:
+            raise SnapshotException("There is no saved game to resume!")
+        self.wait()
+        with open(self.__path, "rb") as snapshot_file:
+            snapshot = read_snapshot(snapshot_file.read())
+        restore(snapshot, self.__game_controller)
+        return snapshot
+
+    def wait(self) -> None:
+        """
+        Waits until the last snapshot is written.
+        """
+        if self.__last_write is None:
+            return
+        try:
+            self.__last_write.result()
+        except OSError as ex:
+            raise SnapshotException("The game couldn't be saved: " + str(ex))
+        finally:
+            self.__last_write = None
+
+    def close(self) -> None:
+        """
+        Stops saving, once everything is written.
+        """
+        self.__game_controller.remove_move_listener(self.__moved)
+        self.__game_controller.remove_game_over_listener(self.__game_over)
+        self.__writer.shutdown(wait=True)
+        self.wait()
+
+    def __moved(self, record, undone) -> None:
+        # after an undo, it's the turn of whoever made the move again, with the dice he/she rolled
+        self.save(dice_rolled=undone)
+
+    def __game_over(self, winner) -> None:
+        self.__submit(Autosaver.__delete, self.__path)
+        self.__has_save = False
+
+    def __submit(self, function, *arguments) -> None:
+        self.__last_write = self.__writer.submit(function, *arguments)
+
+    @staticmethod
+    def __write(path, snapshot) -> None:
+        temporary_path = path + ".tmp"
+        with open(temporary_path, "wb") as snapshot_file:
+            snapshot_file.write(snapshot)
+        os.replace(temporary_path, path)
+
+    @staticmethod
+    def __delete(path) -> None:
+        if os.path.exists(path):
+            os.remove(path)
@@ -0,0 +1,364 @@
+"""
+    The solver. The Royal Game of Ur is small enough (137,913,936 positions with 7 pieces per player) to be solved
+    exactly: this module computes the chance of winning of every position and stores it in a table on disk, which the
+    SolvedStrategy then uses to play perfectly.
+
+    Solve the game with:
+        python -m src.services.solver ur.table
+    (it takes a while and about 1.5 GB of memory; use --pieces 2 or 3 to try it out on a smaller variant first)
+"""
+
+import argparse
+import struct
+import time
+
+import numpy as np
+
+from src.domain.game_state import DICE_PROBABILITIES, DOUBLE_THROW_LOCATIONS, NO_OF_PIECES, SAFE_SPOT, END, \
+    legal_moves, apply_move, winner
+from src.services.ai_strategy import AIStrategy, AIException
+
+# the squares only one player can step on (1 -> 4 and 13 -> 14) are stored as bits, the warzone squares (5 -> 12)
+# as base 3 digits: 0 -> empty, 1 -> the player to move, 2 -> the opponent
+PRIVATE_LOCATIONS = (1, 2, 3, 4, 13, 14)
+PRIVATE_BITS = tuple(1 << PRIVATE_LOCATIONS.index(location) if location in PRIVATE_LOCATIONS else 0
+                     for location in range(END + 1))
+WARZONE_START = 5
+WARZONE_LENGTH = 8
+DIGIT_VALUES = tuple(3 ** (location - WARZONE_START) if WARZONE_START <= location < WARZONE_START + WARZONE_LENGTH
+                     else 0 for location in range(END + 1))
+NO_OF_WARZONES = 3 ** WARZONE_LENGTH
+NO_OF_PRIVATES = 1 << len(PRIVATE_LOCATIONS)
+
+TABLE_MAGIC = b"URSV"
+TABLE_VERSION = 1
+TABLE_HEADER = struct.Struct("<4sHHQ")  # magic, version, pieces per player, number of positions
+TABLE_SCALE = 65535  # win chances are stored as uint16: round(chance * TABLE_SCALE)
+
+
+class SolverException(AIException):
+    pass
+
+
+class StateRanking:
+    """
+        A perfect ranking of the positions: every position gets a unique number between 0 and size - 1 and no number
+        is left unused. Pieces of the same player are interchangeable here, so a position is described (from the point
+        of view of the player to move) by:
+        -warzone: int = base 3 number, one digit for every warzone square
+        -own_private / other_private: int = bits of the occupied private squares of each player
+        -own_finished / other_finished: int = how many pieces got to the end
+        The pieces that are left are waiting on spawn.
+        The methods work on numpy arrays as well as on plain integers.
+    """
+    def __init__(self, pieces=NO_OF_PIECES):
+        """
+        :param pieces: number of pieces per player (7 in the classic game)
+        """
+        self.pieces = pieces
+        self.popcount = np.array([bin(bits).count("1") for bits in range(NO_OF_PRIVATES)], dtype=np.int64)
+
+        # for a player with "on_warzone" pieces on the warzone: how many (private, finished) pairs are possible?
+        self.side_sizes = np.zeros(pieces + 1, dtype=np.int64)
+        self.side_offsets = np.zeros((pieces + 1, NO_OF_PRIVATES), dtype=np.int64)
+        for on_warzone in range(pieces + 1):
+            counts = np.maximum(pieces - on_warzone - self.popcount + 1, 0)
+            self.side_offsets[on_warzone] = np.cumsum(counts) - counts
+            self.side_sizes[on_warzone] = counts.sum()
+
+        warzones = np.arange(NO_OF_WARZONES, dtype=np.int64)
+        digits = (warzones[:, None] // 3 ** np.arange(WARZONE_LENGTH)) % 3
+        self.own_counts = (digits == 1).sum(axis=1)
+        self.other_counts = (digits == 2).sum(axis=1)
+        valid = (self.own_counts <= pieces) & (self.other_counts <= pieces)
+        self.own_counts = np.minimum(self.own_counts, pieces)
+        self.other_counts = np.minimum(self.other_counts, pieces)
+        sizes = np.where(valid, self.side_sizes[self.own_counts] * self.side_sizes[self.other_counts], 0)
+        self.warzone_offsets = np.cumsum(sizes) - sizes
+        self.size = int(sizes.sum())
+        self.valid_warzones = warzones[valid]
+
+        # the same warzone, seen from the other player's point of view
+        self.swapped = ((3 - digits) % 3 * 3 ** np.arange(WARZONE_LENGTH)).sum(axis=1)
+
+    def rank(self, warzone, own_private, own_finished, other_private, other_finished):
+        """
+        :return: the unique number of the position
+        """
+        return self.warzone_offsets[warzone] + \
+            (self.side_offsets[self.own_counts[warzone], own_private] + own_finished) * \
+            self.side_sizes[self.other_counts[warzone]] + \
+            self.side_offsets[self.other_counts[warzone], other_private] + other_finished
+
+    def rank_swapped(self, warzone, own_private, own_finished, other_private, other_finished):
+        """
+        :return: the unique number of the same position, but with the other player to move
+        """
+        return self.rank(self.swapped[warzone], other_private, other_finished, own_private, own_finished)
+
+    def groups(self, total_finished):
+        """
+        Splits all the positions with the given number of finished pieces (both players) into chunks of numpy arrays.
+        :param total_finished: own_finished + other_finished
+        :return: a generator of (warzone, own_private, own_finished, other_private, other_finished) tuples
+        """
+        for own_finished in range(max(0, total_finished - self.pieces), min(self.pieces, total_finished) + 1):
+            other_finished = total_finished - own_finished
+            for own_count in range(self.pieces - own_finished + 1):
+                own_privates = np.flatnonzero(self.popcount <= self.pieces - own_finished - own_count)
+                for other_count in range(self.pieces - other_finished + 1):
+                    warzones = self.valid_warzones[(self.own_counts[self.valid_warzones] == own_count) &
+                                                   (self.other_counts[self.valid_warzones] == other_count)]
+                    other_privates = np.flatnonzero(self.popcount <= self.pieces - other_finished - other_count)
+                    warzone, own_private, other_private = np.meshgrid(warzones, own_privates, other_privates,
+                                                                      indexing="ij")
+                    yield warzone.ravel(), own_private.ravel(), own_finished, other_private.ravel(), other_finished
+
+
+class Solver:
+    """
+        Computes, by value iteration, the chance of winning of the player to move (before rolling the dice) for every
+        position. Finished pieces never come back, so the positions are solved in groups, from the most finished
+        pieces to the least: a group only depends on itself and on the groups that were already solved.
+        Inside a group, captures make positions depend on each other, so the group gets swept until the values stop
+        changing.
+    """
+    def __init__(self, pieces=NO_OF_PIECES, tolerance=1e-6, max_sweeps=1000, log=print):
+        """
+        :param pieces: number of pieces per player (7 in the classic game)
+        :param tolerance: a group is solved when no value changes by more than this in a sweep
+        :param max_sweeps: a group is never swept more than this many times
+        :param log: where the progress gets reported (None for silence)
+        """
+        self.ranking = StateRanking(pieces)
+        self.tolerance = tolerance
+        self.max_sweeps = max_sweeps
+        self.__log = log
+        self.values = None
+
+    def solve(self) -> np.ndarray:
+        """
+        :return: the win chances (float32) indexed by StateRanking.rank
+        """
+        self.values = np.full(self.ranking.size, 0.5, dtype=np.float32)
+        for total_finished in range(2 * self.ranking.pieces, -1, -1):
+            start = time.perf_counter()
+            sweeps = 0
+            max_change = 1.0
+            while max_change > self.tolerance and sweeps < self.max_sweeps:
+                max_change = 0.0
+                for group in self.ranking.groups(total_finished):
+                    max_change = max(max_change, self.__sweep(*group))
+                sweeps += 1
+            if self.__log is not None:
+                self.__log("Solved the positions with " + str(total_finished) + " finished pieces: " + str(sweeps) +
+                           " sweeps in " + str(round(time.perf_counter() - start, 1)) + "s")
+        return self.values
+
+    def __sweep(self, warzone, own_private, own_finished, other_private, other_finished) -> float:
+        """
+        Updates the values of a chunk of positions, in place.
+        :return: the biggest change of a value
+        """
+        if len(warzone) == 0:
+            return 0.0
+        ranking = self.ranking
+        ranks = ranking.rank(warzone, own_private, own_finished, other_private, other_finished)
+        if own_finished == ranking.pieces or other_finished == ranking.pieces:
+            new_values = np.float32(1.0 if own_finished == ranking.pieces else 0.0)
+            max_change = float(np.abs(self.values[ranks] - new_values).max())
+            self.values[ranks] = new_values
+            return max_change
+
+        own_spawn = ranking.pieces - own_finished - ranking.own_counts[warzone] - ranking.popcount[own_private]
+        # rolling a 0 (or having no legal move) hands the dice to the opponent
+        passed = 1.0 - self.values[ranking.rank_swapped(warzone, own_private, own_finished, other_private,
+                                                        other_finished)].astype(np.float64)
+        new_values = DICE_PROBABILITIES[0] * passed
+        for rolled_dice_value in range(1, len(DICE_PROBABILITIES)):
+            best = np.full(len(warzone), -1.0)
+            for origin in range(END + 1 - rolled_dice_value):
+                self.__best_after_move(best, origin, origin + rolled_dice_value, warzone, own_private, own_finished,
+                                       other_private, other_finished, own_spawn)
+            new_values += DICE_PROBABILITIES[rolled_dice_value] * np.where(best < 0, passed, best)
+
+        new_values = new_values.astype(np.float32)
+        max_change = float(np.abs(self.values[ranks] - new_values).max())
+        self.values[ranks] = new_values
+        return max_change
+
+    def __best_after_move(self, best, origin, destination, warzone, own_private, own_finished, other_private,
+                          other_finished, own_spawn) -> None:
+        """
+        Moves a piece of the player to move from origin to destination in every position of the chunk where that is
+        legal and keeps, in best, the highest win chance seen so far.
+        """
+        ranking = self.ranking
+        new_warzone = warzone
+        new_private = own_private
+        new_finished = own_finished
+        if origin == 0:
+            can_move = own_spawn > 0
+        elif PRIVATE_BITS[origin]:
+            can_move = (own_private & PRIVATE_BITS[origin]) != 0
+            new_private = own_private & ~PRIVATE_BITS[origin]
+        else:
+            can_move = (warzone // DIGIT_VALUES[origin]) % 3 == 1
+            new_warzone = warzone - DIGIT_VALUES[origin]
+
+        if destination == END:
+            new_finished = own_finished + 1
+        elif PRIVATE_BITS[destination]:
+            can_move = can_move & ((new_private & PRIVATE_BITS[destination]) == 0)
+            new_private = new_private | PRIVATE_BITS[destination]
+        else:
+            digit = (new_warzone // DIGIT_VALUES[destination]) % 3
+            can_move = can_move & (digit != 1)
+            if destination == SAFE_SPOT:
+                can_move = can_move & (digit != 2)
+            new_warzone = new_warzone + (1 - digit) * DIGIT_VALUES[destination]  # a captured piece goes to spawn
+
+        movable = np.flatnonzero(can_move)
+        if len(movable) == 0:
+            return
+
+        def pick(values):
+            return values[movable] if isinstance(values, np.ndarray) else values
+
+        if destination in DOUBLE_THROW_LOCATIONS:
+            successors = ranking.rank(pick(new_warzone), pick(new_private), new_finished, pick(other_private),
+                                      other_finished)
+            values = self.values[successors]
+        else:
+            successors = ranking.rank_swapped(pick(new_warzone), pick(new_private), new_finished, pick(other_private),
+                                              other_finished)
+            values = 1.0 - self.values[successors].astype(np.float64)
+        best[movable] = np.maximum(best[movable], values)
+
+    def write(self, path) -> None:
+        """
+        Writes the solved table: a small header, followed by the win chances as little endian uint16.
+        :param path: where to write the table
+        """
+        chunk_size = 1 << 22
+        with open(path, "wb") as table_file:
+            table_file.write(TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, self.ranking.pieces, self.ranking.size))
+            for start in range(0, self.ranking.size, chunk_size):
+                chunk = self.values[start:start + chunk_size]
+                table_file.write(np.round(chunk * TABLE_SCALE).astype("<u2").tobytes())
+
+
+class SolvedTable:
+    """
+        A solved table, memory-mapped: the operating system only loads the pages that get used and every process that
+        opens the same file shares them.
+    """
+    def __init__(self, path):
+        """
+        :param path: a table written by Solver.write
+        """
+        with open(path, "rb") as table_file:
+            magic, version, pieces, size = TABLE_HEADER.unpack(table_file.read(TABLE_HEADER.size))
+        if magic != TABLE_MAGIC or version != TABLE_VERSION:
+            raise SolverException("The given file is not a solved table: " + str(path))
+        if not 1 <= pieces <= NO_OF_PIECES:
+            raise SolverException("The solved table has an invalid number of pieces: " + str(pieces))
+        self.ranking = StateRanking(pieces)
+        if size != self.ranking.size:
+            raise SolverException("The solved table has the wrong size!")
+        self.__values = np.memmap(path, dtype="<u2", mode="r", offset=TABLE_HEADER.size, shape=(size,))
+
+    def win_chance(self, state) -> float:
+        """
+        :param state: a packed game state
+        :return: the chance that the side to move wins, before rolling the dice
+        """
+        won = winner(state)
+        if won is not None:
+            return 1.0 if won == state.side else 0.0
+        return int(self.__values[self.rank(state)]) / TABLE_SCALE
+
+    def win_chance_after(self, state, move) -> float:
+        """
+        :param state: a packed game state
+        :param move: a legal move of the side to move
+        :return: the chance that the side to move wins, if it makes the given move
+        """
+        next_state = apply_move(state, move)
+        win_chance = self.win_chance(next_state)
+        if next_state.side == state.side:
+            return win_chance
+        return 1.0 - win_chance
+
+    def rank(self, state) -> int:
+        """
+        A table for fewer pieces than the classic game covers the positions where the missing pieces already
+        finished.
+        :param state: a packed game state
+        :return: the index of the state in the table
+        """
+        warzone = 0
+        privates = [0, 0]
+        finished = [0, 0]
+        for player, digit in ((state.side, 1), (1 - state.side, 2)):
+            side = 0 if digit == 1 else 1
+            for location in state.locations(player):
+                if location == END:
+                    finished[side] += 1
+                elif PRIVATE_BITS[location]:
+                    privates[side] |= PRIVATE_BITS[location]
+                else:
+                    warzone += digit * DIGIT_VALUES[location]
+        missing_pieces = NO_OF_PIECES - self.ranking.pieces
+        if finished[0] < missing_pieces or finished[1] < missing_pieces:
+            raise SolverException("The solved table doesn't cover this position!")
+        return int(self.ranking.rank(warzone, privates[0], finished[0] - missing_pieces, privates[1],
+                                     finished[1] - missing_pieces))
+
+
+class SolvedStrategy(AIStrategy):
+    """
+        The perfect AI strategy: it looks up, in a solved table, the chance of winning after each legal move and picks
+        the best one.
+    """
+    def __init__(self, pieces, squares, table_path):
+        """
+        :param pieces: requires the pieces repository that is also assigned to game_controller
+        :param squares: requires the squares repository that is also assigned to game_controller
+        :param table_path: a table written by the solver (python -m src.services.solver)
+        """
+        super().__init__(pieces, squares)
+        self.__table = SolvedTable(table_path)
+
+    def choose_move(self, state, rolled_dice_value):
+        """
+        :param state: the packed game state
+        :param rolled_dice_value: the dice value that the ai has to work with (i.e. how many steps will the piece move)
+        :return: the move with the highest chance of winning or None if no move can be made
+        """
+        best_move = None
+        best_win_chance = -1.0
+        for move in legal_moves(state, rolled_dice_value):
+            win_chance = self.__table.win_chance_after(state, move)
+            if win_chance > best_win_chance:
+                best_win_chance = win_chance
+                best_move = move
+        return best_move
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Solves The Royal Game of Ur and writes the table of win chances.")
+    parser.add_argument("output", help="where to write the solved table")
+    parser.add_argument("--pieces", type=int, default=NO_OF_PIECES, help="pieces per player (default: 7)")
+    parser.add_argument("--tolerance", type=float, default=1e-6, help="convergence tolerance (default: 1e-6)")
+    arguments = parser.parse_args()
+
+    solver = Solver(arguments.pieces, arguments.tolerance)
+    print("Solving " + str(solver.ranking.size) + " positions...")
+    solver.solve()
+    solver.write(arguments.output)
+    print("The solved table was written to " + arguments.output)
+
+
+if __name__ == "__main__":
+    main()
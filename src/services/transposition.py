@@ -0,0 +1,210 @@
+"""
+    The transposition table of the searching AI strategies. The same positions come up again and again during a search
+    (and from one move to the next, since captured pieces keep cycling back to spawn), so their values get remembered
+    instead of being searched again.
+    Positions are found in the table by their Zobrist hash, which is updated along with every move instead of being
+    computed from scratch.
+
+    Measure how well a table size works with:
+        python -m src.services.transposition --sizes 4096 65536 --games 10
+"""
+
+import argparse
+import random
+from array import array
+from collections import namedtuple
+
+from src.domain.game_state import NO_OF_PIECES, END, PLAYER_MASK, BITS_PER_PLAYER, BITS_PER_PIECE, SIDE_SHIFT, \
+    INITIAL_STATE, apply_move, pass_turn, winner
+from src.domain.validators import MetaException
+
+
+class TranspositionException(MetaException):
+    pass
+
+
+# the random keys are the same on every run, so the hashes (and the search) can be reproduced
+KEY_GENERATOR = random.Random(0x5EED)
+# PIECE_KEYS[side][index - 1][location] -> the key of the piece standing on that location
+PIECE_KEYS = tuple(tuple(tuple(KEY_GENERATOR.getrandbits(64) for _ in range(END + 1)) for _ in range(NO_OF_PIECES))
+                   for _ in range(2))
+SIDE_KEY = KEY_GENERATOR.getrandbits(64)  # in the hash when it's player2's turn
+DICE_KEYS = tuple(KEY_GENERATOR.getrandbits(64) for _ in range(5))  # the same position, with different dice
+
+# the kinds of values the table can hold (alpha-beta only knows some values up to a bound)
+EXACT = 0
+LOWER_BOUND = 1  # the value is at least this much
+UPPER_BOUND = 2  # the value is at most this much
+
+# what the table reports about itself
+# -probes, hits: how many times it was asked for an entry, and how many times it had it
+# -stores, replacements: how many values it was given, and how many of them took the slot of another one
+# -entries, size: how many slots are in use, out of all of them
+# -memory: how many bytes the slots take (the table never grows, so this is all of it)
+TableStats = namedtuple("TableStats", ["probes", "hits", "hit_rate", "stores", "replacements", "entries", "size",
+                                       "memory"])
+
+
+def zobrist_hash(state) -> int:
+    """
+    Computes the hash of a state from scratch (see zobrist_after_move for the incremental update).
+    :param state: the packed game state
+    :return: the 64-bit Zobrist hash of the state
+    """
+    code = state.code
+    hash_ = SIDE_KEY if code >> SIDE_SHIFT else 0
+    for side in range(2):
+        for index in range(NO_OF_PIECES):
+            hash_ ^= PIECE_KEYS[side][index][(code >> (side * BITS_PER_PLAYER + index * BITS_PER_PIECE)) & 15]
+    return hash_
+
+
+def zobrist_after_move(state, hash_, move) -> int:
+    """
+    :param state: the packed game state, before the move
+    :param hash_: the hash of the state
+    :param move: a legal move for the side to move (see legal_moves)
+    :return: the hash of the state after the move (the one apply_move returns)
+    """
+    code = state.code
+    side = code >> SIDE_SHIFT
+    keys = PIECE_KEYS[side][move.piece - 1]
+    hash_ ^= keys[move.origin] ^ keys[move.destination]
+    if move.captures:
+        other_code = (code >> ((1 - side) * BITS_PER_PLAYER)) & PLAYER_MASK
+        for index in range(NO_OF_PIECES):
+            if (other_code >> (index * BITS_PER_PIECE)) & 15 == move.destination:
+                keys = PIECE_KEYS[1 - side][index]
+                hash_ ^= keys[move.destination] ^ keys[0]
+                break
+    if not move.extra_turn:
+        hash_ ^= SIDE_KEY
+    return hash_
+
+
+class TranspositionTable:
+    """
+        A fixed number of slots, so it never takes more memory than it was given. Each position (and dice value) has
+        one slot, picked by its hash; when two of them want the same slot, the one searched deeper stays, unless it is
+        left over from an older search (age).
+        The slots are kept in typed arrays, one per field, so an entry takes 21 bytes instead of a few python objects.
+    """
+    def __init__(self, size=1 << 16):
+        """
+        :param size: the number of slots (a power of 2)
+        """
+        if size <= 0 or size & (size - 1):
+            raise TranspositionException("The size of the transposition table must be a power of 2!")
+        self.size = size
+        self.__mask = size - 1
+        self.__keys = array("Q", bytes(8 * size))  # the exact key of the entry, so different positions never mix up
+        self.__values = array("d", bytes(8 * size))
+        self.__depths = array("b", [-1]) * size  # -1 -> empty slot
+        self.__bounds = array("b", bytes(size))
+        self.__best_pieces = array("b", bytes(size))
+        self.__ages = array("H", bytes(2 * size))
+        self.__age = 0
+
+        self.__probes = self.__hits = self.__stores = self.__replacements = self.__entries = 0
+
+    def new_search(self) -> None:
+        """
+        Call this before every search: what's left from the previous ones is still used, but it gets replaced first.
+        """
+        self.__age = (self.__age + 1) & 0xFFFF
+
+    def probe(self, hash_, key):
+        """
+        :param hash_: the Zobrist hash of the entry (it picks the slot)
+        :param key: the exact key of the entry
+        :return: (value, bound, depth, best piece) if the entry is in the table, None otherwise
+        """
+        self.__probes += 1
+        slot = hash_ & self.__mask
+        if self.__depths[slot] < 0 or self.__keys[slot] != key:
+            return None
+        self.__hits += 1
+        return self.__values[slot], self.__bounds[slot], self.__depths[slot], self.__best_pieces[slot]
+
+    def store(self, hash_, key, depth, value, bound=EXACT, best_piece=0) -> None:
+        """
+        :param hash_: the Zobrist hash of the entry (it picks the slot)
+        :param key: the exact key of the entry (an unsigned 64-bit integer)
+        :param depth: how deep the value was searched (0 -> 127)
+        :param value: the value of the entry
+        :param bound: EXACT, LOWER_BOUND or UPPER_BOUND
+        :param best_piece: the piece of the best move (0 -> unknown)
+        """
+        slot = hash_ & self.__mask
+        stored_depth = self.__depths[slot]
+        if stored_depth >= 0 and self.__ages[slot] == self.__age and depth < stored_depth:
+            return
+        if stored_depth < 0:
+            self.__entries += 1
+        elif self.__keys[slot] != key:
+            self.__replacements += 1
+        self.__stores += 1
+        self.__keys[slot] = key
+        self.__values[slot] = value
+        self.__depths[slot] = depth
+        self.__bounds[slot] = bound
+        self.__best_pieces[slot] = best_piece
+        self.__ages[slot] = self.__age
+
+    def clear(self) -> None:
+        self.__depths = array("b", [-1]) * self.size
+        self.__probes = self.__hits = self.__stores = self.__replacements = self.__entries = 0
+
+    @property
+    def memory(self) -> int:
+        """
+        :return: how many bytes the slots take
+        """
+        return sum(field.itemsize * len(field)
+                   for field in (self.__keys, self.__values, self.__depths, self.__bounds, self.__best_pieces,
+                                 self.__ages))
+
+    @property
+    def stats(self) -> TableStats:
+        hit_rate = self.__hits / self.__probes if self.__probes else 0.0
+        return TableStats(self.__probes, self.__hits, hit_rate, self.__stores, self.__replacements, self.__entries,
+                          self.size, self.memory)
+
+    @staticmethod
+    def describe(stats) -> str:
+        """
+        :return: the stats of a table, in a single line
+        """
+        return "{} slots ({:.1f} KiB): {:.1%} hits out of {} probes, {} of the slots in use, {} replacements".format(
+            stats.size, stats.memory / 1024, stats.hit_rate, stats.probes, stats.entries, stats.replacements)
+
+
+def main():
+    # imported here, since the searching strategy imports this module
+    from src.repository.repo import Pieces, Squares
+    from src.services.expectiminimax import ExpectiminimaxStrategy
+    from src.services.dice import Dice
+
+    parser = argparse.ArgumentParser(description="Plays expectiminimax games with transposition tables of different "
+                                                 "sizes and reports how well each of them works.")
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1 << 12, 1 << 16, 1 << 20],
+                        help="the numbers of slots to try (powers of 2)")
+    parser.add_argument("--games", type=int, default=5, help="games per size (default: 5)")
+    parser.add_argument("--depth", type=int, default=4, help="the search depth (default: 4)")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first game (default: 0)")
+    arguments = parser.parse_args()
+
+    for size in arguments.sizes:
+        strategy = ExpectiminimaxStrategy(Pieces(), Squares(), depth=arguments.depth, time_budget=float("inf"),
+                                          table_size=size)
+        for game in range(arguments.games):
+            dice = Dice(arguments.seed + game)
+            state = INITIAL_STATE
+            while winner(state) is None:
+                move = strategy.choose_move(state, dice.roll())
+                state = pass_turn(state) if move is None else apply_move(state, move)
+        print(TranspositionTable.describe(strategy.table.stats))
+
+
+if __name__ == "__main__":
+    main()
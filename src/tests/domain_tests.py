@@ -1,8 +1,10 @@
 
 import unittest
 from src.tests.test_domain.test_entities import TestEntities
+from src.tests.test_domain.test_game_state import TestGameState
 
-domain_test_cases = [TestEntities
+domain_test_cases = [TestEntities,
+                     TestGameState
                      ]
 
 
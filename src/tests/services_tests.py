@@ -2,12 +2,36 @@
 import unittest
 
 from src.tests.test_services.test_ai_strategy import TestAIStrategy
+from src.tests.test_services.test_analyzer import TestAnalyzer
+from src.tests.test_services.test_dice import TestDice
+from src.tests.test_services.test_expectiminimax import TestExpectiminimax
 from src.tests.test_services.test_game_controller import TestGameController
+from src.tests.test_services.test_game_record import TestGameRecord
+from src.tests.test_services.test_geometry import TestGeometry
+from src.tests.test_services.test_headless import TestHeadless
+from src.tests.test_services.test_mcts import TestMCTS
 from src.tests.test_services.test_board import TestBoard
+from src.tests.test_services.test_simulator import TestSimulator
+from src.tests.test_services.test_snapshot import TestSnapshot
+from src.tests.test_services.test_solver import TestSolver
+from src.tests.test_services.test_tournament import TestTournament
+from src.tests.test_services.test_transposition import TestTransposition
 
 services_test_cases = [TestGameController,
+                       TestDice,
+                       TestGameRecord,
+                       TestSnapshot,
                        TestBoard,
-                       TestAIStrategy
+                       TestGeometry,
+                       TestAIStrategy,
+                       TestExpectiminimax,
+                       TestTransposition,
+                       TestSolver,
+                       TestMCTS,
+                       TestSimulator,
+                       TestTournament,
+                       TestAnalyzer,
+                       TestHeadless
                        ]
 
 
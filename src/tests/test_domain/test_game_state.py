@@ -0,0 +1,65 @@
+import unittest
+
+from src.domain.game_state import GameState, INITIAL_STATE, legal_moves, apply_move, pass_turn, winner
+from src.domain.validators import MetaException
+from src.repository.repo import Pieces
+
+
+class TestGameState(unittest.TestCase):
+    def test_packing(self):
+        state = GameState.from_locations((0, 1, 2, 3, 4, 5, 15), (15, 14, 13, 12, 0, 0, 8), 1)
+        self.assertEqual(state.locations(0), (0, 1, 2, 3, 4, 5, 15))
+        self.assertEqual(state.locations(1), (15, 14, 13, 12, 0, 0, 8))
+        self.assertEqual(state.location(1, 7), 8)
+        self.assertEqual(state.current_player, "player2")
+        self.assertEqual(state, GameState(state.code))
+        self.assertEqual(len({state, GameState(state.code), INITIAL_STATE}), 2)
+        self.assertRaises(MetaException, GameState.from_locations, (0,) * 7, (16,) * 7)
+        self.assertRaises(MetaException, GameState.from_locations, (0,) * 6, (0,) * 7)
+
+    def test_pieces_adapter(self):
+        pieces = Pieces()
+        pieces.find_by_id("player1_3").location = 6
+        pieces.find_by_id("player2_7").location = 15
+        state = GameState.from_pieces(pieces, "player2")
+        self.assertEqual(state.location(0, 3), 6)
+        self.assertEqual(state.location(1, 7), 15)
+        self.assertEqual(state.side, 1)
+
+        other_pieces = Pieces()
+        state.write_to(other_pieces)
+        self.assertEqual(other_pieces.find_by_id("player1_3").location, 6)
+        self.assertEqual(GameState.from_pieces(other_pieces, "player2"), state)
+
+    def test_legal_moves(self):
+        self.assertEqual(legal_moves(INITIAL_STATE, 0), [])
+        self.assertEqual(len(legal_moves(INITIAL_STATE, 2)), 7)
+
+        state = GameState.from_locations((2, 4, 7, 14, 15, 0, 0), (8, 5, 0, 0, 0, 0, 0))
+        moves = {move.piece: move for move in legal_moves(state, 1)}
+        self.assertNotIn(5, moves)  # finished pieces can't move
+        self.assertNotIn(3, moves)  # the occupied safe spot can't be taken
+        self.assertTrue(moves[2].captures)
+        self.assertTrue(moves[4].destination == 15 and not moves[4].extra_turn)
+        moves = {move.piece: move for move in legal_moves(state, 2)}
+        self.assertNotIn(1, moves)  # can't land on a same team piece
+        self.assertNotIn(4, moves)  # the rolled value is too high
+        self.assertTrue(moves[3].destination == 9 and not moves[3].captures)
+
+    def test_apply_move(self):
+        state = GameState.from_locations((4, 0, 0, 0, 0, 0, 0), (0, 0, 0, 0, 0, 5, 0))
+        move = legal_moves(state, 1)[0]
+        next_state = apply_move(state, move)
+        self.assertEqual(next_state.location(0, 1), 5)
+        self.assertEqual(next_state.location(1, 6), 0)
+        self.assertEqual(next_state.side, 1)
+
+        move = legal_moves(next_state, 4)[0]
+        self.assertTrue(move.extra_turn)
+        self.assertEqual(apply_move(next_state, move).side, 1)
+        self.assertEqual(pass_turn(next_state).side, 0)
+
+    def test_winner(self):
+        self.assertIsNone(winner(INITIAL_STATE))
+        self.assertEqual(winner(GameState.from_locations((15,) * 7, (0,) * 7)), 0)
+        self.assertEqual(winner(GameState.from_locations((14,) + (15,) * 6, (15,) * 7)), 1)
@@ -1,9 +1,14 @@
 
+import os
+import tempfile
 import unittest
 
-from src.domain.entities import Player
-from src.domain.validators import MetaException
+from src.domain.entities import AI, Player, Square, Standing
+from src.domain.validators import MetaException, GameControllerDataValidator
+from src.repository.leaderboard import Leaderboard, rating_change
 from src.repository.repo import BaseRepository, Pieces, Squares
+from src.services.ai_strategy import AIStrategy
+from src.services.game_controller import GameController
 
 
 class TestRepo(unittest.TestCase):
@@ -23,3 +28,109 @@ class TestRepo(unittest.TestCase):
         squares = Squares()
         self.assertRaises(MetaException, squares.initialize_squares_for_sector, "invalid sector")
 
+    def test_square_table(self):
+        squares = Squares()
+        self.assertTrue(squares.square_at("player1", 8).is_safe_spot)
+        self.assertIs(squares.square_at("player1", 8), squares.square_at("player2", 8))
+        self.assertIsNot(squares.square_at("player1", 3), squares.square_at("player2", 3))
+        self.assertEqual(squares.square_at("player2", 14).id, "14_player2_safezone")
+        self.assertTrue(squares.find_by_location(15).is_end)
+
+        squares.replace("8_warzone", Square(8, "_warzone"))
+        self.assertIs(squares.square_at("player2", 8), squares.find_by_id("8_warzone"))
+        squares.delete_by_id("3_player2_safezone")
+        self.assertIsNone(squares.square_at("player2", 3))
+        self.assertIsNotNone(squares.square_at("player1", 3))
+
+    def test_pieces_index(self):
+        pieces = Pieces()
+        self.assertEqual(pieces.spawn_count("player1"), 7)
+        self.assertEqual(pieces.finish_count("player2"), 0)
+        self.assertIsNone(pieces.piece_at("player1", 4))
+
+        piece = pieces.find_by_id("player1_3")
+        piece.location = 4
+        self.assertIs(pieces.piece_at("player1", 4), piece)
+        self.assertTrue(pieces.is_occupied("player1", 4))
+        self.assertFalse(pieces.is_occupied("player2", 4))
+        self.assertEqual(pieces.spawn_count("player1"), 6)
+        self.assertEqual([piece.index for piece in pieces.pieces_by_state("player1", "spawn")], [1, 2, 4, 5, 6, 7])
+        self.assertEqual(pieces.pieces_by_state("player1", "in_game"), [piece])
+
+        piece.location = 15
+        pieces.find_by_id("player1_1").location = 15
+        self.assertIsNone(pieces.piece_at("player1", 4))
+        self.assertEqual(pieces.finish_count("player1"), 2)
+        self.assertEqual([piece.index for piece in pieces.pieces_at("player1", 15)], [1, 3])
+        self.assertEqual(len(pieces.pieces_of("player1")), 7)
+
+        pieces.delete_by_id("player1_1")
+        self.assertEqual(pieces.finish_count("player1"), 1)
+
+    def test_leaderboard(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "leaderboard.db")
+            with Leaderboard(path) as leaderboard:
+                leaderboard.add(Standing("steve roger", 3, 1, 1010.0))
+                leaderboard.add(Standing("jane doe"))
+                leaderboard.replace("jane doe", Standing("jane doe", 5, 0, 1100.0))
+                self.assertEqual(leaderboard.find_by_id("jane doe").wins, 5)
+                self.assertRaises(MetaException, leaderboard.find_by_id, "nobody")
+                self.assertRaises(MetaException, leaderboard.delete_by_id, "nobody")
+
+                leaderboard.add_result("steve roger", "jane doe")
+                leaderboard.add_result("newcomer", "steve roger")
+                self.assertEqual([standing.name for standing in leaderboard.get_all()],
+                                 ["jane doe", "newcomer", "steve roger"])
+                self.assertEqual([standing.name for standing in leaderboard.top(1, by="wins")], ["jane doe"])
+                self.assertRaises(MetaException, leaderboard.top, 1, "losses")
+                self.assertEqual(leaderboard.find_by_id("steve roger").games, 6)
+
+            # everything is still there in the next session
+            with Leaderboard(path) as leaderboard:
+                steve = leaderboard.find_by_id("steve roger")
+                self.assertEqual((steve.wins, steve.losses), (4, 2))
+                change = rating_change(1010.0, 1100.0)
+                self.assertAlmostEqual(steve.rating, 1010.0 + change - rating_change(1000.0, 1010.0 + change))
+                leaderboard.delete_by_id("newcomer")
+                self.assertFalse(leaderboard.id_exists("newcomer"))
+                self.assertEqual(len(leaderboard.top(10)), 2)
+
+    def test_leaderboard_failed_write(self):
+        with tempfile.TemporaryDirectory() as directory:
+            leaderboard = Leaderboard(os.path.join(directory, "leaderboard.db"))
+            leaderboard.add(Standing(None))  # a standing needs a name
+            self.assertRaises(MetaException, leaderboard.flush)
+            leaderboard.add(Standing("steve roger"))
+            self.assertTrue(leaderboard.id_exists("steve roger"))
+
+            # a failed write in the middle of a batch doesn't take the rest of the batch with it
+            for number in range(200):
+                leaderboard.add_result("winner " + str(number), "loser " + str(number))
+            leaderboard.add(Standing(None))
+            for number in range(200, 400):
+                leaderboard.add_result("winner " + str(number), "loser " + str(number))
+            self.assertRaises(MetaException, leaderboard.flush)
+            self.assertEqual(len(leaderboard.get_all()), 801)
+
+            # the failed write and the end of the queue come in the same batch: closing still stops the thread
+            leaderboard.add(Standing(None))
+            self.assertRaises(MetaException, leaderboard.close)
+
+    def test_leaderboard_results(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                Leaderboard(os.path.join(directory, "leaderboard.db")) as leaderboard:
+            pieces = Pieces()
+            players = BaseRepository()
+            players.add(AI(AIStrategy(pieces, Squares())))
+            game_controller = GameController(pieces, Squares(), players, GameControllerDataValidator,
+                                             leaderboard=leaderboard)
+            game_controller.add_player("steve roger", 1)
+            game_controller.add_player(None, None, is_human=False)
+            game_controller.player_wins(2)
+            game_controller.reset_all()
+
+            # the players are gone, their results aren't
+            self.assertEqual(leaderboard.find_by_id("computer").wins, 1)
+            self.assertEqual(leaderboard.find_by_id("steve roger").losses, 1)
+            self.assertGreater(leaderboard.find_by_id("computer").rating, leaderboard.find_by_id("steve roger").rating)
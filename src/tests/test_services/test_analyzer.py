@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+
+from src.analyzer import ArchiveStats, analyze, analyze_archive
+from src.domain.game_state import INITIAL_STATE, apply_move, pass_turn, legal_moves, winner
+from src.services.game_record import GameRecordWriter, decode_turn, encode_turn
+from src.tournament import play_recorded_game, GameOptions
+
+
+class TestAnalyzer(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__paths = [os.path.join(self.__directory.name, "games" + str(shard) + ".urgr") for shard in range(2)]
+        self.__games = []
+        for shard, path in enumerate(self.__paths):
+            with GameRecordWriter(path) as writer:
+                for seed in range(shard * 10, shard * 10 + 10):
+                    options = GameOptions(seed, 0.01, None)
+                    game_winner, turns = play_recorded_game("heuristic", "random", options)
+                    writer.begin(seed, (), ("heuristic", "random"), False)
+                    writer.write_turns(turns)
+                    self.__games.append((game_winner, turns))
+                writer.begin(99, (), ("abandoned", "game"), False)
+                writer.turn(2, 1)
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    def test_archive(self):
+        stats = analyze_archive(self.__paths[0])
+        self.assertEqual((stats.games, stats.unfinished), (11, 1))
+        expected_wins = [0, 0]
+        for game_winner, _ in self.__games[:10]:
+            expected_wins[game_winner] += 1
+        self.assertEqual(stats.wins, expected_wins)
+        self.assertEqual(stats.turns, sum(len(turns) for _, turns in self.__games[:10]) + 1)
+
+    def test_matches_the_rules(self):
+        expected = ArchiveStats()
+        captures = 0
+        for _, turns in self.__games:
+            state = INITIAL_STATE
+            for turn in turns:
+                rolled_dice_value, piece_number = decode_turn(turn)
+                if piece_number is None:
+                    state = pass_turn(state)
+                    continue
+                move = next(move for move in legal_moves(state, rolled_dice_value) if move.piece == piece_number)
+                captures += move.captures
+                state = apply_move(state, move)
+            self.assertIsNotNone(winner(state))
+            expected.add_game(turns, 0)
+
+        stats = analyze(self.__paths, workers=2)
+        self.assertEqual(stats.games, 22)
+        self.assertEqual(sum(stats.captures), captures)
+        self.assertEqual(sum(stats.captures), sum(expected.captures))
+        self.assertEqual(stats.lengths, expected.lengths)
+        self.assertEqual(sum(stats.lengths.values()), 20)
+        self.assertIn("20 finished", stats.describe())
+
+    def test_undo(self):
+        stats = ArchiveStats()
+        stats.add_game(bytes((encode_turn(4, 1), 0xFE, encode_turn(2, 1))), 0)
+        self.assertEqual(stats.turns, 1)
+        self.assertEqual(stats.landings[0][2], 1)
+        self.assertEqual(stats.landings[0][4], 0)
+
+        stats.add_game(bytes((0xFE, encode_turn(3, 1))), 0)  # an undo with nothing to take back
+        self.assertEqual(stats.turns, 2)
+        self.assertEqual(stats.landings[0][3], 1)
@@ -61,3 +61,6 @@ class TestBoard(unittest.TestCase):
         self.assertEqual(self.__board.get_offset_for_piece("player2_3"), (2, 4))
 
         self.assertRaises(MetaException, Board.get_offset, 44, 44, "player1")
+        self.assertRaises(MetaException, Board.get_offset, 4, 0, "player1")
+        self.assertRaises(MetaException, Board.get_offset, 4, 8, "player2")
+        self.assertRaises(MetaException, Board.get_offset, 4, 1, "player3")
@@ -0,0 +1,61 @@
+import unittest
+
+from src.domain.entities import AI
+from src.domain.validators import GameControllerDataValidator, MetaException
+from src.repository.repo import Pieces, Squares, BaseRepository
+from src.services.ai_strategy import AIStrategy
+from src.services.dice import Dice, BufferedDice
+from src.services.game_controller import GameController
+
+
+class TestDice(unittest.TestCase):
+    def test_seeded(self):
+        self.assertRaises(MetaException, Dice, -1)
+        rolls = [Dice(7).roll() for _ in range(3)]
+        self.assertEqual(rolls[0], rolls[1])
+        dice, same_dice = Dice(7), Dice(7)
+        self.assertEqual([dice.roll() for _ in range(100)], [same_dice.roll() for _ in range(100)])
+
+        random_dice = Dice()
+        self.assertIsNotNone(random_dice.seed)
+        replay = Dice(random_dice.seed)
+        self.assertEqual([random_dice.roll() for _ in range(100)], [replay.roll() for _ in range(100)])
+
+    def test_spawn(self):
+        first, second = Dice(7).spawn(2)
+        self.assertEqual(second.spawn_key, (1,))
+        first_rolls = [first.roll() for _ in range(100)]
+        self.assertNotEqual(first_rolls, [second.roll() for _ in range(100)])
+        root, same_first = Dice(7), Dice(7, (0,))
+        self.assertNotEqual(first_rolls, [root.roll() for _ in range(100)])
+        self.assertEqual(first_rolls, [same_first.roll() for _ in range(100)])
+
+    def test_distribution(self):
+        for dice in (Dice(3), BufferedDice(3, buffer_size=1000)):
+            counts = [0] * 5
+            for _ in range(16000):
+                counts[dice.roll()] += 1
+            for value, expected in enumerate((1000, 4000, 6000, 4000, 1000)):
+                self.assertAlmostEqual(counts[value], expected, delta=expected * 0.1)
+
+    def test_buffered(self):
+        dice, same_dice = BufferedDice(5, buffer_size=10), BufferedDice(5, buffer_size=10)
+        rolls = [dice.roll() for _ in range(7)] + dice.rolls(25).tolist() + [dice.roll() for _ in range(7)]
+        self.assertEqual(rolls, same_dice.rolls(39).tolist())
+        self.assertIsInstance(dice.spawn()[0], BufferedDice)
+
+    def test_game_controller(self):
+        def rolls(seed):
+            pieces, squares, players = Pieces(), Squares(), BaseRepository()
+            players.add(AI(AIStrategy(pieces, squares)))
+            game_controller = GameController(pieces, squares, players, GameControllerDataValidator, Dice(seed))
+            match_rolls = []
+            for _ in range(2):  # two matches, each with its own dice
+                for _ in range(50):
+                    game_controller.roll_dice()
+                    match_rolls.append(game_controller.rolled_dice_value)
+                game_controller.reset_all()
+            return match_rolls
+
+        self.assertEqual(rolls(11), rolls(11))
+        self.assertNotEqual(rolls(11)[:50], rolls(11)[50:])
@@ -0,0 +1,51 @@
+import time
+import unittest
+
+from src.domain.entities import AI
+from src.domain.game_state import GameState, legal_moves
+from src.repository.repo import Pieces, Squares
+from src.services.expectiminimax import ExpectiminimaxStrategy
+
+
+class TestExpectiminimax(unittest.TestCase):
+    def setUp(self):
+        self.__pieces = Pieces()
+        self.__squares = Squares()
+
+        self.__strategy = ExpectiminimaxStrategy(self.__pieces, self.__squares, depth=2)
+
+    def test_finish(self):
+        self.__pieces.find_by_id("player2_3").location = 14
+        self.assertEqual(self.__strategy.get_best_piece_number_to_move(1), "3")
+
+    def test_capture(self):
+        self.__pieces.find_by_id("player2_2").location = 5
+        self.__pieces.find_by_id("player1_1").location = 7
+        self.assertEqual(self.__strategy.get_best_piece_number_to_move(2), "2")
+
+    def test_no_moves(self):
+        self.assertFalse(self.__strategy.can_make_move(0))
+        self.assertIsNone(self.__strategy.choose_move(GameState.from_locations((0,) * 7, (15,) * 7, 1), 2))
+
+    def test_time_budget(self):
+        strategy = ExpectiminimaxStrategy(self.__pieces, self.__squares, depth=20, time_budget=0.2)
+        state = GameState.from_locations((0, 0, 0, 2, 6, 9, 13), (0, 0, 1, 3, 5, 7, 12), 1)
+        start = time.perf_counter()
+        move = strategy.choose_move(state, 2)
+        self.assertLess(time.perf_counter() - start, 1)
+        self.assertIn(move, legal_moves(state, 2))
+        self.assertLess(strategy.last_search_depth, 20)
+        # nothing got searched for the next move, so no depth is reported
+        strategy.choose_move(GameState.from_locations((0,) * 7, (15,) * 7, 1), 2)
+        self.assertEqual(strategy.last_search_depth, 0)
+
+    def test_ai_entity(self):
+        ai = AI(self.__strategy)
+        self.__pieces.find_by_id("player2_1").location = 3
+        self.assertTrue(ai.can_make_move(1))
+        self.assertEqual(ai.get_piece_number_to_move(1), "1")
+
+    def test_evaluation(self):
+        state = GameState.from_locations((15,) * 6 + (14,), (0,) * 7)
+        self.assertGreater(ExpectiminimaxStrategy.evaluate(state, 0), 0.9)
+        self.assertLess(ExpectiminimaxStrategy.evaluate(state, 1), -0.9)
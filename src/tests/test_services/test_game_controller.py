@@ -1,8 +1,11 @@
 
+import os
+import tempfile
 import unittest
 
 from src.domain.entities import AI
 from src.domain.validators import GameControllerDataValidator, MetaException
+from src.repository.leaderboard import Leaderboard
 from src.repository.repo import Squares, Pieces, BaseRepository
 from src.services.ai_strategy import AIStrategy
 from src.services.game_controller import GameController
@@ -33,6 +36,34 @@ class TestGameController(unittest.TestCase):
         self.__game_controller.add_player("player_name", 1)
         self.assertRaises(MetaException, self.__game_controller.add_player, "player_name", 2)
 
+    def test_game_state(self):
+        self.__pieces.find_by_id("player1_1").location = 5
+        self.__game_controller.switch_players()
+        state = self.__game_controller.game_state
+        self.assertEqual(state.location(0, 1), 5)
+        self.assertEqual(state.current_player, "player2")
+
+        self.__pieces.find_by_id("player1_1").location = 0
+        self.__game_controller.switch_players()
+        self.__game_controller.load_game_state(state)
+        self.assertEqual(self.__pieces.find_by_id("player1_1").location, 5)
+        self.assertEqual(self.__game_controller.current_player_name, "jane doe")
+
+    def test_legal_moves(self):
+        self.assertEqual(self.__game_controller.legal_moves("player1", 0), [])
+        self.__pieces.find_by_id("player1_1").location = 4
+        self.__pieces.find_by_id("player1_2").location = 6
+        self.__pieces.find_by_id("player2_1").location = 8
+        self.__pieces.find_by_id("player2_2").location = 7
+        moves = {move.piece: move for move in self.__game_controller.legal_moves("player1", 2)}
+        self.assertNotIn(1, moves)
+        self.assertNotIn(2, moves)
+        self.assertEqual(len(moves), 5)
+        moves = {move.piece: move for move in self.__game_controller.legal_moves("player1", 3)}
+        self.assertTrue(moves[1].captures)
+        self.assertEqual(moves[1].destination, 7)
+        self.assertFalse(moves[2].extra_turn)
+
     def test_move(self):
         self.assertEqual(self.__game_controller.current_player, "player1")
         self.__game_controller.roll_dice()
@@ -100,6 +131,106 @@ class TestGameController(unittest.TestCase):
         self.assertTrue(self.__game_controller.win())
         self.assertEqual(self.__game_controller.winner_name, "jane doe")
 
+    def test_game_over(self):
+        winners = []
+        self.__game_controller.add_game_over_listener(winners.append)
+        for piece_number in range(2, 8):
+            self.__pieces.find_by_id("player1_" + str(piece_number)).location = 15
+        self.__pieces.find_by_id("player1_1").location = 13
+        self.assertFalse(self.__game_controller.win())
+
+        self.__game_controller.rolled_dice_value = 2
+        self.__game_controller.move_piece(1)
+        self.assertEqual(winners, ["player1"])
+        self.assertEqual(self.__game_controller.winner_name, "steve roger")
+
+        # asking about the winner changes nothing and doesn't tell the listeners again
+        for _ in range(2):
+            self.assertTrue(self.__game_controller.win())
+            self.assertEqual(self.__game_controller.get_winner_name(), "steve roger")
+        self.__game_controller.player_wins(1)
+        self.assertEqual(winners, ["player1"])
+        self.assertEqual(self.__pieces.finish_count("player1"), 7)
+
+        self.__game_controller.reset_all()
+        self.assertFalse(self.__game_controller.win())
+        self.assertIsNone(self.__game_controller.winner_name)
+
+    def test_make_unmake_move(self):
+        self.__pieces.find_by_id("player1_1").location = 6
+        self.__pieces.find_by_id("player2_2").location = 8  # safe spot: can't be captured
+        self.__pieces.find_by_id("player2_3").location = 7
+        self.__game_controller.rolled_dice_value = 1
+        state = self.__game_controller.game_state
+
+        for piece_number in (1, 2):  # a capture and a move from the spawn
+            record = self.__game_controller.make_move(piece_number)
+            self.assertNotEqual(self.__game_controller.game_state, state)
+            self.__game_controller.unmake_move(record)
+            self.assertEqual(self.__game_controller.game_state, state)
+        self.assertFalse(self.__game_controller.can_undo)
+
+        record = self.__game_controller.make_move(1)
+        self.assertEqual(record, (1, 6, 3, "player1", 1))
+        self.assertEqual(self.__pieces.find_by_id("player2_3").location, 0)
+        self.assertEqual(self.__game_controller.current_player, "player2")
+
+        self.__game_controller.rolled_dice_value = 3
+        skip = self.__game_controller.make_move(None)
+        self.assertEqual(self.__game_controller.current_player, "player1")
+        self.__game_controller.unmake_move(skip)
+        self.__game_controller.unmake_move(record)
+        self.assertEqual(self.__game_controller.game_state, state)
+        self.assertEqual(self.__game_controller.rolled_dice_value, 1)
+
+    def test_undo_redo(self):
+        self.assertRaises(MetaException, self.__game_controller.undo)
+        self.__game_controller.rolled_dice_value = 4
+        self.__game_controller.move_piece(1)  # a rosette: player1 moves again
+        self.__game_controller.rolled_dice_value = 2
+        self.__game_controller.move_piece(1)
+        self.__game_controller.rolled_dice_value = 0
+        self.__game_controller.skip_turn()
+        state = self.__game_controller.game_state
+
+        for _ in range(3):
+            self.__game_controller.undo()
+        self.assertEqual(self.__pieces.find_by_id("player1_1").location, 0)
+        self.assertEqual(self.__game_controller.current_player, "player1")
+        self.assertEqual(self.__game_controller.rolled_dice_value, 4)
+        self.assertRaises(MetaException, self.__game_controller.undo)
+
+        for _ in range(3):
+            self.__game_controller.redo()
+        self.assertEqual(self.__game_controller.game_state, state)
+        self.assertRaises(MetaException, self.__game_controller.redo)
+
+        self.__game_controller.undo()
+        self.__game_controller.skip_turn()  # a new move: the undone one is gone
+        self.assertFalse(self.__game_controller.can_redo)
+
+    def test_no_undo_after_the_win(self):
+        with tempfile.TemporaryDirectory() as directory, \
+                Leaderboard(os.path.join(directory, "leaderboard.db")) as leaderboard:
+            game_controller = GameController(self.__pieces, self.__squares, self.__players,
+                                             GameControllerDataValidator, leaderboard=leaderboard)
+            winners = []
+            game_controller.add_game_over_listener(winners.append)
+            for piece_number in range(2, 8):
+                self.__pieces.find_by_id("player1_" + str(piece_number)).location = 15
+            self.__pieces.find_by_id("player1_1").location = 13
+            game_controller.rolled_dice_value = 2
+            game_controller.move_piece(1)  # the winning move
+
+            self.assertFalse(game_controller.can_undo)
+            self.assertRaises(MetaException, game_controller.undo)
+            self.assertRaises(MetaException, game_controller.redo)
+            self.assertEqual(winners, ["player1"])
+            wins = {player.name: player.wins for player in self.__players.get_all()}
+            self.assertEqual(wins["steve roger"], 1)
+            self.assertEqual([(standing.name, standing.wins) for standing in leaderboard.get_all()],
+                             [("steve roger", 1), ("jane doe", 0)])
+
     def test_ai(self):
         self.__game_controller.reset_all()
         self.__game_controller.add_player("john doe", 1)
@@ -115,3 +246,24 @@ class TestGameController(unittest.TestCase):
         self.__game_controller.rolled_dice_value = 0
         self.__game_controller.ai_moves_piece()
         self.assertEqual(piece.location, 0)
+
+    def test_ai_chooses_then_plays(self):
+        self.__game_controller.reset_all()
+        self.__game_controller.add_player("john doe", 1)
+        self.__game_controller.add_player(None, None, is_human=False)
+        self.__game_controller.switch_players()
+
+        self.__game_controller.rolled_dice_value = 2
+        piece_number = self.__game_controller.ai_chooses_a_move()
+        self.assertEqual(piece_number, "1")
+        self.assertEqual(self.__pieces.find_by_id("player2_1").location, 0)  # thinking doesn't move anything
+
+        self.__game_controller.ai_plays(piece_number)
+        self.assertEqual(self.__pieces.find_by_id("player2_1").location, 2)
+        self.assertEqual(self.__game_controller.current_player, "player1")
+
+        self.__game_controller.switch_players()
+        self.__game_controller.rolled_dice_value = 0
+        self.assertIsNone(self.__game_controller.ai_chooses_a_move())
+        self.__game_controller.ai_plays(None)
+        self.assertEqual(self.__game_controller.current_player, "player1")
@@ -0,0 +1,148 @@
+import os
+import tempfile
+import unittest
+
+from src.analyzer import analyze_archive
+from src.domain.entities import AI
+from src.domain.game_state import PLAYER_MASK
+from src.domain.validators import GameControllerDataValidator, MetaException
+from src.repository.repo import Pieces, Squares, BaseRepository
+from src.services.ai_strategy import AIStrategy
+from src.services.dice import Dice
+from src.services.game_controller import GameController
+from src.services.game_record import GameRecordWriter, GameRecorder, read_records, parse_records, replay, \
+    encode_turn, decode_turn, UNDO_TURN
+from src.services.snapshot import Autosaver
+from src.tournament import play_game, play_recorded_game, GameOptions
+
+
+class TestGameRecord(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__directory.name, "games.urgr")
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    @staticmethod
+    def new_game_controller(seed=None):
+        pieces, squares, players = Pieces(), Squares(), BaseRepository()
+        players.add(AI(AIStrategy(pieces, squares)))
+        return GameController(pieces, squares, players, GameControllerDataValidator, Dice(seed))
+
+    def test_turns(self):
+        self.assertEqual(decode_turn(encode_turn(3, 7)), (3, 7))
+        self.assertEqual(decode_turn(encode_turn(0, None)), (0, None))
+
+    def test_record_and_replay(self):
+        game_controller = self.new_game_controller(5)
+        recorder = GameRecorder(game_controller, GameRecordWriter(self.__path))
+        game_controller.add_player("jane doe", 1)
+        game_controller.add_player(None, None, is_human=False)
+        while not game_controller.win():
+            game_controller.roll_dice()
+            if game_controller.current_player == "player2":
+                game_controller.ai_plays(game_controller.ai_chooses_a_move())
+            else:
+                moves = game_controller.legal_moves("player1", game_controller.rolled_dice_value)
+                if moves:
+                    game_controller.move_piece(moves[-1].piece)
+                else:
+                    game_controller.skip_turn()
+                if game_controller.can_undo and game_controller.rolled_dice_value == 4:
+                    game_controller.undo()
+                    game_controller.redo()
+        final_state = game_controller.game_state
+        winner_name = game_controller.winner_name
+        game_controller.reset_all()
+
+        game_controller.add_player("john doe", 1)  # an abandoned game
+        game_controller.add_player("steve roger", 2)
+        game_controller.rolled_dice_value = 2
+        game_controller.move_piece(1)
+        recorder.close()
+
+        finished_game, abandoned_game = read_records(self.__path)
+        self.assertEqual(finished_game.names, ("jane doe", "computer"))
+        self.assertTrue(finished_game.pve)
+        self.assertEqual((finished_game.seed, finished_game.spawn_key), (5, (0,)))
+        self.assertEqual(abandoned_game.turns, bytes((encode_turn(2, 1),)))
+        self.assertEqual(abandoned_game.spawn_key, (1,))
+
+        replayed = self.new_game_controller()
+        replay(finished_game, replayed)
+        self.assertEqual(replayed.game_state, final_state)
+        self.assertEqual(replayed.winner_name, winner_name)
+
+    def test_resumed_game(self):
+        game_controller = self.new_game_controller(2)
+        recorder = GameRecorder(game_controller, GameRecordWriter(self.__path))
+        autosaver = Autosaver(game_controller, self.__path + ".ursv")
+        game_controller.add_player("jane doe", 1)
+        game_controller.add_player("john doe", 2)
+
+        def play_turn():
+            game_controller.roll_dice()
+            moves = game_controller.legal_moves(game_controller.current_player, game_controller.rolled_dice_value)
+            if moves:
+                game_controller.move_piece(moves[-1].piece)
+            else:
+                game_controller.skip_turn()
+
+        for _ in range(12):
+            play_turn()
+        autosaver.resume()  # the same match, but with new dice: a new record starts from where it was resumed
+        while not game_controller.win():
+            play_turn()
+        final_state = game_controller.game_state
+        autosaver.close()
+        recorder.close()
+
+        first_part, resumed_part = read_records(self.__path)
+        self.assertEqual(len(first_part.turns), 12)
+        self.assertNotEqual(resumed_part.start.code & PLAYER_MASK, 0)
+        replayed = self.new_game_controller()
+        replay(resumed_part, replayed)
+        self.assertEqual(replayed.game_state, final_state)
+
+        stats = analyze_archive(self.__path)
+        self.assertEqual((stats.games, stats.unfinished), (2, 1))
+        self.assertEqual(sum(stats.wins), 1)
+
+    def test_undo_before_the_record(self):
+        game_controller = self.new_game_controller(4)
+        game_controller.add_player("jane doe", 1)
+        game_controller.add_player("john doe", 2)
+        for piece_number in (1, 2):
+            game_controller.rolled_dice_value = 2
+            game_controller.move_piece(piece_number)
+        recorder = GameRecorder(game_controller, GameRecordWriter(self.__path))  # both moves are before the record
+        game_controller.undo()
+        game_controller.undo()
+        game_controller.rolled_dice_value = 3
+        game_controller.move_piece(1)
+        final_state = game_controller.game_state
+        recorder.close()
+
+        records = read_records(self.__path)
+        self.assertNotIn(UNDO_TURN, b"".join(record.turns for record in records))
+        replayed = self.new_game_controller()
+        replay(records[-1], replayed)
+        self.assertEqual(replayed.game_state, final_state)
+
+    def test_tournament_records(self):
+        options = GameOptions(3, 0.01, None)
+        winner, turns = play_recorded_game("heuristic", "random", options)
+        self.assertEqual(winner, play_game("heuristic", "random", options))
+        with GameRecordWriter(self.__path) as writer:
+            writer.begin(options.seed, (), ("heuristic", "random"), False)
+            writer.write_turns(turns)
+        with open(self.__path, "rb") as records_file:
+            data = records_file.read()
+        record, = parse_records(data)
+        self.assertTrue(record.finished)
+
+        game_controller = self.new_game_controller()
+        replay(record, game_controller)
+        self.assertEqual(game_controller.get_winner(), ("player1", "player2")[winner])
+        self.assertRaises(MetaException, list, parse_records(data[:10]))
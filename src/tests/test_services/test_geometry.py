@@ -0,0 +1,30 @@
+import unittest
+
+from src.services.geometry import OFFSETS, Geometry, compute_offset
+
+
+class TestGeometry(unittest.TestCase):
+    def test_offsets(self):
+        self.assertEqual(OFFSETS["player1"][0][0], (0, 0))
+        self.assertEqual(OFFSETS["player2"][6][0], (6, 4))
+        self.assertEqual(OFFSETS["player1"][2][8], (3, 2))
+        self.assertEqual(OFFSETS["player2"][0][15], (8, 3))
+        self.assertEqual(OFFSETS["player2"][3][13], (7, 3))
+        for player in OFFSETS:
+            for index, offsets in enumerate(OFFSETS[player], 1):
+                for location, offset in enumerate(offsets):
+                    self.assertEqual(offset, compute_offset(location, index, player))
+
+    def test_pixels(self):
+        geometry = Geometry((117, 110), (51, 51), (45, 45))
+        self.assertEqual(geometry.center("player1", 1, 0), (117, 110))
+        self.assertEqual(geometry.center("player1", 3, 8), (117 + 3 * 51, 110 + 2 * 51))
+        self.assertEqual(geometry.rect("player2", 1, 15), (117 + 8 * 51 - 22, 110 + 3 * 51 - 22, 45, 45))
+
+        left, top, width, height = geometry.bounds()
+        for player in ("player1", "player2"):
+            for index in range(1, 8):
+                for location in range(16):
+                    x, y, piece_width, piece_height = geometry.rect(player, index, location)
+                    self.assertTrue(left <= x and x + piece_width <= left + width)
+                    self.assertTrue(top <= y and y + piece_height <= top + height)
@@ -0,0 +1,26 @@
+import os
+import subprocess
+import sys
+import unittest
+
+ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))))
+
+# pygame is made unimportable: importing it raises ImportError
+HEADLESS_SCRIPT = """
+import sys
+sys.modules["pygame"] = None
+
+import src.manager
+import src.tournament
+from src.services.simulator import BatchSimulator
+
+src.manager.Manager()
+BatchSimulator(seed=1).play(2)
+assert "src.ui.gui" not in sys.modules
+"""
+
+
+class TestHeadless(unittest.TestCase):
+    def test_engine_without_pygame(self):
+        process = subprocess.run([sys.executable, "-c", HEADLESS_SCRIPT], cwd=ROOT, capture_output=True, text=True)
+        self.assertEqual(process.returncode, 0, process.stderr)
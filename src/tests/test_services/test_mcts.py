@@ -0,0 +1,66 @@
+import unittest
+
+from src.domain.game_state import GameState, apply_move
+from src.repository.repo import Pieces, Squares
+from src.services.dice import Dice
+from src.services.mcts import MCTSStrategy
+
+
+class TestMCTS(unittest.TestCase):
+    def setUp(self):
+        self.__pieces = Pieces()
+        self.__squares = Squares()
+
+        self.__strategy = MCTSStrategy(self.__pieces, self.__squares, time_budget=5, max_playouts=300, seed=3)
+
+    def test_obvious_move(self):
+        state = GameState.from_locations((15,) * 6 + (0,), (15,) * 6 + (13,), 1)
+        self.assertEqual(self.__strategy.choose_move(state, 2).destination, 15)
+        self.assertEqual(self.__strategy.last_playouts, 0)  # the only move needs no search
+
+        state = GameState.from_locations((15,) * 6 + (7,), (15,) * 5 + (5, 0), 1)
+        self.assertTrue(self.__strategy.choose_move(state, 2).captures)
+        self.assertEqual(self.__strategy.last_playouts, 300)
+        self.assertGreater(self.__strategy.playouts_per_second, 0)
+
+        state = GameState.from_locations((15,) * 6 + (0,), (15,) * 6 + (13,), 1)
+        self.__strategy.choose_move(state, 2)
+        self.assertEqual((self.__strategy.last_playouts, self.__strategy.playouts_per_second), (0, 0))
+
+    def test_no_budget(self):
+        state = GameState.from_locations((15,) * 6 + (7,), (15,) * 5 + (5, 0), 1)
+        for strategy in (MCTSStrategy(self.__pieces, self.__squares, time_budget=0, seed=7),
+                         MCTSStrategy(self.__pieces, self.__squares, max_playouts=0, seed=7)):
+            move = strategy.choose_move(state, 2)
+            self.assertIsNotNone(move)
+            self.assertEqual(strategy.last_playouts, 0)
+            self.assertIsNotNone(strategy.choose_move(apply_move(state, move), 2))
+
+    def test_seeded_dice(self):
+        state = GameState.from_locations((0,) * 7, (6,) + (0,) * 6, 1)
+        visits = []
+        for _ in range(2):
+            strategy = MCTSStrategy(self.__pieces, self.__squares, time_budget=5, max_playouts=200, seed=7,
+                                    dice=Dice(3))
+            move = strategy.choose_move(state, 2)
+            strategy.choose_move(apply_move(state, move), 2)
+            visits.append((move, strategy.reused_visits))
+        self.assertEqual(visits[0], visits[1])  # the same dice play the same playouts
+
+    def test_no_moves(self):
+        self.assertFalse(self.__strategy.can_make_move(0))
+        self.assertIsNone(self.__strategy.choose_move(GameState.from_locations((0,) * 7, (15,) * 7, 1), 3))
+
+    def test_subtree_reuse(self):
+        state = GameState.from_locations((0,) * 7, (6,) + (0,) * 6, 1)
+        move = self.__strategy.choose_move(state, 2)
+        self.assertTrue(move.extra_turn)
+
+        self.__strategy.choose_move(apply_move(state, move), 2)
+        self.assertGreater(self.__strategy.reused_visits, 0)
+
+    def test_ai_entity(self):
+        self.__pieces.find_by_id("player2_1").location = 4
+        self.__pieces.find_by_id("player1_1").location = 8
+        self.assertFalse(self.__strategy.can_make_move(4))
+        self.assertIn(self.__strategy.get_best_piece_number_to_move(3), ["1", "2"])
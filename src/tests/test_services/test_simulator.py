@@ -0,0 +1,42 @@
+import unittest
+
+import numpy as np
+
+from src.domain.game_state import GameState, apply_move, pass_turn, winner
+from src.repository.repo import Pieces, Squares
+from src.services.ai_strategy import AIStrategy
+from src.services.simulator import BatchSimulator
+
+
+class TestSimulator(unittest.TestCase):
+    def setUp(self):
+        self.__simulator = BatchSimulator(seed=3)
+
+    def test_all_games_end(self):
+        results = self.__simulator.play(200)
+        self.assertTrue(np.isin(results.winners, (0, 1)).all())
+        self.assertTrue((results.turns > 0).all())
+        for game, won in enumerate(results.winners):
+            self.assertTrue((results.locations[game, won] == 15).all())
+            self.assertFalse((results.locations[game, 1 - won] == 15).all())
+
+    def test_seeded_runs(self):
+        first = BatchSimulator(seed=11).play(20)
+        second = BatchSimulator(seed=11).play(20)
+        self.assertTrue((first.winners == second.winners).all())
+        self.assertTrue((first.turns == second.turns).all())
+
+    def test_same_as_scalar_engine(self):
+        results = self.__simulator.play(30, record_dice=True)
+        strategy = AIStrategy(Pieces(), Squares())
+        for game in range(30):
+            state = GameState.from_locations((0,) * 7, (0,) * 7)
+            turns = 0
+            while winner(state) is None:
+                move = strategy.choose_move(state, int(results.dice[turns, game]))
+                state = pass_turn(state) if move is None else apply_move(state, move)
+                turns += 1
+            self.assertEqual(winner(state), results.winners[game])
+            self.assertEqual(turns, results.turns[game])
+            self.assertEqual(state.locations(0), tuple(results.locations[game, 0]))
+            self.assertEqual(state.locations(1), tuple(results.locations[game, 1]))
@@ -0,0 +1,127 @@
+import os
+import tempfile
+import time
+import unittest
+
+from src.domain.entities import AI
+from src.domain.validators import GameControllerDataValidator, MetaException
+from src.repository.repo import Pieces, Squares, BaseRepository
+from src.services.ai_strategy import AIStrategy
+from src.services.dice import Dice, BufferedDice
+from src.services.game_controller import GameController
+from src.services.snapshot import Autosaver, SnapshotException, take_snapshot, read_snapshot, restore
+from src.services.solver import TABLE_HEADER, TABLE_MAGIC, TABLE_VERSION
+
+
+class TestSnapshot(unittest.TestCase):
+    def setUp(self):
+        self.__directory = tempfile.TemporaryDirectory()
+        self.__path = os.path.join(self.__directory.name, "saved_game.ursv")
+
+    def tearDown(self):
+        self.__directory.cleanup()
+
+    @staticmethod
+    def new_game_controller(seed=None):
+        pieces, squares, players = Pieces(), Squares(), BaseRepository()
+        players.add(AI(AIStrategy(pieces, squares)))
+        return GameController(pieces, squares, players, GameControllerDataValidator, Dice(seed))
+
+    @staticmethod
+    def play_turn(game_controller):
+        game_controller.roll_dice()
+        moves = game_controller.legal_moves(game_controller.current_player, game_controller.rolled_dice_value)
+        if moves:
+            game_controller.move_piece(moves[-1].piece)
+        else:
+            game_controller.skip_turn()
+
+    def test_save_and_restore(self):
+        game_controller = self.new_game_controller(3)
+        game_controller.add_player("steve roger", 1)
+        game_controller.add_player("jane doe", 2)
+        for _ in range(30):
+            self.play_turn(game_controller)
+        game_controller.roll_dice()
+        snapshot = read_snapshot(take_snapshot(game_controller, dice_rolled=True))
+        self.assertEqual(snapshot.names, ("steve roger", "jane doe"))
+        self.assertTrue(snapshot.dice_rolled)
+        self.assertFalse(snapshot.pve)
+
+        resumed = self.new_game_controller()
+        restore(snapshot, resumed)
+        self.assertEqual(resumed.game_state, game_controller.game_state)
+        self.assertEqual(resumed.current_player_name, game_controller.current_player_name)
+        self.assertEqual(resumed.rolled_dice_value, game_controller.rolled_dice_value)
+        # the resumed match goes on exactly like the original one
+        for _ in range(30):
+            self.play_turn(game_controller)
+            self.play_turn(resumed)
+            self.assertEqual(resumed.game_state, game_controller.game_state)
+
+        self.assertRaises(MetaException, read_snapshot, b"URSS")
+        self.assertRaises(MetaException, read_snapshot, b"not a saved game, but long enough to have a header")
+        # a solved table is not a saved game, even though it starts with a header too
+        table = TABLE_HEADER.pack(TABLE_MAGIC, TABLE_VERSION, 1, 2000) + bytes(4000)
+        self.assertRaises(SnapshotException, read_snapshot, table)
+
+    def test_load_time(self):
+        game_controller = self.new_game_controller(1)
+        game_controller.add_player("jane doe", 1)
+        game_controller.add_player(None, None, is_human=False)
+        data = take_snapshot(game_controller)
+        resumed = self.new_game_controller()
+        started_at = time.perf_counter()
+        for _ in range(100):
+            restore(read_snapshot(data), resumed)
+        self.assertLess((time.perf_counter() - started_at) / 100, 0.001)
+        self.assertTrue(resumed.pve)
+
+    def test_autosave(self):
+        game_controller = self.new_game_controller(8)
+        autosaver = Autosaver(game_controller, self.__path)
+        self.assertFalse(autosaver.can_resume)
+        game_controller.add_player("jane doe", 1)
+        game_controller.add_player(None, None, is_human=False)
+        for _ in range(10):
+            self.play_turn(game_controller)
+        state = game_controller.game_state
+        self.assertTrue(autosaver.can_resume)
+
+        game_controller.reset_all()
+        autosaver.resume()
+        self.assertEqual(game_controller.game_state, state)
+        self.assertTrue(game_controller.pve)
+
+        game_controller.player_wins(1)
+        self.assertFalse(autosaver.can_resume)  # the match is over, nothing left to resume
+        self.assertRaises(MetaException, autosaver.resume)
+        autosaver.close()
+        self.assertFalse(os.path.exists(self.__path))
+
+    def test_autosave_left_from_last_session(self):
+        game_controller = self.new_game_controller(6)
+        autosaver = Autosaver(game_controller, self.__path)
+        game_controller.add_player("jane doe", 1)
+        game_controller.add_player("john doe", 2)
+        for _ in range(10):
+            self.play_turn(game_controller)
+        state = game_controller.game_state
+        autosaver.close()
+
+        # a new session finds the saved match on the disk once, when it starts
+        resumed = self.new_game_controller()
+        autosaver = Autosaver(resumed, self.__path)
+        self.assertTrue(autosaver.can_resume)
+        autosaver.resume()
+        self.assertEqual(resumed.game_state, state)
+        self.assertEqual(resumed.current_player_name, game_controller.current_player_name)
+        autosaver.close()
+
+    def test_dice_state(self):
+        dice = Dice(4)
+        state = dice.getstate()
+        rolls = [dice.roll() for _ in range(10)]
+        dice.setstate(state)
+        self.assertEqual([dice.roll() for _ in range(10)], rolls)
+        self.assertRaises(MetaException, BufferedDice(4).getstate)
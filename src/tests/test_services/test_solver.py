@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+
+import numpy as np
+
+from src.domain.game_state import GameState, DICE_PROBABILITIES, legal_moves, pass_turn
+from src.domain.validators import MetaException
+from src.repository.repo import Pieces, Squares
+from src.services.solver import StateRanking, Solver, SolvedTable, SolvedStrategy
+
+
+class TestSolver(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.solver = Solver(pieces=2, log=None)
+        cls.solver.solve()
+        table_file, cls.table_path = tempfile.mkstemp()
+        os.close(table_file)
+        cls.solver.write(cls.table_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        os.remove(cls.table_path)
+
+    def test_perfect_ranking(self):
+        ranking = StateRanking(pieces=2)
+        seen = np.zeros(ranking.size, dtype=np.int64)
+        for total_finished in range(5):
+            for group in ranking.groups(total_finished):
+                np.add.at(seen, ranking.rank(*group), 1)
+        self.assertTrue((seen == 1).all())
+        self.assertEqual(StateRanking().size, 137913936)
+
+    def test_values(self):
+        values = self.solver.values
+        self.assertTrue(((values >= 0) & (values <= 1)).all())
+
+        table = SolvedTable(self.table_path)
+        start = GameState.from_locations((15,) * 5 + (0, 0), (15,) * 5 + (0, 0))
+        self.assertGreater(table.win_chance(start), 0.5)  # moving first is an advantage
+        self.assertRaises(MetaException, table.rank, GameState.from_locations((0,) * 7, (0,) * 7))
+
+    def test_bellman_equation(self):
+        table = SolvedTable(self.table_path)
+        states = [GameState.from_locations((15,) * 5 + (0, 6), (15,) * 5 + (3, 8), 0),
+                  GameState.from_locations((15,) * 5 + (4, 12), (15,) * 5 + (0, 0), 1),
+                  GameState.from_locations((15,) * 5 + (14, 0), (15,) * 5 + (13, 5), 0)]
+        for state in states:
+            expected_win_chance = 0
+            for rolled_dice_value, probability in enumerate(DICE_PROBABILITIES):
+                moves = legal_moves(state, rolled_dice_value)
+                if moves:
+                    expected_win_chance += probability * max(table.win_chance_after(state, move) for move in moves)
+                else:
+                    expected_win_chance += probability * (1 - table.win_chance(pass_turn(state)))
+            self.assertAlmostEqual(expected_win_chance, table.win_chance(state), places=4)
+
+    def test_solved_strategy(self):
+        pieces = Pieces()
+        for index in range(1, 6):
+            pieces.find_by_id("player1_" + str(index)).location = 15
+            pieces.find_by_id("player2_" + str(index)).location = 15
+        pieces.find_by_id("player2_6").location = 14
+        pieces.find_by_id("player2_7").location = 12
+        pieces.find_by_id("player1_6").location = 13
+        strategy = SolvedStrategy(pieces, Squares(), self.table_path)
+        self.assertEqual(strategy.get_best_piece_number_to_move(3), "7")
+        self.assertEqual(strategy.get_best_piece_number_to_move(1), "6")
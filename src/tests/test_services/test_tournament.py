@@ -0,0 +1,51 @@
+import unittest
+
+from src.tournament import GameOptions, SPRT, Tournament, TournamentException, elo_difference, play_game, \
+    strategy_seed
+
+
+class TestTournament(unittest.TestCase):
+    def test_play_game(self):
+        options = GameOptions(seed=5, time_budget=0.01, table=None)
+        self.assertIn(play_game("heuristic", "random", options), (0, 1))
+        self.assertEqual(play_game("random", "random", options), play_game("random", "random", options))
+
+    def test_strategy_seed(self):
+        self.assertNotEqual(strategy_seed(5, 0), strategy_seed(5, 1))
+        self.assertEqual(strategy_seed(5, 1), strategy_seed(5, 1))
+        self.assertIsNone(strategy_seed(None, 0))
+
+    def test_elo_difference(self):
+        elo, lower, upper = elo_difference(50, 50)
+        self.assertAlmostEqual(elo, 0)
+        self.assertLess(lower, 0)
+        self.assertGreater(upper, 0)
+        self.assertAlmostEqual(lower, -upper)
+
+        elo, lower, upper = elo_difference(76, 24)
+        self.assertAlmostEqual(elo, 200, delta=1)
+        self.assertLess(lower, elo)
+        self.assertGreater(upper, elo)
+
+        elo, lower, upper = elo_difference(10, 0)
+        self.assertLess(elo, float("inf"))
+
+    def test_sprt(self):
+        sprt = SPRT(elo0=0, elo1=50)
+        self.assertIsNone(sprt.verdict(0, 0))
+        self.assertIsNone(sprt.verdict(6, 4))
+        self.assertEqual(sprt.verdict(100, 0), "H1")
+        self.assertEqual(sprt.verdict(0, 100), "H0")
+        self.assertEqual(sprt.verdict(500, 500), "H0")
+
+    def test_match(self):
+        tournament = Tournament(["heuristic", "random"], max_games=400, workers=2, seed=1)
+        results = tournament.play(report=None)
+        self.assertEqual(len(results), 1)
+        result = results[0]
+        self.assertEqual(result.verdict, "H1")
+        self.assertLess(result.wins + result.losses, 400)  # the SPRT stopped the match early
+        self.assertGreater(result.lower, 0)
+        self.assertIn("heuristic vs random", Tournament.describe(result))
+
+        self.assertRaises(TournamentException, Tournament, ["heuristic", "nobody"])
@@ -0,0 +1,61 @@
+import random
+import unittest
+
+from src.domain.game_state import GameState, INITIAL_STATE, legal_moves, apply_move, pass_turn, winner
+from src.repository.repo import Pieces, Squares
+from src.services.expectiminimax import ExpectiminimaxStrategy
+from src.services.dice import Dice
+from src.services.transposition import TranspositionTable, TranspositionException, zobrist_hash, \
+    zobrist_after_move, SIDE_KEY, EXACT, LOWER_BOUND
+
+
+class TestTransposition(unittest.TestCase):
+    def test_incremental_hash(self):
+        dice = Dice(1)
+        choices = random.Random(1)
+        state = INITIAL_STATE
+        hash_ = zobrist_hash(state)
+        for _ in range(2000):
+            if winner(state) is not None:
+                state = INITIAL_STATE
+                hash_ = zobrist_hash(state)
+            moves = legal_moves(state, dice.roll())
+            if moves:
+                move = choices.choice(moves)
+                hash_ = zobrist_after_move(state, hash_, move)
+                state = apply_move(state, move)
+            else:
+                hash_ ^= SIDE_KEY
+                state = pass_turn(state)
+            self.assertEqual(hash_, zobrist_hash(state))
+        self.assertNotEqual(zobrist_hash(INITIAL_STATE), zobrist_hash(pass_turn(INITIAL_STATE)))
+
+    def test_table(self):
+        self.assertRaises(TranspositionException, TranspositionTable, 1000)
+        table = TranspositionTable(16)
+        self.assertIsNone(table.probe(3, 42))
+
+        table.store(3, 42, 2, 0.5, EXACT, 4)
+        self.assertEqual(table.probe(3, 42), (0.5, EXACT, 2, 4))
+        self.assertIsNone(table.probe(19, 43))  # same slot, different key
+
+        table.store(19, 43, 1, -0.25, LOWER_BOUND)  # searched less deep: the entry stays
+        self.assertIsNotNone(table.probe(3, 42))
+        table.new_search()
+        table.store(19, 43, 1, -0.25, LOWER_BOUND)  # the entry is left over from the last search: it gets replaced
+        self.assertEqual(table.probe(19, 43), (-0.25, LOWER_BOUND, 1, 0))
+
+        stats = table.stats
+        self.assertEqual((stats.probes, stats.hits, stats.entries, stats.replacements), (5, 3, 1, 1))
+        self.assertEqual(stats.memory, 16 * 21)
+        table.clear()
+        self.assertIsNone(table.probe(19, 43))
+
+    def test_search_with_table(self):
+        with_table = ExpectiminimaxStrategy(Pieces(), Squares(), depth=3, time_budget=float("inf"))
+        without_table = ExpectiminimaxStrategy(Pieces(), Squares(), depth=3, time_budget=float("inf"), table_size=None)
+        state = GameState.from_locations((0, 0, 0, 2, 6, 9, 13), (0, 0, 1, 3, 5, 7, 12), 1)
+        for rolled_dice_value in range(1, 5):
+            self.assertEqual(with_table.choose_move(state, rolled_dice_value),
+                             without_table.choose_move(state, rolled_dice_value))
+        self.assertGreater(with_table.table.stats.hits, 0)
@@ -0,0 +1,300 @@
+"""
+    The tournament runner: plays the AI strategies against each other on all the cpu cores and tells how strong they
+    are, compared to each other (Elo).
+    Usage: python -m src.tournament heuristic random mcts --games 1000 --workers 4
+"""
+
+import argparse
+import math
+import os
+from collections import namedtuple
+from concurrent.futures import ProcessPoolExecutor, wait, FIRST_COMPLETED
+from itertools import combinations
+
+from src.domain.game_state import INITIAL_STATE, PLAYERS, apply_move, pass_turn, winner
+from src.domain.validators import MetaException
+from src.repository.repo import Pieces, Squares
+from src.services.ai_strategy import AIStrategy
+from src.services.dice import Dice
+from src.services.expectiminimax import ExpectiminimaxStrategy
+from src.services.game_record import GameRecordWriter, encode_turn
+from src.services.mcts import MCTSStrategy
+from src.services.random_strategy import RandomStrategy
+from src.services.solver import SolvedStrategy
+
+
+class TournamentException(MetaException):
+    pass
+
+
+# what the strategies get to work with, besides the repositories
+# -seed: the seed of the game (random strategies derive theirs from it, see strategy_seed)
+# -time_budget: how many seconds the searching strategies are allowed to think for a single move
+# -table: the path of the solved table (only needed by the "solved" strategy)
+GameOptions = namedtuple("GameOptions", ["seed", "time_budget", "table"])
+
+# every strategy gets made from the repositories, the GameOptions and the Dice of the game
+STRATEGIES = {
+    "heuristic": lambda pieces, squares, options, dice: AIStrategy(pieces, squares),
+    "random": lambda pieces, squares, options, dice: RandomStrategy(pieces, squares, options.seed),
+    "expectiminimax": lambda pieces, squares, options, dice: ExpectiminimaxStrategy(pieces, squares,
+                                                                                    time_budget=options.time_budget),
+    "mcts": lambda pieces, squares, options, dice: MCTSStrategy(pieces, squares, time_budget=options.time_budget,
+                                                                seed=options.seed, dice=dice),
+    "solved": lambda pieces, squares, options, dice: SolvedStrategy(pieces, squares, options.table),
+}
+
+# -wins, losses: counted from the first strategy's point of view (there are no draws in this game)
+# -elo, lower, upper: the Elo difference of the first strategy over the second one, and its confidence interval
+# -verdict: what the SPRT settled on (see SPRT.verdict); None if the match ran out of games first
+MatchResult = namedtuple("MatchResult", ["first", "second", "wins", "losses", "elo", "lower", "upper", "verdict"])
+
+
+def strategy_seed(seed, side):
+    """
+    :param seed: the seed of the game (None -> random)
+    :param side: 0 for player1, 1 for player2
+    :return: the seed of the random choices of the strategy playing that side: the two sides (and the dice) never
+    share a stream, so their choices aren't correlated
+    """
+    return None if seed is None else repr((seed, PLAYERS[side]))
+
+
+def play_game(player1, player2, options, turns=None) -> int:
+    """
+    Plays a whole game between two strategies. It runs in a worker process, so everything it needs is passed by name.
+    :param player1: the name of the strategy that moves first
+    :param player2: the name of the other strategy
+    :param options: the GameOptions of the game
+    :param turns: a bytearray that gets every turn of the game appended, as in the game records (None -> no record)
+    :return: the winner (0 -> player1, 1 -> player2)
+    """
+    dice = Dice(options.seed)
+    # the playouts of the searching strategies roll streams spawned from the dice of the game (see Dice.spawn)
+    strategies = [STRATEGIES[name](Pieces(), Squares(), options._replace(seed=strategy_seed(options.seed, side)), dice)
+                  for side, name in enumerate((player1, player2))]
+    state = INITIAL_STATE
+    while winner(state) is None:
+        rolled_dice_value = dice.roll()
+        move = strategies[state.side].choose_move(state, rolled_dice_value)
+        if turns is not None:
+            turns.append(encode_turn(rolled_dice_value, None if move is None else move.piece))
+        state = pass_turn(state) if move is None else apply_move(state, move)
+    return winner(state)
+
+
+def play_recorded_game(player1, player2, options) -> tuple:
+    """
+    :return: the winner (see play_game) and the turns of the game, as in the game records
+    """
+    turns = bytearray()
+    return play_game(player1, player2, options, turns), bytes(turns)
+
+
+def expected_score(elo) -> float:
+    """
+    :param elo: an Elo difference
+    :return: the chance of winning against a player this many Elo points weaker
+    """
+    return 1 / (1 + 10 ** (-elo / 400))
+
+
+def elo_difference(wins, losses, z=1.96) -> tuple:
+    """
+    Estimates the Elo difference from the score, with a normal approximation of its confidence interval.
+    A 100% (or 0%) score would mean an infinite difference, so the score is kept half a game away from it.
+    :param wins: the games won
+    :param losses: the games lost
+    :param z: the z-score of the confidence interval (1.96 -> 95%)
+    :return: the Elo difference, the lower and the upper end of its confidence interval
+    """
+    games = wins + losses
+    if games == 0:
+        return 0.0, -math.inf, math.inf
+
+    def clamp(score):
+        return min(max(score, 0.5 / games), 1 - 0.5 / games)
+
+    def elo(score):
+        return -400 * math.log10(1 / clamp(score) - 1)
+
+    score = clamp(wins / games)
+    margin = z * math.sqrt(score * (1 - score) / games)
+    return elo(score), elo(score - margin), elo(score + margin)
+
+
+class SPRT:
+    """
+        The sequential probability ratio test: after every game, it tells whether the match is already settled.
+        -H0: the first strategy is elo0 points stronger than the second one (or less)
+        -H1: the first strategy is elo1 points stronger than the second one (or more)
+    """
+    def __init__(self, elo0=0.0, elo1=50.0, alpha=0.05, beta=0.05):
+        """
+        :param elo0: the Elo difference of H0
+        :param elo1: the Elo difference of H1 (greater than elo0)
+        :param alpha: the accepted chance of a false positive (accepting H1 when H0 is true)
+        :param beta: the accepted chance of a false negative (accepting H0 when H1 is true)
+        """
+        self.elo0 = elo0
+        self.elo1 = elo1
+        self.lower_bound = math.log(beta / (1 - alpha))
+        self.upper_bound = math.log((1 - beta) / alpha)
+
+    def log_likelihood_ratio(self, wins, losses) -> float:
+        """
+        :return: how much more likely the results are under H1 than under H0 (logarithm)
+        """
+        p0 = expected_score(self.elo0)
+        p1 = expected_score(self.elo1)
+        return wins * math.log(p1 / p0) + losses * math.log((1 - p1) / (1 - p0))
+
+    def verdict(self, wins, losses):
+        """
+        :return: "H1" or "H0" if the test accepted one of them, None if more games are needed
+        """
+        ratio = self.log_likelihood_ratio(wins, losses)
+        if ratio >= self.upper_bound:
+            return "H1"
+        if ratio <= self.lower_bound:
+            return "H0"
+        return None
+
+
+class Tournament:
+    """
+        Plays a match between every two strategies. The games of a match run in parallel, the strategies alternate
+        colours and every two consecutive games share their dice, so neither the first move advantage nor the luck of
+        the dice favours any of them.
+    """
+    def __init__(self, strategies, max_games=1000, workers=None, sprt=None, seed=0, time_budget=0.1, table=None,
+                 records=None):
+        """
+        :param strategies: the names of the strategies that take part (see STRATEGIES)
+        :param max_games: the most games a match can take, if the SPRT doesn't settle it sooner
+        :param workers: how many processes play the games (None -> one per cpu core)
+        :param sprt: the SPRT that stops the matches early (None -> SPRT with its default hypotheses)
+        :param seed: the seed of the first game
+        :param time_budget: how many seconds the searching strategies are allowed to think for a single move
+        :param table: the path of the solved table (only needed by the "solved" strategy)
+        :param records: the file every game gets recorded to (see game_record; None -> no records)
+        """
+        for name in strategies:
+            if name not in STRATEGIES:
+                raise TournamentException("Unknown strategy: " + name + "! Choose from: " + ", ".join(STRATEGIES))
+        self.strategies = strategies
+        self.max_games = max_games
+        self.workers = workers if workers is not None else (os.cpu_count() or 1)
+        self.sprt = sprt if sprt is not None else SPRT()
+        self.seed = seed
+        self.time_budget = time_budget
+        self.table = table
+        self.records = records
+        self.__writer = None
+
+    def play(self, report=print) -> list:
+        """
+        :param report: gets called with every result as soon as its match is over (None -> silent)
+        :return: the MatchResult of every match
+        """
+        results = []
+        if self.records is not None:
+            self.__writer = GameRecordWriter(self.records)
+        try:
+            with ProcessPoolExecutor(max_workers=self.workers) as executor:
+                for first, second in combinations(self.strategies, 2):
+                    result = self.play_match(executor, first, second)
+                    if report is not None:
+                        report(Tournament.describe(result))
+                    results.append(result)
+        finally:
+            if self.__writer is not None:
+                self.__writer.close()
+                self.__writer = None
+        return results
+
+    def play_match(self, executor, first, second) -> MatchResult:
+        """
+        Keeps a couple of games per worker running, until the SPRT is settled or the match ran out of games.
+        :param executor: the process pool that plays the games
+        :param first: the name of the first strategy
+        :param second: the name of the second strategy
+        :return: the result of the match
+        """
+        in_flight = 2 * self.workers
+        started = 0
+        running = dict()  # future -> (is the first strategy player1?, the names of the players, the options)
+        game = play_recorded_game if self.__writer is not None else play_game
+        wins = losses = 0
+        verdict = None
+
+        while verdict is None and (running or started < self.max_games):
+            while len(running) < in_flight and started < self.max_games:
+                options = GameOptions(self.seed + started // 2, self.time_budget, self.table)
+                first_moves_first = started % 2 == 0
+                players = (first, second) if first_moves_first else (second, first)
+                running[executor.submit(game, *players, options)] = (first_moves_first, players, options)
+                started += 1
+
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                first_moves_first, players, options = running.pop(future)
+                game_winner = future.result()
+                if self.__writer is not None:
+                    game_winner, turns = game_winner
+                    self.__writer.begin(options.seed, (), players, False)
+                    self.__writer.write_turns(turns)
+                    self.__writer.end()
+                if (game_winner == 0) == first_moves_first:
+                    wins += 1
+                else:
+                    losses += 1
+            verdict = self.sprt.verdict(wins, losses)
+
+        for future in running:
+            future.cancel()
+        # the games that already started can't be cancelled: they get played to the end (and ignored), so they don't
+        # take the workers of the next match
+        wait(running)
+        return MatchResult(first, second, wins, losses, *elo_difference(wins, losses), verdict)
+
+    @staticmethod
+    def describe(result) -> str:
+        """
+        :return: the result of a match, in a single line
+        """
+        verdict = {"H1": "the first one is stronger", "H0": "the first one is not stronger",
+                   None: "not settled"}[result.verdict]
+        return "{} vs {}: {}-{}, Elo {:+.0f} [{:+.0f}, {:+.0f}], SPRT: {}".format(
+            result.first, result.second, result.wins, result.losses, result.elo, result.lower, result.upper, verdict)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Plays the AI strategies against each other and reports their Elo.")
+    parser.add_argument("strategies", nargs="+", choices=list(STRATEGIES), help="the strategies that take part")
+    parser.add_argument("--games", type=int, default=1000, help="the most games of a match (default: 1000)")
+    parser.add_argument("--workers", type=int, default=None, help="worker processes (default: one per cpu core)")
+    parser.add_argument("--elo0", type=float, default=0.0, help="the Elo difference of the SPRT's H0 (default: 0)")
+    parser.add_argument("--elo1", type=float, default=50.0, help="the Elo difference of the SPRT's H1 (default: 50)")
+    parser.add_argument("--alpha", type=float, default=0.05, help="the SPRT's false positive rate (default: 0.05)")
+    parser.add_argument("--beta", type=float, default=0.05, help="the SPRT's false negative rate (default: 0.05)")
+    parser.add_argument("--time-budget", type=float, default=0.1, help="seconds per move of the searching strategies "
+                                                                        "(default: 0.1)")
+    parser.add_argument("--seed", type=int, default=0, help="the seed of the first game (default: 0)")
+    parser.add_argument("--table", default=None, help="the solved table, for the \"solved\" strategy")
+    parser.add_argument("--records", default=None, help="record every game to this file")
+    arguments = parser.parse_args()
+
+    if len(arguments.strategies) < 2:
+        parser.error("at least two strategies are needed")
+    if "solved" in arguments.strategies and arguments.table is None:
+        parser.error("the \"solved\" strategy needs --table")
+
+    tournament = Tournament(arguments.strategies, arguments.games, arguments.workers,
+                            SPRT(arguments.elo0, arguments.elo1, arguments.alpha, arguments.beta),
+                            arguments.seed, arguments.time_budget, arguments.table, arguments.records)
+    tournament.play()
+
+
+if __name__ == "__main__":
+    main()
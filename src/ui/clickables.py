@@ -19,15 +19,14 @@ class Button:
         self.__active = active
 
         self.__hover_amount = 0
+        self.__max_hover_amount = 10
+        self.__changed = False
         self.__rect = pygame.Rect(0, 0, self.__width, self.__height)
 
     def draw(self, master, fonts: Font):
         border_radius = 2
         if self.__border_width != 0:
-            border_rect = pygame.Rect((0, 0),
-                                      (self.__width + self.__border_width * 2, self.__height + self.__border_width * 2)
-                                      )
-            border_rect.center = (self.__x, self.__y + self.__height/2 + self.__hover_amount)
+            border_rect = self.__border_rect(self.__hover_amount)
             pygame.draw.rect(master,
                              self.__border_color,
                              border_rect,
@@ -43,11 +42,29 @@ class Button:
                          )
 
         if not self.__text == '':
-            text_surface = fonts.MEDIUM_TEXT.render(self.__text, True, self.__text_color)
+            text_surface = fonts.render(fonts.MEDIUM_TEXT, self.__text, True, self.__text_color)
             text_rect = text_surface.get_rect()
             text_rect.center = (self.__x, self.__y + self.__height / 2 + self.__hover_amount)
             master.blit(text_surface, text_rect)
 
+    def __border_rect(self, hover_amount):
+        border_rect = pygame.Rect((0, 0),
+                                  (self.__width + self.__border_width * 2, self.__height + self.__border_width * 2)
+                                  )
+        border_rect.center = (self.__x, self.__y + self.__height/2 + hover_amount)
+        return border_rect
+
+    def dirty_rects(self, fonts: Font):
+        """
+        :param fonts: the fonts the button is drawn with
+        :return: the regions that need to be drawn again since the button changed (it moves when hovered, so both of
+        its possible places), or an empty list if it didn't change
+        """
+        if not self.__changed:
+            return []
+        self.__changed = False
+        return [self.__border_rect(0).union(self.__border_rect(self.__max_hover_amount))]
+
     def mouse_is_over(self, mouse_pos):
         """
         Preferable, it automatically checks for you the anchor of the rectangle.
@@ -73,11 +90,14 @@ class Button:
         return False
 
     def hover_animation(self):
-        if self.__active:
-            self.__hover_amount = 10
+        if self.__active and self.__hover_amount != self.__max_hover_amount:
+            self.__hover_amount = self.__max_hover_amount
+            self.__changed = True
 
     def stop_hovering(self):
-        self.__hover_amount = 0
+        if self.__hover_amount != 0:
+            self.__hover_amount = 0
+            self.__changed = True
 
 
 class PieceRect:
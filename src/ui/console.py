@@ -11,13 +11,18 @@ class CommandException(MetaException):
 
 
 class Console:
-    def __init__(self, board, game_controller):
+    def __init__(self, board, game_controller, autosaver=None):
+        """
+        :param autosaver: what saves the matches, so they can be resumed (None -> the matches aren't saved)
+        """
         self.__board = board
         self.__game_controller = game_controller
+        self.__autosaver = autosaver
 
         self.__state = "main_menu"
 
-        self.__possible_commands = {"main_menu": {"1": self.__play, "2": self.__switch_ui, "3": self.__quit},
+        self.__possible_commands = {"main_menu": {"1": self.__play, "2": self.__switch_ui, "3": self.__quit,
+                                                  "4": self.__resume},
                                     "options": {"1": self.__pvp, "2": self.__pve},
                                     "in_game": {"0": self.__roll_dice, "1": self.__select_piece,
                                                 "skip": self.__skip, "quit": self.__quit}
@@ -40,21 +45,27 @@ class Console:
     def run(self):
         done = False
         self.__ui = "console"
-        while not done:
-            if self.__game_controller.win():
-                self.__state = "main_menu"
-                Console.print_congratulations_message(self.__game_controller.winner_name)
-            try:
-                command = self.__input_command()
-                done = self.__treat_command(command)
-            except MetaException as mexc:
-                print(Color.RED + str(mexc) + Color.END)
-
-            if self.__ui == "gui":
-                break
+        self.__game_controller.add_game_over_listener(self.__game_over)
+        try:
+            while not done:
+                try:
+                    command = self.__input_command()
+                    done = self.__treat_command(command)
+                except MetaException as mexc:
+                    print(Color.RED + str(mexc) + Color.END)
+
+                if self.__ui == "gui":
+                    break
+        finally:
+            self.__game_controller.remove_game_over_listener(self.__game_over)
 
         return done, self.__ui
 
+    def __game_over(self, winner):
+        Console.print_congratulations_message(self.__game_controller.winner_name)
+        self.__state = "main_menu"
+        self.__game_controller.reset_all()
+
     def __input_command(self):
         if self.__skipped:
             return
@@ -80,6 +91,8 @@ class Console:
         if self.__game_controller.pve and self.__game_controller.current_player == "player2":
             self.__game_controller.switch_players()
             return False
+        if command is None:  # the computer won the match with his move
+            return False
 
         if command not in self.__possible_commands[self.__state]:
             raise CommandException("Invalid command given.\n")
@@ -89,6 +102,14 @@ class Console:
         self.__state = "options"
         return False
 
+    def __resume(self):
+        if self.__autosaver is None:
+            raise CommandException("There is no saved game to resume!")
+        snapshot = self.__autosaver.resume()
+        self.__state = "in_game"
+        self.__in_game_state = "dice_rolled_select_piece" if snapshot.dice_rolled else "new_turn_roll_dice"
+        return False
+
     def __roll_dice(self):
         if self.__in_game_state == "dice_rolled_select_piece":
             raise CommandException("You can't select a piece now! You must roll the dice!")
@@ -98,7 +119,7 @@ class Console:
         return False
 
     def __skip(self):
-        self.__game_controller.switch_players()
+        self.__game_controller.skip_turn()
         self.__in_game_state = "new_turn_roll_dice"
         self.__skipped = True
 
@@ -141,6 +162,8 @@ class Console:
         return False
 
     def __quit(self):
+        if self.__state == "in_game" and self.__autosaver is not None:
+            self.__autosaver.save(dice_rolled=self.__in_game_state == "dice_rolled_select_piece")
         return True
 
     @staticmethod
@@ -149,6 +172,7 @@ class Console:
               "1. Play\n"
               "2. Switch UI\n"
               "3. Quit\n"
+              "4. Resume the last game\n"
               )
 
     @staticmethod
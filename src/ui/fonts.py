@@ -1,10 +1,36 @@
+from collections import OrderedDict
+
 import pygame
 
 
 class Font:
-    def __init__(self, rel_folder_path):
+    def __init__(self, rel_folder_path, max_cached_texts=256):
         self.TITLE = pygame.font.Font(rel_folder_path + "fonts/Helvetica-Bold.ttf", 48)
         self.BIG_TEXT = pygame.font.Font(rel_folder_path + "fonts/Helvetica.ttf", 32)
         self.MEDIUM_TEXT = pygame.font.Font(rel_folder_path + "fonts/Helvetica.ttf", 24)
         self.SMALL_TEXT = pygame.font.Font(rel_folder_path + "fonts/Helvetica.ttf", 16)
         self.SMALL_BOLD_TEXT = pygame.font.Font(rel_folder_path + "fonts/Helvetica-Bold.ttf", 16)
+
+        self.__max_cached_texts = max_cached_texts
+        self.__rendered_texts = OrderedDict()  # (font, text, color, antialias) -> surface, least recently used first
+
+    def render(self, font, text, antialias, color) -> pygame.Surface:
+        """
+        Renders the text only the first time it's asked for; after that, the same surface is given back. When too many
+        texts are cached, the least recently used one gets forgotten.
+        :param font: one of the fonts above (e.g. fonts.SMALL_TEXT)
+        :param text: the text to render
+        :param antialias: smooth edges or not
+        :param color: the color of the text
+        :return: the rendered text (don't draw on it, it's shared)
+        """
+        key = (font, text, tuple(color), antialias)
+        surface = self.__rendered_texts.get(key)
+        if surface is None:
+            surface = font.render(text, antialias, color)
+            self.__rendered_texts[key] = surface
+            if len(self.__rendered_texts) > self.__max_cached_texts:
+                self.__rendered_texts.popitem(last=False)
+        else:
+            self.__rendered_texts.move_to_end(key)
+        return surface
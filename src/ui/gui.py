@@ -1,8 +1,12 @@
 
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+
 import pygame
 # import PIL
 from src.domain.validators import MetaException
 from src.ui.fonts import Font
+from src.ui.images import Images
 from src.ui.window import Window
 from src.ui.menus import MainMenu, OptionsMenu, PVEMenu, InGameMenu, WinnerMenu, PVPMenu
 
@@ -15,8 +19,63 @@ class Clock:
         self.__clock.tick(fps_limit)
 
 
+class AITurn:
+    """
+        Plays the ai's turns without freezing the window: the ai thinks in a background thread, while the main loop
+        keeps drawing frames and treating events. Its move is made on the main thread, once it's ready and the
+        presentation delay (so the human can follow what's happening) has passed.
+    """
+    def __init__(self, game_controller, presentation_delay):
+        """
+        :param game_controller: the game controller of the match
+        :param presentation_delay: the least number of seconds an ai turn takes
+        """
+        self.__game_controller = game_controller
+        self.__presentation_delay = presentation_delay
+        self.__thinker = ThreadPoolExecutor(max_workers=1)
+        self.__chosen_move = None
+        self.__started_at = None
+
+    @property
+    def is_pending(self) -> bool:
+        """
+        :return: is the ai playing (or about to)? While he is, the gui has to keep ticking, even without any events.
+        """
+        return self.__chosen_move is not None or self.is_ai_turn
+
+    @property
+    def is_ai_turn(self) -> bool:
+        return self.__game_controller.pve and self.__game_controller.current_player == "player2"
+
+    def update(self) -> None:
+        """
+        Call this once every frame: it starts the ai's turn when it's his turn, and makes his move when it's ready.
+        """
+        if self.__chosen_move is None:
+            if self.is_ai_turn and self.__game_controller.get_winner() is None:
+                self.__game_controller.roll_dice()
+                self.__chosen_move = self.__thinker.submit(self.__game_controller.ai_chooses_a_move)
+                self.__started_at = time.perf_counter()
+        elif self.__chosen_move.done() and time.perf_counter() - self.__started_at >= self.__presentation_delay:
+            chosen_move = self.__chosen_move
+            self.__chosen_move = None
+            self.__game_controller.ai_plays(chosen_move.result())
+
+    def cancel(self) -> None:
+        """
+        Forgets about the ai's turn (e.g. when the match is quit, or a move is undone), so his move gets ignored. If he
+        is still thinking, this waits until he's done: he reads the pieces the caller is about to change.
+        """
+        chosen_move, self.__chosen_move = self.__chosen_move, None
+        if chosen_move is not None and not chosen_move.cancel():
+            wait((chosen_move,))
+
+
 class GUI:
-    def __init__(self, board, game_controller):
+    def __init__(self, board, game_controller, ai_presentation_delay=1.0, idle_timeout=0.5, autosaver=None):
+        """
+        :param autosaver: what saves the matches, so they can be resumed (None -> the matches aren't saved)
+        """
         pygame.init()  # init pygame
         pygame.display.quit()  # but close the window
 
@@ -31,15 +90,20 @@ class GUI:
         self.__pve_menu = None
         self.__in_game_menu = None
         self.__winner_menu = None
+        self.__state_menus = None
+        self.__drawn_scene = None
         self.__clock = None
         self.__fps_limit = 90
+        self.__idle_timeout = idle_timeout
 
         self.__ui = "gui"
         self.__done = True
         self.__board = board
         self.__game_controller = game_controller
+        self.__autosaver = autosaver
 
         self.__fonts = Font(self.__rel_folder_path)
+        self.__images = Images(self.__rel_folder_path)
 
         self.__state = "main_menu"
         self.__state_cases = {"main_menu": self.__print_main_menu,
@@ -58,52 +122,99 @@ class GUI:
                                }
 
         self.__error_msg = None
+        self.__ai_turn = AITurn(game_controller, ai_presentation_delay)
 
     # anything that has to do with the screen and events:
     def run(self):
         self.__ui = "gui"
-        self.__window = Window(self.__rel_folder_path)
-        self.__main_menu = MainMenu(self.__window.main_bg, self.__fonts, self.__rel_folder_path)
-        self.__options_menu = OptionsMenu(self.__window.main_bg, self.__fonts, self.__rel_folder_path)
-        self.__pvp_menu = PVPMenu(self.__window.main_bg, self.__fonts, self.__rel_folder_path)
-        self.__pve_menu = PVEMenu(self.__window.main_bg, self.__fonts, self.__rel_folder_path)
-        self.__in_game_menu = InGameMenu(self.__window.main_bg, self.__fonts, self.__rel_folder_path,
-                                         self.__game_controller, self.__board)
-        self.__winner_menu = WinnerMenu(self.__window.main_bg, self.__fonts, self.__rel_folder_path,
+        self.__window = Window(self.__rel_folder_path, self.__images)
+        self.__main_menu = MainMenu(self.__window.main_bg, self.__fonts, self.__images)
+        self.__options_menu = OptionsMenu(self.__window.main_bg, self.__fonts, self.__images)
+        self.__pvp_menu = PVPMenu(self.__window.main_bg, self.__fonts, self.__images)
+        self.__pve_menu = PVEMenu(self.__window.main_bg, self.__fonts, self.__images)
+        self.__in_game_menu = InGameMenu(self.__window.main_bg, self.__fonts, self.__images,
+                                         self.__game_controller)
+        self.__winner_menu = WinnerMenu(self.__window.main_bg, self.__fonts, self.__images,
                                         self.__game_controller)
+        self.__state_menus = {"main_menu": self.__main_menu,
+                              "options": self.__options_menu,
+                              "pvp_pick_names": self.__pvp_menu,
+                              "pve_pick_names": self.__pve_menu,
+                              "in_game": self.__in_game_menu,
+                              "win": self.__winner_menu
+                              }
+        self.__drawn_scene = None
 
         self.__clock = Clock()
 
         self.__done = False
-        while not self.__done:
-            try:
-                self.__treat_events()
-            except MetaException as ex:
-                self.__error_msg = str(ex)
-
-            if self.__done is True or self.__ui == "console":
-                self.__window.close()
-                break
-
-            self.__update_screen()
-            pygame.display.update()
-
-            self.__clock.limit_fps(self.__fps_limit)
+        self.__game_controller.add_game_over_listener(self.__game_over)
+        try:
+            while not self.__done:
+                try:
+                    self.__treat_events()
+                    if self.__state == "in_game":
+                        self.__ai_turn.update()
+                except MetaException as ex:
+                    self.__error_msg = str(ex)
+
+                if self.__done is True or self.__ui == "console":
+                    self.__window.close()
+                    break
+
+                self.__update_screen()
+
+                self.__clock.limit_fps(self.__fps_limit)
+        finally:
+            self.__game_controller.remove_game_over_listener(self.__game_over)
 
         return self.__done, self.__ui
 
+    def __game_over(self, winner):
+        self.__state = "win"
+
     def __treat_events(self):
-        for event in pygame.event.get():
+        for event in GUI.__coalesce_mouse_motion(self.__get_events()):
             # noinspection PyArgumentList
             self.__state_events[self.__state](event)
             if event.type == pygame.QUIT:
                 self.__done = True
 
+    def __get_events(self):
+        """
+        When nothing is going on (no ai turn is pending), this sleeps until an event comes, or until the idle timeout
+        passes, instead of spinning at the fps limit; otherwise it only takes the events that already came.
+        :return: the events to treat
+        """
+        if self.__state == "in_game" and self.__ai_turn.is_pending:
+            return pygame.event.get()
+        event = pygame.event.wait(int(self.__idle_timeout * 1000))
+        if event.type == pygame.NOEVENT:
+            return []
+        return [event] + pygame.event.get()
+
+    @staticmethod
+    def __coalesce_mouse_motion(events):
+        """
+        A fast mouse sends lots of motion events every frame. The hover effects only care about where the mouse is
+        now, so only the last motion event of the frame is kept.
+        :param events: the events of a frame
+        :return: the same events, without the motion events before the last one
+        """
+        last_motion = None
+        for position, event in enumerate(events):
+            if event.type == pygame.MOUSEMOTION:
+                last_motion = position
+        return [event for position, event in enumerate(events)
+                if event.type != pygame.MOUSEMOTION or position == last_motion]
+
     def __main_menu_events(self, event):
         mouse_pos = pygame.mouse.get_pos()
         if event.type == pygame.MOUSEBUTTONDOWN:
             if self.__main_menu.play_button.mouse_is_over(mouse_pos):
                 self.__state = "options"
+            if self.__main_menu.can_resume and self.__main_menu.resume_button.mouse_is_over(mouse_pos):
+                self.__resume()
             if self.__main_menu.switch_ui_button.mouse_is_over(mouse_pos):
                 self.__ui = "console"
             if self.__main_menu.quit_button.mouse_is_over(mouse_pos):
@@ -113,6 +224,10 @@ class GUI:
                 self.__main_menu.play_button.hover_animation()
             else:
                 self.__main_menu.play_button.stop_hovering()
+            if self.__main_menu.can_resume and self.__main_menu.resume_button.mouse_is_over(mouse_pos):
+                self.__main_menu.resume_button.hover_animation()
+            else:
+                self.__main_menu.resume_button.stop_hovering()
             if self.__main_menu.switch_ui_button.mouse_is_over(mouse_pos):
                 self.__main_menu.switch_ui_button.hover_animation()
             else:
@@ -190,10 +305,6 @@ class GUI:
     def __in_game_events(self, event):
         mouse_pos = pygame.mouse.get_pos()
 
-        # win condition:
-        if self.__game_controller.win():
-            self.__state = "win"
-
         # button animations:
         if event.type == pygame.MOUSEMOTION:
             if self.__in_game_menu.roll_button.mouse_is_over(mouse_pos):
@@ -209,18 +320,24 @@ class GUI:
             else:
                 self.__in_game_menu.skip_button.stop_hovering()
 
+        # while the ai plays, the human can only quit:
+        if event.type == pygame.MOUSEBUTTONDOWN and self.__ai_turn.is_ai_turn:
+            if self.__in_game_menu.quit_button.mouse_is_over(mouse_pos):
+                self.__quit_match()
+            return
+
         # all types of clicks:
         if event.type == pygame.MOUSEBUTTONDOWN:
             self.__in_game_menu.selected_piece = None
 
             # selecting pieces event:
-            for piece in self.__in_game_menu.all_pieces:
-                if piece.mouse_is_over(mouse_pos):
-                    if self.__in_game_menu.state == "roll_dice":
-                        raise MetaException("You can't select a piece before rolling the dice!")
-                    self.__error_msg = None
+            piece = self.__in_game_menu.piece_at(mouse_pos)
+            if piece is not None:
+                if self.__in_game_menu.state == "roll_dice":
+                    raise MetaException("You can't select a piece before rolling the dice!")
+                self.__error_msg = None
 
-                    self.__in_game_menu.selected_piece = piece.id
+                self.__in_game_menu.selected_piece = piece.id
 
             # move event:
             if self.__in_game_menu.move_piece_rect is not None and self.__in_game_menu.move_piece_rect.mouse_is_over(
@@ -235,7 +352,7 @@ class GUI:
 
             # skip button event:
             if self.__in_game_menu.skip_button.mouse_is_over(mouse_pos):
-                self.__game_controller.switch_players()
+                self.__game_controller.skip_turn()
                 self.__in_game_menu.state = "roll_dice"
                 self.__in_game_menu.selected_piece = None
                 self.__in_game_menu.move_piece_rect = None
@@ -252,10 +369,68 @@ class GUI:
 
             # quit button event:
             if self.__in_game_menu.quit_button.mouse_is_over(mouse_pos):
-                self.__game_controller.reset_all()
-                self.__in_game_menu.state = "roll_dice"
-                self.__state = "main_menu"
-                self.__error_msg = None
+                self.__quit_match()
+
+        # undo (ctrl + z) / redo (ctrl + y) events:
+        if event.type == pygame.KEYDOWN and event.mod & pygame.KMOD_CTRL:
+            if event.key == pygame.K_z:
+                self.__undo()
+            elif event.key == pygame.K_y:
+                self.__redo()
+
+    def __undo(self):
+        """
+        Takes back the last move. Against the computer, his moves get taken back too, until it's the human's turn.
+        """
+        self.__ai_turn.cancel()
+        self.__game_controller.undo()
+        while self.__ai_turn.is_ai_turn and self.__game_controller.can_undo:
+            self.__game_controller.undo()
+        self.__in_game_menu.state = "select_piece"  # the dice of the move are rolled again
+        self.__in_game_menu.selected_piece = None
+        self.__in_game_menu.move_piece_rect = None
+        self.__error_msg = None
+
+    def __redo(self):
+        """
+        Makes the last undone move again. Against the computer, his undone moves get made again too.
+        """
+        self.__ai_turn.cancel()
+        self.__game_controller.redo()
+        while self.__ai_turn.is_ai_turn and self.__game_controller.can_redo:
+            self.__game_controller.redo()
+        self.__in_game_menu.state = "roll_dice"
+        self.__in_game_menu.selected_piece = None
+        self.__in_game_menu.move_piece_rect = None
+        self.__error_msg = None
+
+    def __can_resume(self):
+        return self.__autosaver is not None and self.__autosaver.can_resume
+
+    def __resume(self):
+        """
+        Goes on with the saved match, right where it was left.
+        """
+        self.__ai_turn.cancel()
+        snapshot = self.__autosaver.resume()
+        self.__in_game_menu.state = "select_piece" if snapshot.dice_rolled else "roll_dice"
+        self.__in_game_menu.selected_piece = None
+        self.__in_game_menu.move_piece_rect = None
+        self.__state = "in_game"
+        self.__error_msg = None
+
+    def __quit_match(self):
+        """
+        Leaves the match. It gets saved first (unless the ai is playing: then the save of the last move is the right
+        one), so it can be resumed.
+        """
+        if self.__autosaver is not None and not self.__ai_turn.is_ai_turn:
+            self.__autosaver.save(dice_rolled=self.__in_game_menu.state == "select_piece")
+        self.__ai_turn.cancel()
+        self.__game_controller.reset_all()
+        self.__in_game_menu.state = "roll_dice"
+        self.__state = "main_menu"
+        self.__error_msg = None
 
     def __win_events(self, event):
         mouse_pos = pygame.mouse.get_pos()
@@ -275,8 +450,18 @@ class GUI:
                 self.__winner_menu.quit_button.stop_hovering()
 
     def __update_screen(self):
-        self.__window.update()
-        self.__treat_state()
+        """
+        Draws again only what changed: everything when the menu or the error message changed, otherwise only the
+        regions the menu reports (hovered buttons, moved pieces, new messages). Idle frames draw nothing.
+        """
+        self.__main_menu.can_resume = self.__can_resume()
+        scene = (self.__state, self.__error_msg, self.__main_menu.can_resume)
+        if scene != self.__drawn_scene:
+            self.__drawn_scene = scene
+            self.__window.invalidate()
+        for dirty_rect in self.__state_menus[self.__state].dirty_rects():
+            self.__window.invalidate(dirty_rect)
+        self.__window.render(self.__treat_state)
 
     # GAMING STUFF:
     def __treat_state(self):
@@ -318,10 +503,8 @@ class GUI:
         if self.__error_msg is not None:
             self.__in_game_menu.display_error(self.__error_msg)
 
-        if self.__game_controller.pve and self.__game_controller.current_player == "player2":
+        if self.__ai_turn.is_ai_turn:
             self.__in_game_menu.display_waiting_message()
-            pygame.display.update()
-            self.__game_controller.ai_makes_a_move()
 
     def __print_win_menu(self):
         self.__winner_menu.draw_winner_message()
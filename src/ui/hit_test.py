@@ -0,0 +1,34 @@
+class HitTestIndex:
+    """
+        Finds the clickable under the mouse without testing every clickable: the window is split into square cells
+        and every clickable is put in each cell its rect touches, so only the few clickables of one cell get tested.
+        Rebuild it only when the layout changes.
+    """
+    def __init__(self, cell_size=64):
+        """
+        :param cell_size: the size of a cell, in pixels
+        """
+        self.__cell_size = cell_size
+        self.__cells = dict()  # (column, row) -> the clickables that touch the cell, in the order they were added
+
+    def rebuild(self, clickables) -> None:
+        """
+        :param clickables: anything with a rect (e.g. PieceRect), in drawing order
+        """
+        self.__cells = dict()
+        for clickable in clickables:
+            rect = clickable.rect
+            for column in range(rect.left // self.__cell_size, (rect.right - 1) // self.__cell_size + 1):
+                for row in range(rect.top // self.__cell_size, (rect.bottom - 1) // self.__cell_size + 1):
+                    self.__cells.setdefault((column, row), []).append(clickable)
+
+    def find(self, mouse_pos):
+        """
+        :param mouse_pos: the current location of the mouse
+        :return: the clickable under the mouse (the last one drawn, if they overlap), or None
+        """
+        cell = (int(mouse_pos[0]) // self.__cell_size, int(mouse_pos[1]) // self.__cell_size)
+        for clickable in reversed(self.__cells.get(cell, ())):
+            if clickable.mouse_is_over(mouse_pos):
+                return clickable
+        return None
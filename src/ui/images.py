@@ -0,0 +1,39 @@
+import pygame
+
+
+class Images:
+    """
+        The image cache: every image file gets decoded (and converted to the pixel format of the window) only once,
+        and every size it gets asked for gets scaled only once.
+    """
+    def __init__(self, rel_folder_path):
+        self.__rel_folder_path = rel_folder_path
+        self.__surfaces = dict()  # (file name, size) -> surface; size None is the original size
+
+    def get(self, file_name, size=None) -> pygame.Surface:
+        """
+        :param file_name: the name of the image file, in the resources folder
+        :param size: (width, height) to scale the image to; None keeps its original size
+        :return: the image, ready to be blitted (don't draw on it, it's shared)
+        """
+        key = (file_name, size)
+        if key not in self.__surfaces:
+            if size is None:
+                self.__surfaces[key] = self.__load(file_name)
+            else:
+                self.__surfaces[key] = pygame.transform.scale(self.get(file_name), size)
+        return self.__surfaces[key]
+
+    def clear(self) -> None:
+        """
+        Forgets every image. Call this when the window gets created again, so the images get converted to its format.
+        """
+        self.__surfaces.clear()
+
+    def __load(self, file_name) -> pygame.Surface:
+        surface = pygame.image.load(self.__rel_folder_path + file_name)
+        if pygame.display.get_surface() is None:
+            return surface
+        if surface.get_flags() & pygame.SRCALPHA:
+            return surface.convert_alpha()
+        return surface.convert()
@@ -20,11 +20,15 @@ class InputBox:
 
         self.__active = False
         self.__rect = None
+        self.__drawn_area = None
+        self.__changed = False
 
     def becomes_active(self):
+        self.__changed = self.__changed or not self.__active
         self.__active = True
 
     def becomes_inactive(self):
+        self.__changed = self.__changed or self.__active
         self.__active = False
 
     @property
@@ -37,6 +41,27 @@ class InputBox:
 
     def draw(self, master, fonts: Font):
         border_radius = 0
+        border_rect, main_rect, text_surface, text_rect = self.__layout(fonts)
+        self.__rect = main_rect
+        self.__drawn_area = self.__area(border_rect, main_rect, text_rect)
+
+        if border_rect is not None:
+            pygame.draw.rect(master,
+                             self.__border_color,
+                             border_rect,
+                             border_radius=border_radius
+                             )
+
+        pygame.draw.rect(master,
+                         self.__bg_color,
+                         main_rect,
+                         border_radius=border_radius
+                         )
+
+        if text_rect is not None:
+            master.blit(text_surface, text_rect)
+
+    def __layout(self, fonts: Font):
         border_rect = None
         if self.__border_width != 0:
             border_rect = pygame.Rect((0, 0),
@@ -44,7 +69,7 @@ class InputBox:
                                       )
             border_rect.midleft = (self.__x - self.__width / 2, self.__y)
 
-        self.__rect = main_rect = pygame.Rect(0, 0, self.__width, self.__height)
+        main_rect = pygame.Rect(0, 0, self.__width, self.__height)
         main_rect.midleft = (self.__x - self.__width / 2, self.__y)
 
         text_color = self.__active_color
@@ -53,7 +78,7 @@ class InputBox:
 
         text_rect = text_surface = None
         if not self.__text == '':
-            text_surface = fonts.SMALL_TEXT.render(self.__text, True, text_color)
+            text_surface = fonts.render(fonts.SMALL_TEXT, self.__text, True, text_color)
             text_rect = text_surface.get_rect()
             text_rect.midleft = (self.__x - self.__width / 2 + 5, self.__y)
 
@@ -62,25 +87,32 @@ class InputBox:
                 border_rect.w = max(self.__width + self.__border_width * 2, text_rect.w + self.__border_width * 2 + 15)
             main_rect.w = max(self.__width + self.__border_width * 2, text_rect.w + self.__border_width * 2 + 15)
 
-        if border_rect is not None:
-            pygame.draw.rect(master,
-                             self.__border_color,
-                             border_rect,
-                             border_radius=border_radius
-                             )
-
-        pygame.draw.rect(master,
-                         self.__bg_color,
-                         main_rect,
-                         border_radius=border_radius
-                         )
-
-        if text_rect is not None:
-            master.blit(text_surface, text_rect)
+        return border_rect, main_rect, text_surface, text_rect
+
+    @staticmethod
+    def __area(*rects):
+        rects = [rect for rect in rects if rect is not None]
+        return rects[0].unionall(rects[1:])
+
+    def dirty_rects(self, fonts: Font):
+        """
+        :param fonts: the fonts the input box is drawn with
+        :return: the regions that need to be drawn again since the text or the focus changed (where the box was and
+        where it will be, it grows with the text), or an empty list if nothing changed
+        """
+        if not self.__changed:
+            return []
+        self.__changed = False
+        border_rect, main_rect, _, text_rect = self.__layout(fonts)
+        area = self.__area(border_rect, main_rect, text_rect)
+        if self.__drawn_area is None:
+            return [area]
+        return [self.__drawn_area, area]
 
     def get_input(self, event):
         allowed_chars = " '-0123456789"
         if event.key == pygame.K_BACKSPACE:
+            self.__changed = self.__changed or self.__text != ''
             self.__text = self.__text[:-1]
             return
         if len(self.__text) > 25:
@@ -88,6 +120,7 @@ class InputBox:
         if not ('A' <= event.unicode <= 'Z' or 'a' <= event.unicode <= 'z' or event.unicode in allowed_chars):
             return
         self.__text += event.unicode
+        self.__changed = True
 
     def mouse_is_over(self, mouse_pos):
         mouse_x = mouse_pos[0]
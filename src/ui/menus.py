@@ -1,58 +1,106 @@
 
 import pygame
 
+from src.domain.game_state import PLAYERS
 from src.domain.validators import MetaException
+from src.services.geometry import Geometry
 from src.ui.clickables import Button, PieceRect, MovePieceRect
+from src.ui.hit_test import HitTestIndex
 from src.ui.input_box import InputBox
 from src.ui.window import WindowSize
 from src.ui.colors import RGB
 
+# where the pieces are drawn: the center of the (0, 0) square, the size of a square and the size of a piece
+PIECE_RATIO = 0.15
+BOARD_GEOMETRY = Geometry((117, 110), (51, 51), (int(300 * PIECE_RATIO), int(300 * PIECE_RATIO)))
+SELECT_SQUARE_SIZE = (300 * PIECE_RATIO * 1.05, 300 * PIECE_RATIO * 1.05)
+BOARD_RATIO = 0.55
+BOARD_RECT = pygame.Rect(0, 0, int(801 * BOARD_RATIO), int(310 * BOARD_RATIO))
+BOARD_RECT.midleft = (75, WindowSize.HEIGHT / 2)
+
+# the regions of the in-game menu that change during the game: the board with every place a piece (or a selection
+# square around it) can be drawn at, and the message bar at the bottom
+PIECES_AREA = pygame.Rect(BOARD_GEOMETRY.bounds(margin=2)).union(BOARD_RECT)
+MESSAGE_AREA = pygame.Rect(0, WindowSize.HEIGHT - 73, WindowSize.WIDTH, 66)
+
 
 class Menu:
-    def __init__(self, master, fonts, rel_folder_path):
+    def __init__(self, master, fonts, images):
         self._master = master
         self._fonts = fonts
-        self._rel_folder_path = rel_folder_path
+        self._images = images
+        self._widgets = []  # the buttons and input boxes of the menu
+
+    def dirty_rects(self):
+        """
+        :return: the regions of the menu that changed since the last time it was asked (e.g. a hovered button)
+        """
+        dirty_rects = []
+        for widget in self._widgets:
+            dirty_rects += widget.dirty_rects(self._fonts)
+        return dirty_rects
 
 
 class MainMenu(Menu):
-    def __init__(self, master, fonts, rel_folder_path):
-        super().__init__(master, fonts, rel_folder_path)
+    def __init__(self, master, fonts, images):
+        super().__init__(master, fonts, images)
         self.play_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 120, 140, 50, text="Play!", border_width=2)
-        self.switch_ui_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 220, 140, 50, text="Switch UI", border_width=2)
-        self.quit_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 320, 140, 50, text="Quit", border_width=2)
+        self.resume_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 195, 140, 50, text="Resume", border_width=2)
+        self.switch_ui_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 270, 140, 50, text="Switch UI", border_width=2)
+        self.quit_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 345, 140, 50, text="Quit", border_width=2)
+        self.__can_resume = False
+        self._widgets = [self.play_button, self.switch_ui_button, self.quit_button]
+
+    @property
+    def can_resume(self) -> bool:
+        """
+        :return: is there a saved game? The resume button is only shown (and hovered) if there is.
+        """
+        return self.__can_resume
+
+    @can_resume.setter
+    def can_resume(self, can_resume) -> None:
+        if can_resume == self.__can_resume:
+            return
+        self.__can_resume = can_resume
+        if can_resume:
+            self._widgets.insert(1, self.resume_button)
+        else:
+            self._widgets.remove(self.resume_button)
+            self.resume_button.stop_hovering()
 
     def draw_title(self):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (440, 90))
+        title_background_surface = self._images.get("title-paper.png", (440, 90))
         title_background_rect = title_background_surface.get_rect(center=(WindowSize.WIDTH / 2, 55))
         self._master.blit(title_background_surface, title_background_rect)
 
-        title_surface = self._fonts.BIG_TEXT.render("The Royal Game of Ur", True, RGB.BLACK)
+        title_surface = self._fonts.render(self._fonts.BIG_TEXT, "The Royal Game of Ur", True, RGB.BLACK)
         title_rect = title_surface.get_rect(center=(WindowSize.WIDTH / 2, 55))
         self._master.blit(title_surface, title_rect)
 
     def draw_buttons(self):
         self.play_button.draw(self._master, self._fonts)
+        if self.can_resume:
+            self.resume_button.draw(self._master, self._fonts)
         self.switch_ui_button.draw(self._master, self._fonts)
         self.quit_button.draw(self._master, self._fonts)
 
 
 class OptionsMenu(Menu):
-    def __init__(self, master, fonts, rel_folder_path):
-        super().__init__(master, fonts, rel_folder_path)
+    def __init__(self, master, fonts, images):
+        super().__init__(master, fonts, images)
         self.pvp_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 120, 300, 50, text="Play against another player",
                                  border_width=2)
         self.pve_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 220, 300, 50, text="Play against the computer",
                                  border_width=2)
+        self._widgets = [self.pvp_button, self.pve_button]
 
     def draw_title(self):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (440, 90))
+        title_background_surface = self._images.get("title-paper.png", (440, 90))
         title_background_rect = title_background_surface.get_rect(center=(WindowSize.WIDTH / 2, 55))
         self._master.blit(title_background_surface, title_background_rect)
 
-        title_surface = self._fonts.BIG_TEXT.render("Pick an opponent: ", True, RGB.BLACK)
+        title_surface = self._fonts.render(self._fonts.BIG_TEXT, "Pick an opponent: ", True, RGB.BLACK)
         title_rect = title_surface.get_rect(center=(WindowSize.WIDTH / 2, 55))
         self._master.blit(title_surface, title_rect)
 
@@ -62,34 +110,35 @@ class OptionsMenu(Menu):
 
 
 class PVPMenu(Menu):
-    def __init__(self, master, fonts, rel_folder_path):
-        super().__init__(master, fonts, rel_folder_path)
+    def __init__(self, master, fonts, images):
+        super().__init__(master, fonts, images)
         self.first_player_name = InputBox(WindowSize.WIDTH / 2 + 125, 50, 150, 26)
         self.second_player_name = InputBox(WindowSize.WIDTH / 2 + 125, 150, 150, 26)
         self.pvp_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 225, 120, 50, text="Play!", border_width=2)
+        self._widgets = [self.first_player_name, self.second_player_name, self.pvp_button]
 
     def draw_text(self):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (440, 90))
+        title_background_surface = self._images.get("title-paper.png", (440, 90))
         title_background_rect = title_background_surface.get_rect(
             center=(WindowSize.WIDTH / 2 - 200, 50)
         )
         self._master.blit(title_background_surface, title_background_rect)
 
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (440, 90))
+        title_background_surface = self._images.get("title-paper.png", (440, 90))
         title_background_rect = title_background_surface.get_rect(
             center=(WindowSize.WIDTH / 2 - 200, 150)
         )
         self._master.blit(title_background_surface, title_background_rect)
 
-        first_player_surface = self._fonts.BIG_TEXT.render("First player's name: ", True, RGB.BLACK)
+        first_player_surface = self._fonts.render(self._fonts.BIG_TEXT, "First player's name: ", True,
+                                                  RGB.BLACK)
         first_player_rect = first_player_surface.get_rect(
             center=(WindowSize.WIDTH / 2 - 200, 50)
         )
         self._master.blit(first_player_surface, first_player_rect)
 
-        second_player_surface = self._fonts.BIG_TEXT.render("Second player's name: ", True, RGB.BLACK)
+        second_player_surface = self._fonts.render(self._fonts.BIG_TEXT, "Second player's name: ", True,
+                                                   RGB.BLACK)
         second_player_rect = second_player_surface.get_rect(
             center=(WindowSize.WIDTH / 2 - 200, 150)
         )
@@ -103,31 +152,30 @@ class PVPMenu(Menu):
         self.pvp_button.draw(self._master, self._fonts)
 
     def display_error(self, error_msg):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (700, 90))
+        title_background_surface = self._images.get("title-paper.png", (700, 90))
         title_background_rect = title_background_surface.get_rect(center=(WindowSize.WIDTH / 2, WindowSize.HEIGHT - 65))
         self._master.blit(title_background_surface, title_background_rect)
 
-        title_surface = self._fonts.BIG_TEXT.render(error_msg, True, RGB.RED)
+        title_surface = self._fonts.render(self._fonts.BIG_TEXT, error_msg, True, RGB.RED)
         title_rect = title_surface.get_rect(center=(WindowSize.WIDTH / 2, WindowSize.HEIGHT - 65))
         self._master.blit(title_surface, title_rect)
 
 
 class PVEMenu(Menu):
-    def __init__(self, master, fonts, rel_folder_path):
-        super().__init__(master, fonts, rel_folder_path)
+    def __init__(self, master, fonts, images):
+        super().__init__(master, fonts, images)
         self.player_name = InputBox(WindowSize.WIDTH / 2 + 125, 100, 150, 26)
         self.pve_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, 225, 120, 50, text="Play!", border_width=2)
+        self._widgets = [self.player_name, self.pve_button]
 
     def draw_text(self):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (440, 90))
+        title_background_surface = self._images.get("title-paper.png", (440, 90))
         title_background_rect = title_background_surface.get_rect(
             center=(WindowSize.WIDTH / 2 - 200, 100)
         )
         self._master.blit(title_background_surface, title_background_rect)
 
-        first_player_surface = self._fonts.BIG_TEXT.render("Your player name: ", True, RGB.BLACK)
+        first_player_surface = self._fonts.render(self._fonts.BIG_TEXT, "Your player name: ", True, RGB.BLACK)
         first_player_rect = first_player_surface.get_rect(
             center=(WindowSize.WIDTH / 2 - 200, 100)
         )
@@ -140,25 +188,24 @@ class PVEMenu(Menu):
         self.pve_button.draw(self._master, self._fonts)
 
     def display_error(self, error_msg):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (700, 90))
+        title_background_surface = self._images.get("title-paper.png", (700, 90))
         title_background_rect = title_background_surface.get_rect(center=(WindowSize.WIDTH / 2, WindowSize.HEIGHT - 65))
         self._master.blit(title_background_surface, title_background_rect)
 
-        title_surface = self._fonts.BIG_TEXT.render(error_msg, True, RGB.RED)
+        title_surface = self._fonts.render(self._fonts.BIG_TEXT, error_msg, True, RGB.RED)
         title_rect = title_surface.get_rect(center=(WindowSize.WIDTH / 2, WindowSize.HEIGHT - 65))
         self._master.blit(title_surface, title_rect)
 
 
 class InGameMenu(Menu):
-    def __init__(self, master, fonts, rel_folder_path, game_controller, board):
-        super().__init__(master, fonts, rel_folder_path)
+    def __init__(self, master, fonts, images, game_controller):
+        super().__init__(master, fonts, images)
         self.__game_controller = game_controller
-        self.__board = board
 
         self.roll_button = Button(RGB.BEIGE, 500, 10, 125, 50, "Roll dice!", border_width=2)
         self.skip_button = Button(RGB.BEIGE, 650, 10, 125, 50, "Skip", border_width=2)
         self.quit_button = Button(RGB.BEIGE, 800, 10, 125, 50, "Quit", border_width=2)
+        self._widgets = [self.roll_button, self.skip_button, self.quit_button]
 
         self.selected_piece = None
         self.all_pieces = []
@@ -166,13 +213,16 @@ class InGameMenu(Menu):
 
         self.move_piece_rect = None
 
-    def draw_board(self):
-        ratio = 0.55
+        self.__drawn_scene = None
+        self.__players_area = None
 
-        board_surface = pygame.image.load(self._rel_folder_path + "board.png")
-        board_surface = pygame.transform.scale(board_surface, (int(801 * ratio), int(310 * ratio)))
-        board_rect = board_surface.get_rect(midleft=(75, WindowSize.HEIGHT / 2))
-        self._master.blit(board_surface, board_rect)
+        self.__pieces_layout = None
+        self.__laid_out_pieces = []
+        self.__pieces_index = HitTestIndex(cell_size=BOARD_GEOMETRY.square_size[0])
+
+    def draw_board(self):
+        board_surface = self._images.get("board.png", BOARD_RECT.size)
+        self._master.blit(board_surface, BOARD_RECT)
 
     def draw_roll_button(self):
         self.roll_button.draw(self._master, self._fonts)
@@ -184,30 +234,47 @@ class InGameMenu(Menu):
         self.skip_button.draw(self._master, self._fonts)
 
     def display_players(self):
-        player_names_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        player_names_surface = pygame.transform.scale(player_names_surface, (150, 75))
-        player_names_rect = player_names_surface.get_rect(topleft=(1, 5))
-
-        player1_name = self.__game_controller.get_name_for_player(1)
-        if self.__game_controller.current_player == "player1":
-            player1_name_surface = self._fonts.SMALL_BOLD_TEXT.render("Player 1: " + player1_name, True, RGB.BLACK)
-        else:
-            player1_name_surface = self._fonts.SMALL_TEXT.render("Player 1: " + player1_name, True, RGB.BLACK)
-        player1_name_rect = player1_name_surface.get_rect(midleft=(30, 30))
-
-        player2_name = self.__game_controller.get_name_for_player(2)
-        if self.__game_controller.current_player == "player2":
-            player2_name_surface = self._fonts.SMALL_BOLD_TEXT.render("Player 2: " + player2_name, True, RGB.BLACK)
-        else:
-            player2_name_surface = self._fonts.SMALL_TEXT.render("Player 2: " + player2_name, True, RGB.BLACK)
-        player2_name_rect = player2_name_surface.get_rect(midleft=(30, 55))
-
-        player_names_rect.w = max(player_names_rect.w, player1_name_rect.w + 75, player2_name_rect.w + 75)
-        player_names_surface = pygame.transform.scale(player_names_surface, (player_names_rect.w, 75))
+        player_names_surface, player_names_rect, player_names = self.__players_layout()
+        self.__players_area = player_names_rect
 
         self._master.blit(player_names_surface, player_names_rect)
-        self._master.blit(player1_name_surface, player1_name_rect)
-        self._master.blit(player2_name_surface, player2_name_rect)
+        for player_name_surface, player_name_rect in player_names:
+            self._master.blit(player_name_surface, player_name_rect)
+
+    def __players_layout(self):
+        player_names_rect = pygame.Rect(1, 5, 150, 75)
+
+        player_names = []
+        for number, y in ((1, 30), (2, 55)):
+            player_name = self.__game_controller.get_name_for_player(number)
+            font = self._fonts.SMALL_TEXT
+            if self.__game_controller.current_player == "player" + str(number):
+                font = self._fonts.SMALL_BOLD_TEXT
+            player_name_surface = self._fonts.render(font, "Player " + str(number) + ": " + player_name, True,
+                                                     RGB.BLACK)
+            player_name_rect = player_name_surface.get_rect(midleft=(30, y))
+            player_names.append((player_name_surface, player_name_rect))
+
+            player_names_rect.w = max(player_names_rect.w, player_name_rect.w + 75)
+        player_names_surface = self._images.get("title-paper.png", (player_names_rect.w, 75))
+
+        return player_names_surface, player_names_rect, player_names
+
+    def dirty_rects(self):
+        """
+        :return: the regions of the menu that changed since the last time it was asked: the hovered buttons and, if
+        anything happened in the game (a piece moved or got selected, the dice got rolled, the turn passed), the
+        board, the players and the message
+        """
+        dirty_rects = super().dirty_rects()
+        scene = (self.__game_controller.game_state, self.__game_controller.rolled_dice_value, self.state,
+                 self.selected_piece)
+        if scene != self.__drawn_scene:
+            self.__drawn_scene = scene
+            dirty_rects += [PIECES_AREA, MESSAGE_AREA, self.__players_layout()[1]]
+            if self.__players_area is not None:
+                dirty_rects.append(self.__players_area)
+        return dirty_rects
 
     def draw_dice_value(self):
         if 0 <= self.__game_controller.rolled_dice_value <= 1:
@@ -227,78 +294,70 @@ class InGameMenu(Menu):
         self.display_message(message, RGB.BLACK)
 
     def draw_all_pieces(self):
+        game_state = self.__game_controller.game_state
+        if game_state != self.__pieces_layout:
+            self.__pieces_layout = game_state
+            self.__lay_out_pieces(game_state)
+
+        for piece, player, index, location in self.__laid_out_pieces:
+            self.__draw_piece(piece, player, index, location)
+
+    def __lay_out_pieces(self, game_state):
+        """
+        Places every piece and rebuilds the hit-test index of the pieces. Only needed when a piece moved.
+        """
         self.all_pieces = []
-
-        self.__draw_all_pieces_for("player1")
-        self.__draw_all_pieces_for("player2")
-
-    def __draw_all_pieces_for(self, player):
-        base_position = (117, 110)
-        square_size = (51, 51)
-        for index in range(1, self.__board.max_index + 1):
-            piece_id = player + "_" + str(index)
-            offset = self.__board.get_offset_for_piece(piece_id)
-            self.__draw_piece(base_position, offset, square_size, player, index)
-
-    def __draw_piece(self, base_position, offset, square_size, player, index):
+        self.__laid_out_pieces = []
+        for side, player in enumerate(PLAYERS):
+            for index, location in enumerate(game_state.locations(side), 1):
+                piece = PieceRect(pygame.Rect(BOARD_GEOMETRY.rect(player, index, location)), player + "_" + str(index))
+                self.all_pieces.append(piece)
+                self.__laid_out_pieces.append((piece, player, index, location))
+        self.__pieces_index.rebuild(self.all_pieces)
+
+    def piece_at(self, mouse_pos):
+        """
+        :param mouse_pos: the current location of the mouse
+        :return: the PieceRect under the mouse, or None
+        """
+        return self.__pieces_index.find(mouse_pos)
+
+    def __draw_piece(self, piece, player, index, location):
         piece_image_file_name = "white-piece.png"
         if player == "player2":
             piece_image_file_name = "black-piece.png"
-        ratio = 0.15
-        piece_x = base_position[0] + offset[0] * square_size[0]
-        piece_y = base_position[1] + offset[1] * square_size[1]
-
-        piece_surface = pygame.image.load(self._rel_folder_path + piece_image_file_name)
-        piece_surface = pygame.transform.scale(piece_surface, (int(300 * ratio), int(300 * ratio)))
-        piece_id = player + "_" + str(index)
-        if self.selected_piece is not None and self.selected_piece == piece_id:
-            self.__draw_select_square_for(piece_id, (piece_x, piece_y), ratio)
-            self.__draw_move_square_for(piece_id, base_position, square_size, ratio)
-        piece = PieceRect(piece_surface.get_rect(center=(piece_x, piece_y)), piece_id)
-        self._master.blit(piece_surface, piece.rect)
 
-        self.all_pieces.append(piece)
+        piece_surface = self._images.get(piece_image_file_name, BOARD_GEOMETRY.piece_size)
+        if self.selected_piece is not None and self.selected_piece == piece.id:
+            self.__draw_select_square_for(piece.id, BOARD_GEOMETRY.center(player, index, location))
+            self.__draw_move_square_for(piece.id)
+        self._master.blit(piece_surface, piece.rect)
 
-    def __draw_select_square_for(self, piece_id, piece_coordinates, ratio):
+    def __draw_select_square_for(self, piece_id, piece_coordinates):
         player = piece_id.split("_")[0]
         if player != self.__game_controller.current_player:
             return
 
-        piece_width = 300
-        piece_height = 300
-        select_square_ratio = ratio * 1.05
-
-        square_dimensions = (piece_width * select_square_ratio, piece_height * select_square_ratio)
-
-        square_rect = pygame.Rect(piece_coordinates, square_dimensions)
+        square_rect = pygame.Rect(piece_coordinates, SELECT_SQUARE_SIZE)
         square_rect.center = piece_coordinates
         pygame.draw.rect(self._master, RGB.GOLDEN_YELLOW, square_rect, 5)
 
-    def __draw_move_square_for(self, piece_id, base_position, square_size, ratio):
+    def __draw_move_square_for(self, piece_id):
         piece = self.__game_controller.get_piece_by_id(piece_id)
         if piece.owner != self.__game_controller.current_player:
             return
 
-        piece_width = 300
-        piece_height = 300
-
-        select_square_ratio = ratio * 1.05
-        square_dimensions = (piece_width * select_square_ratio, piece_height * select_square_ratio)
-
-        new_location = piece.location + self.__game_controller.rolled_dice_value
-        try:
-            new_offset = self.__board.get_offset(new_location, piece.index, piece.owner)
-            piece_x = base_position[0] + new_offset[0] * square_size[0]
-            piece_y = base_position[1] + new_offset[1] * square_size[1]
-            new_coordinates = (piece_x, piece_y)
+        self.move_piece_rect = None
+        for move in self.__game_controller.legal_moves(piece.owner, self.__game_controller.rolled_dice_value):
+            if move.piece != piece.index:
+                continue
+            new_coordinates = BOARD_GEOMETRY.center(piece.owner, piece.index, move.destination)
 
-            square_rect = pygame.Rect(new_coordinates, square_dimensions)
+            square_rect = pygame.Rect(new_coordinates, SELECT_SQUARE_SIZE)
             square_rect.center = new_coordinates
             pygame.draw.rect(self._master, RGB.BLUE, square_rect, 5)
 
             self.move_piece_rect = MovePieceRect(square_rect, piece.id)
-        except MetaException:
-            self.move_piece_rect = None
 
     def display_error(self, error_msg):
         self.display_message(error_msg, RGB.RED)
@@ -307,22 +366,22 @@ class InGameMenu(Menu):
         self.display_message("The computer is making a move, please wait...", RGB.BLACK)
 
     def display_message(self, message, color):
-        title_background_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        title_background_surface = pygame.transform.scale(title_background_surface, (900, 65))
+        title_background_surface = self._images.get("title-paper.png", (900, 65))
         title_background_rect = title_background_surface.get_rect(center=(WindowSize.WIDTH / 2, WindowSize.HEIGHT - 40))
         self._master.blit(title_background_surface, title_background_rect)
 
-        title_surface = self._fonts.SMALL_TEXT.render(message, True, color)
+        title_surface = self._fonts.render(self._fonts.SMALL_TEXT, message, True, color)
         title_rect = title_surface.get_rect(center=(WindowSize.WIDTH / 2, WindowSize.HEIGHT - 40))
         self._master.blit(title_surface, title_rect)
 
 
 class WinnerMenu(Menu):
-    def __init__(self, master, fonts, rel_folder_path, game_controller):
-        super().__init__(master, fonts, rel_folder_path)
+    def __init__(self, master, fonts, images, game_controller):
+        super().__init__(master, fonts, images)
         self.__game_controller = game_controller
         self.quit_button = Button(RGB.BEIGE, WindowSize.WIDTH / 2, WindowSize.HEIGHT - 150, 125, 50, "Quit",
                                   border_width=2)
+        self._widgets = [self.quit_button]
 
     def draw_winner_message(self):
         if self.__game_controller.winner_name != "computer":
@@ -339,15 +398,14 @@ class WinnerMenu(Menu):
         max_width = 550
         y_offset = 0
         for winner_msg in winner_msg_rows:
-            winner_msg_surface = self._fonts.MEDIUM_TEXT.render(winner_msg, True, RGB.BLACK)
+            winner_msg_surface = self._fonts.render(self._fonts.MEDIUM_TEXT, winner_msg, True, RGB.BLACK)
             winner_msg_rect = winner_msg_surface.get_rect(center=(WindowSize.WIDTH / 2, 150 + y_offset))
             messages.append((winner_msg_surface, winner_msg_rect))
 
             max_width = max(max_width, winner_msg_rect.w + 150)
             y_offset += 25
 
-        winner_bg_surface = pygame.image.load(self._rel_folder_path + "title-paper.png")
-        winner_bg_surface = pygame.transform.scale(winner_bg_surface, (max_width, 350))
+        winner_bg_surface = self._images.get("title-paper.png", (max_width, 350))
         winner_bg_rect = winner_bg_surface.get_rect(midtop=(WindowSize.WIDTH / 2, 50))
         self._master.blit(winner_bg_surface, winner_bg_rect)
         for message in messages:
@@ -8,11 +8,14 @@ class WindowSize:
 
 
 class Window:
-    def __init__(self, rel_folder_path):
+    def __init__(self, rel_folder_path, images):
         self.__rel_folder_path = rel_folder_path
+        self.__images = images
+
+        self.__dirty_rects = []
 
         self.__init_window()
-        self.update()
+        self.invalidate()
 
     def __init_window(self):
         pygame.display.init()
@@ -20,13 +23,35 @@ class Window:
         icon = pygame.image.load(self.__rel_folder_path + "icon.png")
         pygame.display.set_icon(icon)
         self.main_bg = pygame.display.set_mode((WindowSize.WIDTH, WindowSize.HEIGHT))
-
-    def update(self):
+        self.__images.clear()  # the images get converted to the format of the new window
+
+    def invalidate(self, rect=None):
+        """
+        Marks a region of the window as changed, so it gets drawn again on the next render.
+        :param rect: the changed region; None -> the whole window
+        """
+        if rect is None:
+            rect = self.main_bg.get_rect()
+        self.__dirty_rects.append(pygame.Rect(rect))
+
+    def render(self, draw_scene):
+        """
+        Draws the scene again, but only inside the changed regions, and shows only those regions on the screen. If
+        nothing changed since the last render, nothing gets drawn at all.
+        :param draw_scene: draws everything on top of the background (whatever falls outside the regions is skipped)
+        """
+        if not self.__dirty_rects:
+            return
+        self.main_bg.set_clip(self.__dirty_rects[0].unionall(self.__dirty_rects[1:]))
         self.__place_background()
+        draw_scene()
+        self.main_bg.set_clip(None)
+
+        pygame.display.update(self.__dirty_rects)
+        self.__dirty_rects = []
 
     def close(self):
         pygame.display.quit()
 
     def __place_background(self):
-        background_image = pygame.image.load(self.__rel_folder_path + "background.jpg").convert()
-        self.main_bg.blit(background_image, (0, 0))
+        self.main_bg.blit(self.__images.get("background.jpg"), (0, 0))